@@ -0,0 +1,373 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+命令行入口
+
+不带子命令运行时启动GUI，带子命令时在命令行中运行批量工具：
+
+	iparser                                    # 启动GUI
+	iparser batch applicants.txt results.csv   # 可断点续传的批量任务
+	iparser shard plan applicants.txt --shards 4
+	iparser shard run --shard 0/4              # 在任意机器上解析一个分片
+	iparser shard merge results.csv            # 按原始行顺序合并
+	iparser reindex build applicants.txt       # 建立倒排索引
+	iparser reindex update changes.csv         # 解析规则变化后增量重新解析
+	iparser mine results.csv                   # 挖掘缺失的机构简称和排除关键词
+	iparser convert results.iprec results.csv  # 在二进制、CSV和JSONL格式之间转换解析结果
+	iparser warehouse load results.csv         # 导入本地解析结果仓库
+	iparser warehouse institutions --top 20    # 每个机构的人数
+	iparser warehouse unresolved               # 未知机构或无名无姓的记录
+	iparser watch                              # 无界面监听剪贴板，解析后写回
+
+在子命令之前加上 --profile 可以对批量工具进行性能分析：
+
+	iparser --profile out/batch --profile-sample 0.1 batch applicants.txt results.csv
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from iparser.config import config
+from iparser.logger import logger, setup_logging
+
+
+def _run_batch(args: argparse.Namespace):
+	"""运行可断点续传的批量任务"""
+	from iparser.batch.cache import open_parse_cache
+	from iparser.batch.jobs import BatchJob
+
+
+	def progress(done: int, total: int, rows: int):
+		percent = done / total if total else 1.0
+		print(f'\r已处理 {percent:.1%}，共 {rows} 行', end='', file=sys.stderr, flush=True)
+
+	job = BatchJob(args.input, args.output, chunk_size=args.chunk_size,
+		max_workers=args.workers, cache=open_parse_cache(), output_format=args.format,
+		processes=args.processes)
+	output = job.run(restart=args.restart, progress=progress)
+
+	print(file=sys.stderr)
+	print(f'已解析 {job.rows} 行：{output}')
+
+	if args.warehouse:
+		from iparser.batch.warehouse import ResultWarehouse
+
+
+		with ResultWarehouse(args.warehouse) as warehouse:
+			load = warehouse.load_file(output)
+		print(f'已导入解析结果仓库（批次 {load}）：{args.warehouse}')
+
+def _run_shard(args: argparse.Namespace):
+	"""运行分片批量解析的各个步骤"""
+	from iparser.batch.cache import open_parse_cache
+	from iparser.batch.sharding import (load_plan, merge_shards, parse_shard_spec,
+		plan_shards, run_shard)
+
+
+	if args.step == 'plan':
+		plan = plan_shards(args.inputs, args.dir, args.shards)
+		print(f'已生成分片计划：{args.dir}，各分片行数：{plan["rows"]}')
+	elif args.step == 'run':
+		index, shards = parse_shard_spec(args.shard)
+		if shards != load_plan(args.dir)['shards']:
+			raise ValueError(f'分片数量与分片计划不一致：{args.shard}')
+
+		output = run_shard(args.dir, index, args.inputs or None,
+			max_workers=args.workers, cache=open_parse_cache())
+		print(f'分片 {index}/{shards} 解析完成：{output}')
+	else:
+		count = merge_shards(args.dir, args.output, args.format)
+		print(f'已合并 {count} 行：{args.output}')
+
+def _run_reindex(args: argparse.Namespace):
+	"""建立倒排索引，或在解析规则变化后增量重新解析"""
+	import json
+
+	from iparser.api.ruleset import compile_ruleset, get_ruleset
+	from iparser.batch.jobs import read_rows
+	from iparser.batch.reindex import CorpusIndex
+	from iparser.config import Profile
+
+
+	if args.step == 'build':
+		index = CorpusIndex.build((row for _, row in read_rows(args.input)),
+			max_workers=args.workers)
+		index.save(args.index)
+		print(f'已建立倒排索引：{len(index)} 条记录，{args.index}')
+		return
+
+	ruleset = get_ruleset()
+	if args.custom_config:
+		with open(args.custom_config, 'r', encoding='utf-8') as f:
+			custom = json.load(f)
+
+		profile = Profile(shortened_names=set(custom.get('shortened_names', [])),
+			excluded_keywords=set(custom.get('excluded_keywords', [])))
+		ruleset = compile_ruleset(profile.apply(ruleset.config))
+
+	index = CorpusIndex.load(args.index)
+	report = index.reparse(ruleset, max_workers=args.workers, full=args.full)
+	if args.report.endswith('.jsonl'):
+		report.to_jsonl(args.report)
+	else:
+		report.to_csv(args.report)
+
+	index.save(args.index)
+	print(f'{report}：{args.report}')
+
+def _run_mine(args: argparse.Namespace):
+	"""从解析结果中挖掘缺失的机构简称和排除关键词"""
+	import json
+
+	from iparser.batch.mining import ShortenedNameMiner
+	from iparser.batch.records import read_results
+
+
+	miner = ShortenedNameMiner(capacity=args.capacity)
+	for result in read_results(args.results):
+		miner.add(result.info, result.institution)
+
+	suggestions = miner.suggestions(args.top, args.min_count)
+	print(f'共 {miner.records} 条记录，未识别机构 {miner.unresolved} 条，'
+		f'机构名称可疑 {miner.suspicious} 条')
+
+	titles = {'shortened_names': '建议的机构简称', 'excluded_keywords': '建议的排除关键词'}
+	for key, title in titles.items():
+		print(f'\n{title}：')
+		for candidate, count in suggestions[key]:
+			print(f'  {candidate}\t{count}')
+
+	if args.output:
+		# 与GUI保存的自定义配置格式相同，检查后可以直接合并到 custom_config.json
+		with open(args.output, 'w', encoding='utf-8') as f:
+			json.dump({key: [candidate for candidate, _ in items]
+				for key, items in suggestions.items()}, f, ensure_ascii=False, indent=4)
+
+def _run_convert(args: argparse.Namespace):
+	"""在二进制、CSV和JSONL格式之间转换解析结果"""
+	from iparser.batch.records import convert
+
+
+	count = convert(args.source, args.target)
+	print(f'已转换 {count} 条解析结果：{args.target}')
+
+def _run_warehouse(args: argparse.Namespace):
+	"""导入和查询本地解析结果仓库"""
+	from iparser.batch.warehouse import ResultWarehouse
+
+
+	with ResultWarehouse(args.db) as warehouse:
+		if args.step == 'load':
+			for path in args.results:
+				load = warehouse.load_file(path)
+				print(f'已导入批次 {load}：{path}')
+		elif args.step == 'loads':
+			for load in warehouse.loads():
+				print(f'{load.id}\t{load.rows}\t{load.ruleset}\t{load.source}')
+		elif args.step == 'institutions':
+			teachers, students = warehouse.totals(args.load)
+			print(f'共 {teachers + students} 人，教师 {teachers} 人，学生 {students} 人')
+			for count in warehouse.institution_counts(args.top, args.load):
+				print(f'{count.institution}\t{count.total}\t教师 {count.teachers}\t'
+					f'学生 {count.total - count.teachers}')
+		elif args.step == 'unresolved':
+			institutions, names = warehouse.unresolved_count(args.load)
+			print(f'未知机构 {institutions} 条，无名无姓 {names} 条')
+			for result in warehouse.unresolved(args.limit, args.load):
+				print(f'{result.info}\t{result.institution}\t{result.name}')
+		else:
+			warehouse.delete(args.id)
+			print(f'已删除批次 {args.id}')
+
+def _run_watch(args: argparse.Namespace):
+	"""无界面监听剪贴板，解析后写回"""
+	from iparser.batch.cache import open_parse_cache
+	from iparser.clipboard import create_backend
+	from iparser.watch import ClipboardWatcher
+
+
+	watcher = ClipboardWatcher(create_backend(args.backend),
+		poll_interval=args.interval, cache=open_parse_cache())
+	print('正在监听剪贴板，按 Ctrl+C 停止', file=sys.stderr)
+
+	try:
+		watcher.run(args.duration, args.report_interval)
+	except KeyboardInterrupt:
+		pass
+
+	print(f'{watcher.latency}，跳过 {watcher.skipped} 次', file=sys.stderr)
+
+def _run_profiled(args: argparse.Namespace):
+	"""在性能分析器中运行子命令，中断或出错时也保存已有的分析结果"""
+	from iparser.batch.profiling import Profiler
+
+
+	profiler = Profiler(args.profile_sample)
+	try:
+		with profiler:
+			args.handler(args)
+	finally:
+		stats_path, folded_path = profiler.save(args.profile)
+		print(profiler.summary(), file=sys.stderr)
+		print(f'性能分析：抽样 {profiler.sampled}/{profiler.records} 条记录，'
+			f'{stats_path or "无pstats统计"}，{folded_path}', file=sys.stderr)
+
+def build_parser() -> argparse.ArgumentParser:
+	"""
+	创建命令行参数解析器
+
+	Returns:
+		argparse.ArgumentParser: 命令行参数解析器
+	"""
+	parser = argparse.ArgumentParser(prog='iparser',
+		description='申请人信息解析工具，不带子命令时启动GUI')
+	parser.add_argument('--profile', metavar='PREFIX',
+		help='对批量工具进行性能分析，保存为 PREFIX.pstats 和 PREFIX.folded（火焰图折叠栈）')
+	parser.add_argument('--profile-sample', type=float, default=1.0, metavar='RATE',
+		help='性能分析的抽样比例，范围为(0, 1]（默认1，分析每一条记录）')
+	subparsers = parser.add_subparsers(dest='command', metavar='command')
+
+	batch = subparsers.add_parser('batch', help='可断点续传的批量任务',
+		description='分块解析输入文件（每行一条申请信息），中断后再次运行从最后一个完成的分块继续')
+	batch.add_argument('input', help='输入文件路径，UTF-8编码，每行一条申请信息')
+	batch.add_argument('output', help='输出文件路径，扩展名为.csv、.jsonl或.iprec')
+	batch.add_argument('--chunk-size', type=int, default=10000, help='每块的行数（默认10000）')
+	batch.add_argument('--workers', type=int, default=1, help='并发解析的线程数（默认1）')
+	batch.add_argument('--processes', type=int, default=1,
+		help='通过mmap切分输入文件，由多个工作进程并行解析（默认1，不使用工作进程）')
+	batch.add_argument('--format', choices=('csv', 'jsonl', 'iprec'),
+		help='输出格式，默认根据扩展名判断')
+	batch.add_argument('--restart', action='store_true', help='忽略已有的检查点重新开始')
+	batch.add_argument('--warehouse', metavar='DB', help='完成后将解析结果导入本地解析结果仓库')
+	batch.set_defaults(handler=_run_batch)
+
+	shard = subparsers.add_parser('shard', help='分片批量解析（plan/run/merge）',
+		description='按申请信息的哈希值分片，在多台机器上分别解析后按原始行顺序合并')
+	steps = shard.add_subparsers(dest='step', metavar='step', required=True)
+
+	plan = steps.add_parser('plan', help='生成分片计划')
+	plan.add_argument('inputs', nargs='+', help='输入文件路径，按顺序拼接为一个输入')
+	plan.add_argument('--shards', type=int, required=True, help='分片数量')
+	plan.add_argument('--dir', default='shards', help='分片目录（默认shards）')
+
+	run = steps.add_parser('run', help='解析一个分片')
+	run.add_argument('--shard', required=True, help='分片参数 k/N，k 从0开始，例如 0/4')
+	run.add_argument('--dir', default='shards', help='分片目录（默认shards）')
+	run.add_argument('--workers', type=int, default=1, help='并发解析的线程数（默认1）')
+	run.add_argument('inputs', nargs='*', help='输入文件路径，默认使用分片计划中的路径')
+
+	merge = steps.add_parser('merge', help='按原始行顺序合并所有分片')
+	merge.add_argument('output', help='输出文件路径，扩展名为.csv或.jsonl')
+	merge.add_argument('--dir', default='shards', help='分片目录（默认shards）')
+	merge.add_argument('--format', choices=('csv', 'jsonl'), help='输出格式，默认根据扩展名判断')
+
+	shard.set_defaults(handler=_run_shard)
+
+	reindex = subparsers.add_parser('reindex', help='解析规则变化后增量重新解析（build/update）',
+		description='为已解析的语料建立倒排索引，解析规则变化后只重新解析包含变化关键词的记录')
+	steps = reindex.add_subparsers(dest='step', metavar='step', required=True)
+
+	build = steps.add_parser('build', help='解析语料并建立倒排索引')
+	build.add_argument('input', help='输入文件路径，UTF-8编码，每行一条申请信息')
+	build.add_argument('--index', default='corpus.index.json', help='倒排索引文件路径')
+	build.add_argument('--workers', type=int, default=1, help='并发解析的线程数（默认1）')
+
+	update = steps.add_parser('update', help='使用当前解析规则增量重新解析，输出变化报告')
+	update.add_argument('report', help='变化报告文件路径，扩展名为.csv或.jsonl')
+	update.add_argument('--index', default='corpus.index.json', help='倒排索引文件路径')
+	update.add_argument('--custom-config', help='叠加GUI保存的自定义配置（custom_config.json）')
+	update.add_argument('--full', action='store_true', help='重新解析所有记录')
+	update.add_argument('--workers', type=int, default=1, help='并发解析的线程数（默认1）')
+
+	reindex.set_defaults(handler=_run_reindex)
+
+	mine = subparsers.add_parser('mine', help='从解析结果中挖掘缺失的机构简称和排除关键词',
+		description='单次流式扫描解析结果，统计未识别机构的记录中出现次数最多的候选简称')
+	mine.add_argument('results', help='批量任务输出的解析结果，CSV、JSONL或.iprec文件')
+	mine.add_argument('--top', type=int, default=50, help='每类建议最多输出的数量（默认50）')
+	mine.add_argument('--min-count', type=int, default=2, help='候选出现次数的下限（默认2）')
+	mine.add_argument('--capacity', type=int, default=1000,
+		help='每类候选最多保留的数量（默认1000）')
+	mine.add_argument('--output', help='将建议保存为自定义配置格式的JSON文件')
+	mine.set_defaults(handler=_run_mine)
+
+	convert = subparsers.add_parser('convert', help='在二进制、CSV和JSONL格式之间转换解析结果',
+		description='根据扩展名在二进制解析结果文件（.iprec）、CSV和JSONL之间转换解析结果')
+	convert.add_argument('source', help='源文件路径，扩展名为.iprec、.csv或.jsonl')
+	convert.add_argument('target', help='目标文件路径，扩展名为.iprec、.csv或.jsonl')
+	convert.set_defaults(handler=_run_convert)
+
+	warehouse = subparsers.add_parser('warehouse', help='本地解析结果仓库（load/loads/'
+		'institutions/unresolved/delete）',
+		description='将解析结果导入本地SQLite数据库，按机构统计人数，列出未识别的记录')
+	warehouse.add_argument('--db', default='results.db', help='数据库文件路径（默认results.db）')
+	warehouse.set_defaults(handler=_run_warehouse)
+	steps = warehouse.add_subparsers(dest='step', metavar='step', required=True)
+
+	load = steps.add_parser('load', help='导入解析结果文件')
+	load.add_argument('results', nargs='+', help='批量任务输出的解析结果，CSV、JSONL或.iprec文件')
+
+	steps.add_parser('loads', help='列出所有批次')
+
+	institutions = steps.add_parser('institutions', help='每个机构的人数')
+	institutions.add_argument('--top', type=int, default=20, help='输出的机构数量（默认20）')
+	institutions.add_argument('--load', type=int, help='只统计指定批次，默认统计所有批次')
+
+	unresolved = steps.add_parser('unresolved', help='未知机构或无名无姓的记录')
+	unresolved.add_argument('--limit', type=int, default=100, help='输出的记录数量（默认100）')
+	unresolved.add_argument('--load', type=int, help='只查询指定批次，默认查询所有批次')
+
+	delete = steps.add_parser('delete', help='删除一个批次')
+	delete.add_argument('id', type=int, help='批次编号')
+
+	watch = subparsers.add_parser('watch', help='无界面监听剪贴板，解析后写回',
+		description='不启动GUI，在后台监听剪贴板，解析申请信息后写回剪贴板，并统计写回延迟')
+	watch.add_argument('--backend', default='auto',
+		choices=('auto', 'wl-clipboard', 'xclip', 'xsel', 'pbcopy'),
+		help='剪贴板命令，默认根据图形环境自动检测')
+	watch.add_argument('--interval', type=float, default=0.1,
+		help='轮询间隔，单位为秒（默认0.1）')
+	watch.add_argument('--duration', type=float, help='运行时长，单位为秒，默认一直运行')
+	watch.add_argument('--report-interval', type=float, default=60.0,
+		help='记录延迟统计的间隔，单位为秒（默认60）')
+	watch.set_defaults(handler=_run_watch)
+
+	return parser
+
+def main(argv: Optional[List[str]] = None):
+	"""
+	命令行主函数
+
+	Args:
+		argv: 命令行参数，默认使用sys.argv
+	"""
+	args = build_parser().parse_args(argv)
+
+	if args.command is None:
+		from iparser.gui.__main__ import main as gui_main
+
+
+		gui_main()
+		return
+
+	setup_logging(**config.logging.model_dump())
+
+	try:
+		if args.profile:
+			_run_profiled(args)
+		else:
+			args.handler(args)
+	except KeyboardInterrupt:
+		print(file=sys.stderr)
+		logger.warning('已中断，再次运行相同的命令可以继续')
+		sys.exit(130)
+	except Exception as e:
+		logger.error(f'{args.command} 运行出错：{str(e)}')
+		print(f'运行出错：{str(e)}', file=sys.stderr)
+		sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
@@ -37,10 +37,10 @@ print(f'输出：{applicant.full_info}')
 	身份：学生
 	输出：天津理工大学-江小白
 """
-from typing import List, Optional, Set
-
-import jieba
+import threading
+from typing import List, NamedTuple, Optional, Set
 
+from iparser.api.ruleset import Ruleset, get_ruleset
 from iparser.config import config
 from iparser.logger import logger
 
@@ -49,6 +49,260 @@ TEACHER_IDENTITY: Set[str] = set(config.identity.teacher)
 STUDENT_IDENTITY: Set[str] = set(config.identity.student)
 
 
+class SegmentationStats:
+	"""
+	分级分词统计类
+
+	记录分级分词模式下快速分词（关闭HMM）的解析次数，以及回退到HMM重新分词的次数。
+	"""
+	def __init__(self):
+		"""初始化统计数据"""
+		self.__lock = threading.Lock()
+		self.__total = 0
+		self.__fallbacks = 0
+
+	def __str__(self):
+		"""返回统计信息字符串"""
+		return f'分级分词共 {self.__total} 次，回退 {self.__fallbacks} 次，' \
+			f'回退率 {self.fallback_rate:.2%}'
+
+	def record(self, fallback: bool):
+		"""
+		记录一次分级分词结果
+
+		Args:
+			fallback: 是否回退到了HMM重新分词
+		"""
+		with self.__lock:
+			self.__total += 1
+			if fallback:
+				self.__fallbacks += 1
+
+	def reset(self):
+		"""重置统计数据"""
+		with self.__lock:
+			self.__total = 0
+			self.__fallbacks = 0
+
+	@property
+	def total(self) -> int:
+		"""获取分级分词总次数"""
+		return self.__total
+
+	@property
+	def fallbacks(self) -> int:
+		"""获取回退次数"""
+		return self.__fallbacks
+
+	@property
+	def fallback_rate(self) -> float:
+		"""获取回退率"""
+		return self.__fallbacks / self.__total if self.__total else 0.0
+
+
+segmentation_stats = SegmentationStats()
+
+
+class Extraction(NamedTuple):
+	"""从分词结果中提取出的信息"""
+	split_result: List[str]  # 分词结果（命中机构前缀缓存时第一项为缓存的机构名称）
+	institution: str         # 机构名称
+	name: str                # 姓名
+	is_teacher: bool         # 是否为教师
+	identity_in_name: bool   # 姓名中间是否出现了身份标识
+
+
+def clean_info(info: str, ruleset: Ruleset) -> str:
+	"""
+	清理字符串信息
+
+	移除信息中的常见连接符和分隔符。
+
+	Args:
+		info: 字符串信息
+		ruleset: 解析规则
+
+	Returns:
+		str: 清理后的字符串
+	"""
+	for connector in ruleset.connectors:
+		info = info.replace(connector, '')
+
+	info = info.strip()
+	return info
+
+def extract(segments: List[str], ruleset: Ruleset,
+	institution: Optional[str] = None) -> Extraction:
+	"""
+	从分词结果中提取机构、姓名和身份信息
+
+	Args:
+		segments: 分词结果列表
+		ruleset: 解析规则
+		institution: 已从机构前缀缓存中识别出的机构名称，此时分词结果只包含剩余部分
+
+	Returns:
+		Extraction: 提取出的信息
+	"""
+	split_result = [institution] + segments if institution else segments
+	is_teacher = False
+	logger.debug(f'分词结果：{split_result}')
+
+	found_institution_end = False
+	found_teacher_identity = False
+	identity_in_name = False
+	name_split_by_identity = False
+	institution_parts = []
+	name_parts = []
+
+	if institution:
+		found_institution_end = True
+		institution_parts.append(institution)
+		logger.debug(f'机构前缀缓存命中：{institution}')
+
+		# 识别机构名称中的教师身份
+		for identity in ruleset.teacher_identity:
+			if identity in institution:
+				is_teacher = True
+				found_teacher_identity = True
+				break
+
+	# 遍历分词结果，识别机构、姓名和身份
+	for segment in segments:
+		segment = segment.strip()
+		if not segment:
+			continue
+
+		logger.debug(f'处理分词：{segment}')
+
+		# 识别教师身份
+		if not found_teacher_identity:
+			for identity in ruleset.teacher_identity:
+				if identity in segment:
+					is_teacher = True
+					found_teacher_identity = True
+
+					logger.info(f'识别到教师身份标识：{identity}')
+					break
+
+		# 识别机构
+		if not found_institution_end:
+			institution_parts.append(segment)
+			logger.debug(f'添加到机构部分：{segment}')
+
+			for keyword in ruleset.shortened_names:
+				if keyword in segment:
+					found_institution_end = True
+					break
+
+			for keyword in ruleset.suffixes:
+				if keyword in segment:
+					if len(institution_parts) > 1 or len(segment) > 2:
+						found_institution_end = True
+					else:
+						institution_parts.pop()
+					break
+
+		# 识别姓名
+		elif segment not in ruleset.identity:
+			# 检查是否包含机构后缀关键词（可能是错误识别）
+			has_institution_suffix = False
+			for keyword in ruleset.all_suffixes:
+				if keyword in segment:
+					has_institution_suffix = True
+
+					# 是否保留二级学院名称
+					if ruleset.config.formatting.include_secondary_college:
+						name_parts.append(segment)
+						institution_parts.extend(name_parts)
+
+					name_parts = [] # 重置姓名识别
+					logger.debug(f'姓名部分包含机构后缀：{keyword}，重置姓名识别')
+					break
+
+			if not has_institution_suffix:
+				if identity_in_name:
+					name_split_by_identity = True
+
+				name_parts.append(segment)
+				logger.debug(f'添加到姓名部分：{segment}')
+
+		# 姓名中间出现身份标识（可能是姓名用字被拆分成了单独的分词）
+		elif name_parts:
+			identity_in_name = True
+
+	# 设置识别结果
+	if found_institution_end and institution_parts:
+		institution = clean_info(''.join(institution_parts), ruleset)
+		logger.debug(f'成功识别机构：{institution}')
+	else:
+		institution = ruleset.config.institution.default_name
+		logger.warning(f'  未能识别机构，设置为：{institution}')
+
+	name = clean_info(''.join(name_parts), ruleset)
+	if name:
+		logger.debug(f'成功识别姓名：{name}')
+	else:
+		name = ruleset.config.name.default_name
+		logger.warning(f'  未能识别姓名，设置为：{name}')
+
+	return Extraction(split_result, institution, name, is_teacher,
+		name_split_by_identity)
+
+def is_fallback(extraction: Extraction, ruleset: Ruleset) -> bool:
+	"""
+	判断快速分词（关闭HMM）的提取结果是否需要回退到HMM重新分词
+
+	提取结果回退到默认机构或默认姓名，或者姓名中间出现了身份标识时，认为结果不可靠。
+
+	Args:
+		extraction: 提取出的信息
+		ruleset: 解析规则
+
+	Returns:
+		bool: 是否需要回退
+	"""
+	return extraction.institution == ruleset.config.institution.default_name \
+		or extraction.name == ruleset.config.name.default_name \
+		or extraction.identity_in_name
+
+def extract_by_surname(text: str, ruleset: Ruleset,
+	institution: Optional[str] = None) -> Optional[Extraction]:
+	"""
+	以姓氏锚定提取姓名，姓名部分不经过分词
+
+	机构名称必须位于申请信息开头，且剩余部分去除连接符和身份标识后是以姓氏开头的
+	2～4个字，否则返回None。
+
+	Args:
+		text: 去除首尾空白的申请信息
+		ruleset: 解析规则
+		institution: 已从机构前缀缓存中识别出的机构名称，为None时使用关闭HMM的快速分词识别
+
+	Returns:
+		Optional[Extraction]: 提取出的信息，无法以姓氏锚定时返回None
+	"""
+	if institution is None:
+		institution = extract(ruleset.cut(text, False), ruleset).institution
+		if institution == ruleset.config.institution.default_name:
+			return None
+
+	if not text.startswith(institution):
+		return None
+
+	match = ruleset.name_extractor.extract(text[len(institution):])
+	if match is None:
+		logger.debug(f'姓氏锚定失败，回退到分词提取：{text}')
+		return None
+
+	is_teacher = match.is_teacher or any(identity in institution
+		for identity in ruleset.teacher_identity)
+	logger.debug(f'姓氏锚定识别姓名：{match.name}')
+
+	return Extraction([institution, *match.segments], institution, match.name,
+		is_teacher, False)
+
+
 class Applicant:
 	"""
 	申请人信息类
@@ -62,37 +316,58 @@ class Applicant:
 		name: 识别出的申请人姓名
 		is_teacher: 身份标识，True表示教师，False表示学生（默认值）
 	"""
-	def __init__(self, info: str):
+	def __init__(self, info: str, ruleset: Optional[Ruleset] = None):
 		"""
 		初始化申请人对象
 
 		Args:
 			info: 原始申请信息字符串
+			ruleset: 解析规则，默认使用解析时当前发布的解析规则
 		"""
 		self.__info: str = info
+		self.__ruleset: Optional[Ruleset] = ruleset
 		self.__split_result: Optional[List[str]] = None
 		self.__institution: Optional[str] = None
 		self.__name: Optional[str] = None
 		self.__is_teacher: bool = False
+		self.__identity_in_name: bool = False
+		self.__prefix: Optional[str] = None
 
 	def __str__(self):
 		"""返回格式化的申请人信息字符串"""
 		return self.full_info
 
-	def __clean_info(self, info: str) -> str:
+	def __segment_info(self, hmm: bool):
 		"""
-		清理字符串信息
+		对申请信息进行分词并提取结果
 
-		移除信息中的常见连接符和分隔符。
+		命中机构前缀缓存时，只对机构名称之后的部分进行分词。如果剩余部分的第一个分词
+		包含机构后缀关键词（说明缓存的机构名称只是更长机构名称的一部分），
+		则放弃缓存结果，对完整信息重新分词。
 
-		Returns:
-			str: 清理后的字符串
+		Args:
+			hmm: 是否启用HMM新词发现
 		"""
-		for connector in set(config.formatting.connectors):
-			info = info.replace(connector, '')
+		if self.__prefix:
+			tail = self.__info.strip()[len(self.__prefix):]
+			segments = self.__ruleset.cut(tail, hmm)
 
-		info = info.strip()
-		return info
+			if not segments or not any(keyword in segments[0]
+				for keyword in self.__ruleset.all_suffixes):
+				self.__extract(segments, self.__prefix)
+				return
+
+			logger.debug(f'机构前缀缓存结果不完整，重新分词：{self.__prefix}')
+			self.__prefix = None
+
+		self.__extract(self.__ruleset.cut(self.__info, hmm))
+
+	def __is_fallback(self) -> bool:
+		"""判断快速分词的解析结果是否需要回退，参见 is_fallback()"""
+		extraction = Extraction(self.__split_result, self.__institution, self.__name,
+			self.__is_teacher, self.__identity_in_name)
+
+		return is_fallback(extraction, self.__ruleset)
 
 	def parse(self):
 		"""
@@ -100,100 +375,105 @@ class Applicant:
 
 		使用结巴分词和关键词匹配技术，从申请信息中提取机构名称、姓名和身份信息。
 		解析逻辑包括：
-		1. 初始化并配置结巴分词器
-		2. 对清理后的文本进行分词
-		3. 根据关键词识别机构名称
-		4. 提取机构名称后的部分作为姓名
-		5. 识别申请人身份（教师/学生）
+		1. 按配置的分词模式对文本进行分词
+		2. 根据关键词识别机构名称
+		3. 提取机构名称后的部分作为姓名
+		4. 识别申请人身份（教师/学生）
+
+		启用分级分词（segmentation.tiered）时，先使用关闭HMM的快速分词，
+		仅当结果回退到默认机构或默认姓名（或姓名中间出现身份标识）时，
+		再启用HMM重新分词解析。
+
+		姓名提取方式为姓氏锚定（name.extractor: surname）时，先取得机构名称（命中机构前缀
+		缓存，或使用关闭HMM的快速分词识别），再从机构名称之后的剩余字符中直接提取以姓氏
+		开头的姓名，只有无法以姓氏锚定时才按上述方式分词解析。
+
+		启用机构前缀缓存（prefix_cache.enabled）时，申请信息以已确认的机构名称开头，
+		则直接取出机构名称，只对剩余部分进行分词。
+
+		配置了机构别名或规范名称（institution.aliases、institution.canonical_names）时，
+		最后将识别出的机构名称映射为规范名称，分词结果保持原来的写法。
+
+		同一次解析始终使用同一个解析规则，解析期间发布新的解析规则不会影响本次解析。
 		"""
-		# 对清理后的文本进行分词
-		segments = jieba.lcut(self.__info)
-		self.__split_result = segments
-		logger.debug(f'分词结果：{segments}')
-
-		found_institution_end = False
-		found_teacher_identity = False
-		institution_parts = []
-		name_parts = []
-
-		# 遍历分词结果，识别机构、姓名和身份
-		for segment in segments:
-			segment = segment.strip()
-			if not segment:
-				continue
-
-			logger.debug(f'处理分词：{segment}')
-
-			# 识别教师身份
-			if not found_teacher_identity:
-				for identity in TEACHER_IDENTITY:
-					if identity in segment:
-						self.__is_teacher = True
-						found_teacher_identity = True
-
-						logger.info(f'识别到教师身份标识：{identity}')
-						break
-
-			# 识别机构
-			if not found_institution_end:
-				institution_parts.append(segment)
-				logger.debug(f'添加到机构部分：{segment}')
-
-				for keyword in config.institution.shortened_names:
-					if keyword in segment:
-						found_institution_end = True
-						break
-
-				for keyword in config.institution.suffixes:
-					if keyword in segment:
-						if len(institution_parts) > 1 or len(segment) > 2:
-							found_institution_end = True
-						else:
-							institution_parts.pop()
-						break
-
-			# 识别姓名
-			elif segment not in TEACHER_IDENTITY.union(STUDENT_IDENTITY):
-				# 检查是否包含机构后缀关键词（可能是错误识别）
-				has_institution_suffix = False
-				for keyword in config.institution.all_suffixes:
-					if keyword in segment:
-						has_institution_suffix = True
-
-						# 是否保留二级学院名称
-						if config.formatting.include_secondary_college:
-							name_parts.append(segment)
-							institution_parts.extend(name_parts)
-
-						name_parts = [] # 重置姓名识别
-						logger.debug(f'姓名部分包含机构后缀：{keyword}，重置姓名识别')
-						break
-
-				if not has_institution_suffix:
-					name_parts.append(segment)
-					logger.debug(f'添加到姓名部分：{segment}')
-
-		# 设置识别结果
-		if found_institution_end and institution_parts:
-			self.__institution = self.__clean_info(''.join(institution_parts))
-			logger.debug(f'成功识别机构：{self.__institution}')
-		else:
-			self.__institution = config.institution.default_name
-			logger.warning(f'  未能识别机构，设置为：{self.__institution}')
+		if self.__ruleset is None:
+			self.__ruleset = get_ruleset()
+
+		if self.__ruleset.config.prefix_cache.enabled:
+			self.__prefix = self.__ruleset.prefix_cache.match(self.__info.strip())
 
-		self.__name = self.__clean_info(''.join(name_parts))
-		if self.__name:
-			logger.debug(f'成功识别姓名：{self.__name}')
+		if self.__ruleset.config.name.extractor == 'surname' \
+			and self.__extract_by_surname():
+			pass
+		elif not self.__ruleset.config.segmentation.tiered:
+			self.__segment_info(self.__ruleset.config.segmentation.hmm)
 		else:
-			self.__name = config.name.default_name
-			logger.warning(f'  未能识别姓名，设置为：{self.__name}')
+			self.__segment_info(False)
+
+			fallback = self.__is_fallback()
+			segmentation_stats.record(fallback)
+
+			if fallback:
+				logger.debug(f'快速分词结果回退到默认值，启用HMM重新分词：{self.__info}')
+				self.__segment_info(True)
+
+		# 机构和姓名都识别成功，且机构名称位于信息开头时，记录到机构前缀缓存
+		if self.__ruleset.config.prefix_cache.enabled and self.__prefix is None \
+			and not self.__is_fallback() \
+			and self.__info.strip().startswith(self.__institution):
+			self.__ruleset.prefix_cache.learn(self.__institution)
+
+		# 机构前缀缓存记录的是原来的写法，规范化放在最后
+		if self.__ruleset.canonicalizer \
+			and self.__institution != self.__ruleset.config.institution.default_name:
+			canonical = self.__ruleset.canonicalizer.canonicalize(self.__institution)
+			if canonical != self.__institution:
+				logger.debug(f'机构名称规范化：{self.__institution} → {canonical}')
+				self.__institution = canonical
+
+	def __extract_by_surname(self) -> bool:
+		"""
+		以姓氏锚定提取姓名，姓名部分不经过分词
+
+		机构名称必须位于申请信息开头，且剩余部分去除连接符和身份标识后是以姓氏开头的
+		2～4个字，否则不修改解析结果。
+
+		Returns:
+			bool: 是否提取成功
+		"""
+		extraction = extract_by_surname(self.__info.strip(), self.__ruleset,
+			self.__prefix)
+		if extraction is None:
+			return False
+
+		self.__apply(extraction)
+		return True
+
+	def __extract(self, segments: List[str], institution: Optional[str] = None):
+		"""
+		从分词结果中提取机构、姓名和身份信息
+
+		Args:
+			segments: 分词结果列表
+			institution: 已从机构前缀缓存中识别出的机构名称，此时分词结果只包含剩余部分
+		"""
+		self.__apply(extract(segments, self.__ruleset, institution))
+
+	def __apply(self, extraction: Extraction):
+		"""保存提取出的信息"""
+		self.__split_result = extraction.split_result
+		self.__institution = extraction.institution
+		self.__name = extraction.name
+		self.__is_teacher = extraction.is_teacher
+		self.__identity_in_name = extraction.identity_in_name
 
 	#region Properties
 	@property
 	def full_info(self) -> str:
 		"""获取格式化的申请人信息字符串"""
-		output_pattern = config.formatting.output_pattern_teacher \
-			if self.__is_teacher else config.formatting.output_pattern_student
+		formatting = (self.__ruleset or get_ruleset()).config.formatting
+		output_pattern = formatting.output_pattern_teacher \
+			if self.__is_teacher else formatting.output_pattern_student
 		output = {
 			'institution': self.__institution,
 			'name': self.__name,
@@ -0,0 +1,291 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+机构名称规范化
+
+同一个机构常常以不同的写法出现，例如“河工大”“河北工大”和“河北工业大学”。
+此模块在识别出机构名称之后，将其映射为唯一的规范名称，依次尝试：
+1. 别名表：配置的别名（简称或变体 → 规范名称）和规范名称本身，精确匹配
+2. 错别字：查找编辑距离不超过上限的规范名称，每5个字最多允许1处差异，避免把只差一个字的
+   不同机构混为一谈。先通过双字（bigram）倒排索引筛选候选：编辑距离为k时，两个名称至少
+   共有 双字数 - 2k 个双字；名称太短、筛选失效时改为在规范名称的BK树中查找
+3. 简称：通过字的倒排索引找出包含该名称所有字的规范名称，要求首字相同、
+   各字按顺序出现，且至少覆盖规范名称一半的字数。以与规范名称相同的两个字结尾的名称
+   （例如“河南大学”之于“河南工业大学”）本身就是完整的机构名称，通常是另一个机构，不作为简称
+
+错别字匹配得到多个同样好的候选、简称匹配得到多个候选时不做映射，保留原来的写法。
+匹配结果会被缓存，同一个机构名称只计算一次。
+
+使用示例：
+
+from iparser.api.canonical import InstitutionCanonicalizer
+
+
+canonicalizer = InstitutionCanonicalizer({'河工大': '河北工业大学'}, ['河南工业大学'])
+print(canonicalizer.canonicalize('河北工大'))    # 河北工业大学
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# 简称至少覆盖规范名称的字数比例
+MIN_COVERAGE = 0.5
+
+# 简称与规范名称结尾相同的字数达到该值时，视为另一个机构的完整名称
+FULL_NAME_TAIL = 2
+
+# 每多少个字允许1处编辑差异
+CHARS_PER_EDIT = 5
+
+# 最多缓存的匹配结果数量
+MEMO_SIZE = 65536
+
+
+def edit_distance(first: str, second: str, limit: Optional[int] = None) -> int:
+	"""
+	计算两个字符串的编辑距离（Levenshtein距离）
+
+	Args:
+		first: 第一个字符串
+		second: 第二个字符串
+		limit: 距离上限，超过时提前结束并返回 limit + 1
+
+	Returns:
+		int: 编辑距离
+	"""
+	if limit is not None and abs(len(first) - len(second)) > limit:
+		return limit + 1
+
+	previous = list(range(len(second) + 1))
+	for row, char in enumerate(first, 1):
+		current = [row]
+		for column, other in enumerate(second, 1):
+			current.append(min(previous[column] + 1, current[column - 1] + 1,
+				previous[column - 1] + (char != other)))
+
+		if limit is not None and min(current) > limit:
+			return limit + 1
+		previous = current
+
+	return previous[-1]
+
+def bigrams(text: str) -> Set[str]:
+	"""获取字符串中所有相邻两个字组成的双字"""
+	return {text[index:index + 2] for index in range(len(text) - 1)}
+
+def is_subsequence(short: str, long: str) -> bool:
+	"""判断short的各个字是否按顺序出现在long中"""
+	chars = iter(long)
+	return all(char in chars for char in short)
+
+
+class BKTree:
+	"""
+	BK树
+
+	按编辑距离组织的度量树，查找与给定字符串的编辑距离不超过上限的所有字符串时，
+	利用三角不等式跳过大部分节点。
+	"""
+	def __init__(self, words: Iterable[str] = ()):
+		"""
+		初始化BK树
+
+		Args:
+			words: 初始字符串
+		"""
+		# 节点为 (字符串, {到子节点的编辑距离: 子节点})
+		self.__root: Optional[Tuple[str, Dict]] = None
+		self.__size = 0
+
+		for word in words:
+			self.add(word)
+
+	def __len__(self):
+		"""返回字符串数量"""
+		return self.__size
+
+	def add(self, word: str):
+		"""
+		添加一个字符串
+
+		Args:
+			word: 字符串
+		"""
+		if self.__root is None:
+			self.__root = (word, {})
+			self.__size += 1
+			return
+
+		node = self.__root
+		while True:
+			distance = edit_distance(word, node[0])
+			if distance == 0:
+				return
+
+			child = node[1].get(distance)
+			if child is None:
+				node[1][distance] = (word, {})
+				self.__size += 1
+				return
+			node = child
+
+	def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+		"""
+		查找编辑距离不超过上限的字符串
+
+		Args:
+			word: 要查找的字符串
+			max_distance: 编辑距离上限
+
+		Returns:
+			List[Tuple[int, str]]: 按编辑距离从小到大排列的编辑距离和字符串
+		"""
+		if self.__root is None:
+			return []
+
+		matches = []
+		nodes = [self.__root]
+		while nodes:
+			candidate, children = nodes.pop()
+			distance = edit_distance(word, candidate)
+			if distance <= max_distance:
+				matches.append((distance, candidate))
+
+			for child_distance, child in children.items():
+				if distance - max_distance <= child_distance <= distance + max_distance:
+					nodes.append(child)
+
+		return sorted(matches)
+
+
+class InstitutionCanonicalizer:
+	"""
+	机构名称规范化类
+
+	创建时预先建立别名表、双字倒排索引和单字倒排索引，之后不可修改；
+	BK树只在第一次需要时建立。
+
+	Attributes:
+		names: 规范名称
+		max_distance: 错别字匹配允许的最大编辑距离，0表示不进行模糊匹配
+	"""
+	def __init__(self, aliases: Dict[str, str], names: Iterable[str] = (),
+		max_distance: int = 1):
+		"""
+		初始化机构名称规范化
+
+		Args:
+			aliases: 别名（简称或变体）到规范名称的映射
+			names: 别名表之外的规范名称
+			max_distance: 错别字匹配允许的最大编辑距离，0表示只使用别名表
+		"""
+		self.names: Set[str] = set(names).union(aliases.values())
+		self.max_distance = max_distance
+
+		self.__aliases: Dict[str, str] = {name: name for name in self.names}
+		self.__aliases.update(aliases)
+		self.__sorted_names = sorted(self.names)
+		self.__tree: Optional[BKTree] = None
+		self.__grams: Dict[str, List[int]] = {}
+		self.__chars: Dict[str, Set[str]] = {}
+		self.__memo: Dict[str, str] = {}
+
+		if max_distance > 0:
+			for position, name in enumerate(self.__sorted_names):
+				for gram in bigrams(name):
+					self.__grams.setdefault(gram, []).append(position)
+				for char in set(name):
+					self.__chars.setdefault(char, set()).add(name)
+
+	def __bool__(self):
+		"""没有别名和规范名称时为False，此时不需要规范化"""
+		return bool(self.__aliases)
+
+	def canonicalize(self, institution: str) -> str:
+		"""
+		获取机构名称的规范名称
+
+		Args:
+			institution: 识别出的机构名称
+
+		Returns:
+			str: 规范名称，无法确定时返回原来的机构名称
+		"""
+		canonical = self.__aliases.get(institution)
+		if canonical is not None:
+			return canonical
+
+		canonical = self.__memo.get(institution)
+		if canonical is None:
+			canonical = self.__match(institution) or institution
+			if len(self.__memo) >= MEMO_SIZE:
+				self.__memo.clear()
+			self.__memo[institution] = canonical
+
+		return canonical
+
+	def __match(self, institution: str) -> Optional[str]:
+		"""模糊匹配规范名称，没有唯一的最佳候选时返回None"""
+		if self.max_distance <= 0 or not self.names:
+			return None
+
+		max_distance = min(self.max_distance, len(institution) // CHARS_PER_EDIT)
+		if max_distance > 0:
+			matches = self.__search(institution, max_distance)
+			if matches and (len(matches) == 1 or matches[0][0] < matches[1][0]):
+				return matches[0][1]
+			if matches:
+				return None
+
+		return self.__match_abbreviation(institution)
+
+	def __search(self, institution: str, max_distance: int) -> List[Tuple[int, str]]:
+		"""查找编辑距离不超过上限的规范名称，按编辑距离从小到大排列"""
+		grams = bigrams(institution)
+		required = len(grams) - 2 * max_distance
+
+		if required <= 0:
+			if self.__tree is None:
+				self.__tree = BKTree(self.__sorted_names)
+			return self.__tree.search(institution, max_distance)
+
+		counts = Counter()
+		for gram in grams:
+			positions = self.__grams.get(gram)
+			if positions:
+				counts.update(positions)
+
+		matches = []
+		for position, count in counts.items():
+			if count >= required:
+				name = self.__sorted_names[position]
+				distance = edit_distance(institution, name, max_distance)
+				if distance <= max_distance:
+					matches.append((distance, name))
+
+		return sorted(matches)
+
+	def __match_abbreviation(self, institution: str) -> Optional[str]:
+		"""匹配以该名称为简称的唯一规范名称"""
+		if len(institution) < 2:
+			return None
+
+		candidates = None
+		for char in set(institution):
+			names = self.__chars.get(char)
+			if not names:
+				return None
+			candidates = names if candidates is None else candidates & names
+			if not candidates:
+				return None
+
+		matches = [name for name in candidates
+			if name[0] == institution[0] and len(institution) < len(name)
+			and len(institution) / len(name) >= MIN_COVERAGE
+			and institution[-FULL_NAME_TAIL:] != name[-FULL_NAME_TAIL:]
+			and is_subsequence(institution, name)]
+
+		# 多个规范名称都可能以该名称为简称时无法确定
+		return matches[0] if len(matches) == 1 else None
@@ -0,0 +1,81 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+输入检查
+
+此模块在解析之前对输入内容做低成本的检查，避免把超长或明显不是申请信息的内容
+（例如整篇文档）交给分词器处理：
+- 内容超过最大长度时直接跳过
+- 单条申请信息超过最大长度时截断
+- 在前N个字符内找不到机构后缀或简称时，认为不是申请信息
+"""
+from typing import Optional
+
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.config import config
+
+
+class TimeBudgetExceeded(TimeoutError):
+	"""
+	解析超出时间预算
+
+	Attributes:
+		completed: 超时前已解析的数量
+		total: 需要解析的总数量
+	"""
+	def __init__(self, completed: int, total: int):
+		"""
+		初始化异常
+
+		Args:
+			completed: 超时前已解析的数量
+			total: 需要解析的总数量
+		"""
+		super().__init__(f'解析超出时间预算，已解析 {completed}/{total}')
+		self.completed = completed
+		self.total = total
+
+
+def is_oversized(content: str) -> bool:
+	"""
+	判断内容是否超过允许解析的最大长度
+
+	Args:
+		content: 待解析的内容
+
+	Returns:
+		bool: 超过最大长度时返回True
+	"""
+	return len(content) > config.input_guard.max_content_length
+
+def truncate(info: str) -> str:
+	"""
+	将单条申请信息截断到最大长度
+
+	Args:
+		info: 申请信息
+
+	Returns:
+		str: 截断后的申请信息
+	"""
+	return info[:config.input_guard.max_length]
+
+def looks_like_applicant(info: str, ruleset: Optional[Ruleset] = None) -> bool:
+	"""
+	判断内容是否像一条申请信息
+
+	只检查前 probe_length 个字符内是否包含机构后缀或简称，成本远低于分词。
+
+	Args:
+		info: 待检查的内容
+		ruleset: 解析规则，默认使用当前发布的解析规则
+
+	Returns:
+		bool: 包含机构后缀或简称时返回True
+	"""
+	head = info[:config.input_guard.probe_length]
+	ruleset = ruleset or get_ruleset()
+
+	return any(keyword in head for keyword in ruleset.all_suffixes)
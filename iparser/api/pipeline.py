@@ -0,0 +1,263 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+流水线解析API
+
+此模块将解析过程拆分为可组合的流式阶段：规范化（normalize）→ 分词（segment）→
+提取（extract）→ 机构名称规范化（canonicalize）→ 格式化（format）。每个阶段都是一个接受记录迭代器、返回记录迭代器的
+生成器函数，阶段之间传递同一种不可变的记录类型（Record），因此：
+- 流水线是惰性的，可以处理无限长的输入，内存占用不随输入长度增长
+- 可以插入新的阶段（例如机构名称词表），替换某个阶段（例如带缓存的分词），
+  或者去掉不需要的阶段（例如格式化），而不必修改解析器
+
+默认流水线遵循与 Applicant.parse() 相同的分词和姓名提取配置（分级分词、姓氏锚定的
+姓名提取），只是不使用机构前缀缓存，解析结果相同。
+
+使用示例：
+
+from iparser.api.pipeline import Record, default_pipeline
+
+
+def gazetteer(records):
+	for record in records:
+		if record.institution == '郑大':
+			record = record._replace(institution='郑州大学')
+		yield record
+
+pipeline = default_pipeline().insert_after('extract', 'gazetteer', gazetteer)
+for record in pipeline(['郑大-张三', '河南工学院-郭自强（教师）']):
+	print(record.full_info)
+"""
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from iparser.api.applicant import extract as extract_segments
+from iparser.api.applicant import extract_by_surname, is_fallback, segmentation_stats
+from iparser.api.ruleset import Ruleset, get_ruleset
+
+
+class Record(NamedTuple):
+	"""在流水线各阶段之间传递的记录"""
+	info: str                                  # 原始申请信息
+	text: Optional[str] = None                 # 规范化后的文本（normalize）
+	segments: Optional[Tuple[str, ...]] = None # 分词结果（segment）
+	institution: Optional[str] = None          # 机构名称（extract）
+	name: Optional[str] = None                 # 姓名（extract）
+	is_teacher: bool = False                   # 是否为教师（extract）
+	full_info: Optional[str] = None            # 格式化后的申请人信息（format）
+
+
+# 流水线阶段：接受记录迭代器，返回记录迭代器
+Stage = Callable[[Iterable[Record]], Iterator[Record]]
+
+
+def to_records(items: Iterable[str | Record]) -> Iterator[Record]:
+	"""
+	将申请信息转换为记录，已经是记录的保持不变
+
+	Args:
+		items: 申请信息或记录
+
+	Yields:
+		Record: 记录
+	"""
+	for item in items:
+		yield item if isinstance(item, Record) else Record(item)
+
+def normalize(ruleset: Optional[Ruleset] = None) -> Stage:
+	"""
+	创建规范化阶段，去除申请信息首尾的空白
+
+	Args:
+		ruleset: 解析规则，目前未使用，与其他阶段保持相同的参数
+	"""
+	def stage(records: Iterable[Record]) -> Iterator[Record]:
+		for record in records:
+			yield record._replace(text=record.info.strip())
+
+	return stage
+
+def segment(ruleset: Optional[Ruleset] = None, hmm: Optional[bool] = None) -> Stage:
+	"""
+	创建分词阶段，对规范化后的文本分词
+
+	Args:
+		ruleset: 解析规则，默认使用流水线开始运行时发布的解析规则
+		hmm: 是否启用HMM新词发现，默认使用解析规则中的配置，启用分级分词时关闭HMM
+	"""
+	def stage(records: Iterable[Record]) -> Iterator[Record]:
+		bound = ruleset or get_ruleset()
+		segmentation = bound.config.segmentation
+		use_hmm = (segmentation.hmm and not segmentation.tiered) if hmm is None else hmm
+
+		for record in records:
+			text = record.text if record.text is not None else record.info
+			yield record._replace(segments=tuple(bound.cut(text, use_hmm)))
+
+	return stage
+
+def extract(ruleset: Optional[Ruleset] = None) -> Stage:
+	"""
+	创建提取阶段，从分词结果中提取机构、姓名和身份信息
+
+	与 Applicant.parse() 相同：姓名提取方式为姓氏锚定（name.extractor: surname）时先以姓氏
+	锚定提取，失败时才使用分词结果；启用分级分词（segmentation.tiered）时，分词结果的
+	提取结果需要回退的，启用HMM重新分词后再提取。
+
+	Args:
+		ruleset: 解析规则，默认使用流水线开始运行时发布的解析规则
+	"""
+	def stage(records: Iterable[Record]) -> Iterator[Record]:
+		bound = ruleset or get_ruleset()
+		surname = bound.config.name.extractor == 'surname'
+		tiered = bound.config.segmentation.tiered
+
+		for record in records:
+			text = record.text if record.text is not None else record.info.strip()
+			extraction = extract_by_surname(text, bound) if surname else None
+
+			if extraction is None:
+				extraction = extract_segments(list(record.segments or ()), bound)
+
+				if tiered:
+					fallback = is_fallback(extraction, bound)
+					segmentation_stats.record(fallback)
+					if fallback:
+						extraction = extract_segments(bound.cut(text, True), bound)
+
+			yield record._replace(institution=extraction.institution,
+				name=extraction.name, is_teacher=extraction.is_teacher)
+
+	return stage
+
+def canonicalize(ruleset: Optional[Ruleset] = None) -> Stage:
+	"""
+	创建机构名称规范化阶段，将提取出的机构名称映射为规范名称
+
+	没有配置机构别名和规范名称（institution.aliases、institution.canonical_names）时，
+	记录原样通过。
+
+	Args:
+		ruleset: 解析规则，默认使用流水线开始运行时发布的解析规则
+	"""
+	def stage(records: Iterable[Record]) -> Iterator[Record]:
+		bound = ruleset or get_ruleset()
+		canonicalizer = bound.canonicalizer
+		default_name = bound.config.institution.default_name
+
+		for record in records:
+			if canonicalizer and record.institution \
+				and record.institution != default_name:
+				institution = canonicalizer.canonicalize(record.institution)
+				record = record._replace(institution=institution)
+			yield record
+
+	return stage
+
+def format_info(ruleset: Optional[Ruleset] = None) -> Stage:
+	"""
+	创建格式化阶段，按输出格式生成申请人信息
+
+	Args:
+		ruleset: 解析规则，默认使用流水线开始运行时发布的解析规则
+	"""
+	def stage(records: Iterable[Record]) -> Iterator[Record]:
+		formatting = (ruleset or get_ruleset()).config.formatting
+
+		for record in records:
+			output_pattern = formatting.output_pattern_teacher \
+				if record.is_teacher else formatting.output_pattern_student
+			yield record._replace(full_info=output_pattern.format(
+				institution=record.institution, name=record.name))
+
+	return stage
+
+
+class Pipeline:
+	"""
+	流水线类
+
+	按顺序保存具名的阶段。调用流水线时依次串联各个阶段，返回惰性的记录迭代器。
+	"""
+	def __init__(self, stages: Optional[Iterable[Tuple[str, Stage]]] = None):
+		"""
+		初始化流水线
+
+		Args:
+			stages: 按顺序排列的阶段名称和阶段
+		"""
+		self.__stages: List[Tuple[str, Stage]] = list(stages or [])
+
+	def __call__(self, items: Iterable[str | Record]) -> Iterator[Record]:
+		"""
+		运行流水线
+
+		Args:
+			items: 申请信息或记录，可以是无限长的迭代器
+
+		Returns:
+			Iterator[Record]: 惰性的记录迭代器
+		"""
+		records = to_records(items)
+		for _, stage in self.__stages:
+			records = stage(records)
+
+		return records
+
+	def __index(self, name: str) -> int:
+		"""获取阶段的位置"""
+		for index, (stage_name, _) in enumerate(self.__stages):
+			if stage_name == name:
+				return index
+
+		raise KeyError(f'流水线中不存在阶段：{name}')
+
+	@property
+	def names(self) -> List[str]:
+		"""获取按顺序排列的阶段名称"""
+		return [name for name, _ in self.__stages]
+
+	def append(self, name: str, stage: Stage) -> 'Pipeline':
+		"""在流水线末尾添加阶段"""
+		self.__stages.append((name, stage))
+		return self
+
+	def insert_before(self, target: str, name: str, stage: Stage) -> 'Pipeline':
+		"""在指定阶段之前插入阶段"""
+		self.__stages.insert(self.__index(target), (name, stage))
+		return self
+
+	def insert_after(self, target: str, name: str, stage: Stage) -> 'Pipeline':
+		"""在指定阶段之后插入阶段"""
+		self.__stages.insert(self.__index(target) + 1, (name, stage))
+		return self
+
+	def replace(self, name: str, stage: Stage) -> 'Pipeline':
+		"""替换指定阶段"""
+		self.__stages[self.__index(name)] = (name, stage)
+		return self
+
+	def remove(self, name: str) -> 'Pipeline':
+		"""删除指定阶段"""
+		del self.__stages[self.__index(name)]
+		return self
+
+
+def default_pipeline(ruleset: Optional[Ruleset] = None) -> Pipeline:
+	"""
+	创建默认的流水线：normalize → segment → extract → canonicalize → format
+
+	Args:
+		ruleset: 解析规则，默认每次运行流水线时使用当时发布的解析规则
+
+	Returns:
+		Pipeline: 流水线
+	"""
+	return Pipeline([
+		('normalize', normalize(ruleset)),
+		('segment', segment(ruleset)),
+		('extract', extract(ruleset)),
+		('canonicalize', canonicalize(ruleset)),
+		('format', format_info(ruleset)),
+	])
@@ -0,0 +1,234 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+机构前缀缓存
+
+此模块维护一个由已确认的解析结果学习得到的机构名称前缀树（Trie）。
+当申请信息以已知机构名称开头时，解析器可以直接取出机构名称，
+只对剩余的姓名和身份部分进行分词，避免每次都重新切分机构名称。
+
+缓存的大小有上限，可以持久化到文件，并在解析规则变化时失效。
+每个解析规则（Ruleset）拥有各自的机构前缀缓存。
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from iparser.logger import logger
+
+
+# 前缀树中标记机构名称结尾的键，单个字符不会与之冲突
+_END = ''
+
+
+class InstitutionPrefixCache:
+	"""
+	机构前缀缓存类
+
+	使用字符前缀树保存已确认的机构名称，并记录每个机构的命中次数。
+	缓存已满时，优先淘汰命中次数最少的机构。
+
+	Attributes:
+		max_size: 最多缓存的机构数量
+		ruleset_hash: 缓存内容所对应的解析规则哈希值
+		hits: 前缀命中次数
+		misses: 前缀未命中次数
+	"""
+	def __init__(self, max_size: int = 1024):
+		"""
+		初始化机构前缀缓存
+
+		Args:
+			max_size: 最多缓存的机构数量
+		"""
+		self.max_size = max_size
+		self.ruleset_hash: Optional[str] = None
+		self.hits = 0
+		self.misses = 0
+		self.__lock = threading.Lock()
+		self.__counts: Dict[str, int] = {}
+		self.__root: dict = {}
+
+	def __len__(self):
+		"""返回缓存的机构数量"""
+		return len(self.__counts)
+
+	def __contains__(self, institution: str):
+		"""判断机构是否已缓存"""
+		return institution in self.__counts
+
+	def __rebuild(self):
+		"""根据当前缓存的机构重新构建前缀树"""
+		root = {}
+		for institution in self.__counts:
+			node = root
+			for char in institution:
+				node = node.setdefault(char, {})
+			node[_END] = True
+
+		# 整体替换根节点，读取方不会看到构建到一半的前缀树
+		self.__root = root
+
+	def __insert(self, institution: str):
+		"""
+		以写时复制的方式向前缀树中加入一个机构名称
+
+		只复制从根节点到新机构名称结尾的路径上的节点，再整体替换根节点，
+		读取方看到的要么是旧的前缀树，要么是加入了新机构的前缀树。
+		"""
+		root = dict(self.__root)
+		node = root
+		for char in institution:
+			child = node.get(char)
+			child = dict(child) if child is not None else {}
+			node[char] = child
+			node = child
+		node[_END] = True
+
+		self.__root = root
+
+	def __evict(self):
+		"""淘汰命中次数最少的机构，一次淘汰十分之一以摊薄重建前缀树的开销，调用方持有锁"""
+		count = max(1, self.max_size // 10)
+		victims = sorted(self.__counts, key=self.__counts.get)[:count]
+
+		for institution in victims:
+			del self.__counts[institution]
+
+		logger.debug(f'机构前缀缓存已满，淘汰 {len(victims)} 个机构')
+
+	def match(self, info: str) -> Optional[str]:
+		"""
+		查找申请信息开头最长的已知机构名称
+
+		Args:
+			info: 规范化后的申请信息
+
+		Returns:
+			匹配到的机构名称，未匹配时返回None
+		"""
+		node = self.__root
+		matched = 0
+
+		for index, char in enumerate(info):
+			node = node.get(char)
+			if node is None:
+				break
+			if _END in node:
+				matched = index + 1
+
+		if not matched:
+			self.misses += 1
+			return None
+
+		institution = info[:matched]
+		self.hits += 1
+
+		# 只更新已有机构的命中次数；与淘汰操作互斥，避免机构在判断和更新之间被淘汰，
+		# 或者重新加入已淘汰的机构
+		with self.__lock:
+			counts = self.__counts
+			if institution in counts:
+				counts[institution] += 1
+
+		return institution
+
+	def learn(self, institution: str):
+		"""
+		记录一个已确认的机构名称
+
+		Args:
+			institution: 已确认的机构名称
+		"""
+		if not institution or institution in self.__counts:
+			return
+
+		with self.__lock:
+			if institution in self.__counts:
+				return
+
+			if len(self.__counts) >= self.max_size:
+				# 淘汰后重新构建前缀树
+				self.__evict()
+				self.__counts[institution] = 0
+				self.__rebuild()
+			else:
+				self.__counts[institution] = 0
+				self.__insert(institution)
+
+		logger.debug(f'机构前缀缓存学习机构：{institution}')
+
+	def clear(self):
+		"""清空缓存"""
+		with self.__lock:
+			self.__counts.clear()
+			self.__root = {}
+			self.hits = 0
+			self.misses = 0
+
+	def validate(self, ruleset_hash: str):
+		"""
+		校验缓存对应的解析规则，规则变化时清空缓存
+
+		Args:
+			ruleset_hash: 当前解析规则的哈希值
+		"""
+		if self.ruleset_hash != ruleset_hash:
+			if self.__counts:
+				logger.info(f'解析规则已变化，清空 {len(self.__counts)} 个机构前缀缓存')
+			self.clear()
+			self.ruleset_hash = ruleset_hash
+
+	def save(self, path: str | Path):
+		"""
+		保存缓存到JSON文件
+
+		Args:
+			path: 缓存文件路径
+		"""
+		data = {
+			'ruleset_hash': self.ruleset_hash,
+			'institutions': dict(self.__counts),
+		}
+
+		# 先写入临时文件再替换，避免中途退出导致缓存文件损坏
+		temp_path = f'{path}.tmp'
+		with open(temp_path, 'w', encoding='utf-8') as f:
+			json.dump(data, f, ensure_ascii=False)
+		os.replace(temp_path, path)
+
+		logger.debug(f'已保存 {len(self.__counts)} 个机构前缀缓存到：{path}')
+
+	def load(self, path: str | Path, ruleset_hash: str):
+		"""
+		从JSON文件加载缓存，解析规则不一致时忽略文件内容
+
+		Args:
+			path: 缓存文件路径
+			ruleset_hash: 当前解析规则的哈希值
+		"""
+		self.validate(ruleset_hash)
+
+		if not Path(path).exists():
+			return
+
+		with open(path, 'r', encoding='utf-8') as f:
+			data = json.load(f)
+
+		if data.get('ruleset_hash') != ruleset_hash:
+			logger.info(f'机构前缀缓存文件的解析规则已变化，忽略：{path}')
+			return
+
+		institutions = sorted(data.get('institutions', {}).items(),
+			key=lambda item: item[1], reverse=True)[:self.max_size]
+
+		with self.__lock:
+			self.__counts = dict(institutions)
+			self.__rebuild()
+
+		logger.debug(f'已加载 {len(self.__counts)} 个机构前缀缓存：{path}')
+
@@ -0,0 +1,116 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+配置档案
+
+此模块维护具名的配置档案（Profile）。每个配置档案只描述在基础配置上叠加的差异
+（追加的机构简称、排除关键词、词条及输出格式），编译后的解析规则共享同一份只读的
+基础词典，因此同一个进程可以同时使用多个配置档案解析。
+
+使用示例：
+
+from iparser.api.applicant import Applicant
+from iparser.api.profiles import profiles
+
+
+applicant = Applicant('郑大张三', profiles.get('competition_a'))
+applicant.parse()
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from iparser.api.ruleset import Ruleset, compile_ruleset, get_ruleset
+from iparser.config import Profile, config
+from iparser.logger import logger
+
+
+class ProfileRegistry:
+	"""
+	配置档案注册表类
+
+	按名称保存配置档案，并在首次使用时将其叠加到当前发布的解析规则上编译。
+	基础解析规则变化后（例如在GUI中刷新了关键词），会重新编译对应的配置档案。
+	"""
+	def __init__(self, profiles: Optional[Dict[str, Profile]] = None):
+		"""
+		初始化配置档案注册表
+
+		Args:
+			profiles: 初始的配置档案
+		"""
+		self.__lock = threading.Lock()
+		self.__profiles: Dict[str, Profile] = dict(profiles or {})
+		self.__compiled: Dict[str, Tuple[str, Ruleset]] = {}
+
+	def __contains__(self, name: str):
+		"""判断配置档案是否存在"""
+		return name in self.__profiles
+
+	def names(self) -> List[str]:
+		"""获取所有配置档案名称"""
+		return sorted(self.__profiles)
+
+	def register(self, name: str, profile: Profile):
+		"""
+		注册或替换配置档案
+
+		Args:
+			name: 配置档案名称
+			profile: 配置档案
+		"""
+		with self.__lock:
+			self.__profiles[name] = profile
+			self.__compiled.pop(name, None)
+
+		logger.debug(f'已注册配置档案：{name}')
+
+	def unregister(self, name: str):
+		"""
+		删除配置档案
+
+		Args:
+			name: 配置档案名称
+		"""
+		with self.__lock:
+			self.__profiles.pop(name, None)
+			self.__compiled.pop(name, None)
+
+	def get(self, name: Optional[str] = None) -> Ruleset:
+		"""
+		获取配置档案对应的解析规则
+
+		Args:
+			name: 配置档案名称，为None时返回当前发布的解析规则
+
+		Returns:
+			Ruleset: 叠加了配置档案的解析规则
+
+		Raises:
+			KeyError: 配置档案不存在
+		"""
+		base = get_ruleset()
+		if name is None:
+			return base
+
+		if name not in self.__profiles:
+			raise KeyError(f'配置档案不存在：{name}')
+
+		compiled = self.__compiled.get(name)
+		if compiled is not None and compiled[0] == base.hash:
+			return compiled[1]
+
+		with self.__lock:
+			compiled = self.__compiled.get(name)
+			if compiled is None or compiled[0] != base.hash:
+				ruleset = compile_ruleset(self.__profiles[name].apply(base.config))
+				compiled = (base.hash, ruleset)
+				self.__compiled[name] = compiled
+
+				logger.debug(f'已编译配置档案：{name}，叠加词条 {ruleset.overlay_size} 个')
+
+		return compiled[1]
+
+
+profiles = ProfileRegistry(config.profiles)
@@ -0,0 +1,258 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+解析规则
+
+此模块将配置编译为不可变的解析规则（Ruleset）。每个解析规则拥有独立的
+jieba.Tokenizer 实例，发布后不再修改，因此多个线程可以同时使用同一个解析规则，
+而刷新关键词时只需编译并发布一个新的解析规则，不会影响正在进行的解析。
+
+所有解析规则共享同一份只读的基础词典，每个分词器只保存自己添加或删除的词条，
+因此内存占用只随叠加的词条数量增长，而不随解析规则的数量增长。
+
+使用示例：
+
+from iparser.api.ruleset import compile_ruleset, get_ruleset, publish_ruleset
+from iparser.config import config
+
+
+# 根据当前配置编译并发布解析规则
+publish_ruleset(compile_ruleset(config))
+
+# 获取当前发布的解析规则
+ruleset = get_ruleset()
+"""
+import threading
+from typing import FrozenSet, List, Optional
+
+import jieba
+
+from iparser.api.canonical import InstitutionCanonicalizer
+from iparser.api.prefix_cache import InstitutionPrefixCache
+from iparser.api.surname import SurnameNameExtractor
+from iparser.config import Config, config
+from iparser.logger import logger
+
+
+_base_lock = threading.Lock()
+_publish_lock = threading.Lock()
+_base_tokenizer: Optional[jieba.Tokenizer] = None
+_current: Optional['Ruleset'] = None
+
+_MISSING = object()
+_dict_get = dict.get
+_dict_contains = dict.__contains__
+
+
+class FrequencyOverlay(dict):
+	"""
+	叠加在基础词典上的词频表
+
+	自身只保存新增或修改的词条，查询不到时回退到只读的基础词典。
+	jieba.Tokenizer 只通过 in、[] 和 get 访问词频表，写入都会落在叠加层中。
+	"""
+	__slots__ = ('base',)
+
+	def __init__(self, base: dict):
+		"""
+		初始化叠加词频表
+
+		Args:
+			base: 只读的基础词典
+		"""
+		super().__init__()
+		self.base = base
+
+	def __missing__(self, word: str) -> int:
+		"""叠加层中不存在时从基础词典中查询"""
+		return self.base[word]
+
+	def __contains__(self, word: object) -> bool:
+		"""判断词条是否存在于叠加层或基础词典中"""
+		return word in self.base or _dict_contains(self, word)
+
+	def get(self, word: str, default: Optional[int] = None) -> Optional[int]:
+		"""查询词频，叠加层优先"""
+		freq = _dict_get(self, word, _MISSING)
+		if freq is _MISSING:
+			return self.base.get(word, default)
+
+		return freq
+
+
+def _get_base_tokenizer() -> jieba.Tokenizer:
+	"""获取加载了默认词典的基础分词器，基础分词器只读，不会被修改"""
+	global _base_tokenizer
+
+	with _base_lock:
+		if _base_tokenizer is None:
+			tokenizer = jieba.Tokenizer()
+			tokenizer.initialize()
+			_base_tokenizer = tokenizer
+
+	return _base_tokenizer
+
+
+class Ruleset:
+	"""
+	解析规则类
+
+	保存某一时刻配置的快照、预先计算好的关键词集合，以及独立的分词器实例。
+	解析规则发布后不可修改，需要变更时应编译一个新的解析规则。
+
+	Attributes:
+		config: 配置快照
+		hash: 解析规则哈希值
+		teacher_identity: 教师身份关键词
+		identity: 所有身份关键词（教师和学生）
+		suffixes: 机构后缀关键词
+		shortened_names: 机构简称（包括机构别名）
+		all_suffixes: 所有机构后缀和简称关键词
+		connectors: 连接符和分隔符
+		tokenizer: 独立的jieba分词器
+		prefix_cache: 该解析规则对应的机构前缀缓存
+		name_extractor: 姓氏锚定的姓名提取器
+		canonicalizer: 机构名称规范化
+	"""
+	def __init__(self, snapshot: Config, tokenizer: jieba.Tokenizer):
+		"""
+		初始化解析规则
+
+		Args:
+			snapshot: 配置快照，之后不应再修改
+			tokenizer: 已添加关键词的jieba分词器，之后不应再修改
+		"""
+		self.config: Config = snapshot
+		self.hash: str = snapshot.ruleset_hash
+		self.teacher_identity: FrozenSet[str] = frozenset(snapshot.identity.teacher)
+		self.identity: FrozenSet[str] = self.teacher_identity.union(
+			snapshot.identity.student)
+		self.suffixes: FrozenSet[str] = frozenset(snapshot.institution.suffixes)
+		self.shortened_names: FrozenSet[str] = frozenset(
+			snapshot.institution.shortened_names).union(snapshot.institution.aliases)
+		self.all_suffixes: FrozenSet[str] = self.suffixes.union(self.shortened_names)
+		self.connectors: FrozenSet[str] = frozenset(snapshot.formatting.connectors)
+		self.tokenizer = tokenizer
+		self.prefix_cache = InstitutionPrefixCache(snapshot.prefix_cache.max_size)
+		self.prefix_cache.validate(self.hash)
+		self.name_extractor = SurnameNameExtractor(snapshot.identity.teacher,
+			snapshot.identity.student, self.connectors, self.all_suffixes,
+			snapshot.name.surnames)
+		self.canonicalizer = InstitutionCanonicalizer(snapshot.institution.aliases,
+			snapshot.institution.canonical_names, snapshot.institution.fuzzy_distance)
+
+	def __repr__(self):
+		"""返回解析规则的简要描述"""
+		return f'<Ruleset {self.hash}>'
+
+	@property
+	def overlay_size(self) -> int:
+		"""获取分词器在基础词典之上叠加的词条数量"""
+		return len(self.tokenizer.FREQ)
+
+	def cut(self, text: str, hmm: bool) -> List[str]:
+		"""
+		按配置的分词模式对文本进行分词
+
+		搜索引擎模式只保留不被更长的词覆盖的词，提取机构和姓名时不会重复拼接子词。
+
+		Args:
+			text: 待分词的文本
+			hmm: 是否启用HMM新词发现
+
+		Returns:
+			List[str]: 分词结果列表
+		"""
+		if self.config.segmentation.mode == 'search':
+			# 搜索引擎模式在长词之外还会输出其中的子词，提取时会被重复拼接，
+			# 按位置去除被更长的词覆盖的子词
+			tokens = sorted(self.tokenizer.tokenize(text, mode='search', HMM=hmm),
+				key=lambda token: (token[1], -token[2]))
+			segments, covered = [], 0
+			for word, start, end in tokens:
+				if end > covered:
+					segments.append(word)
+					covered = end
+
+			return segments
+
+		return self.tokenizer.lcut(text, HMM=hmm)
+
+
+def compile_ruleset(source: Config) -> Ruleset:
+	"""
+	根据配置编译解析规则
+
+	新的分词器实例以叠加词频表的方式共享基础分词器的词典，
+	再添加机构关键词和自定义词条，并删除干扰关键词。
+
+	Args:
+		source: 配置对象，会对其进行深拷贝，之后修改配置不会影响编译好的解析规则
+
+	Returns:
+		Ruleset: 编译好的解析规则
+	"""
+	snapshot = source.model_copy(deep=True)
+	base = _get_base_tokenizer()
+
+	tokenizer = jieba.Tokenizer()
+	tokenizer.FREQ = FrequencyOverlay(base.FREQ)
+	tokenizer.total = base.total
+	tokenizer.initialized = True
+
+	logger.debug('开始编译解析规则...')
+	logger.debug(f'  当前机构关键词总数（含简称）：{len(snapshot.institution.all_suffixes)}')
+
+	# 添加机构关键词到分词器
+	for keyword in snapshot.institution.all_suffixes:
+		tokenizer.add_word(keyword)
+		tokenizer.suggest_freq(keyword, True)
+
+	# 添加自定义词条
+	for word, freq in snapshot.segmentation.words.items():
+		tokenizer.add_word(word, freq)
+
+	# 删除干扰关键词：只在叠加层中将词频设为0。不使用 del_word()，
+	# 它会把该词加入jieba全局的HMM强制拆分集合，影响其他解析规则
+	for keyword in snapshot.institution.excluded_keywords:
+		tokenizer.FREQ[keyword] = 0
+
+	ruleset = Ruleset(snapshot, tokenizer)
+	logger.debug(f'解析规则编译完成：{ruleset.hash}，叠加词条 {ruleset.overlay_size} 个')
+
+	return ruleset
+
+def publish_ruleset(ruleset: Ruleset):
+	"""
+	发布解析规则，之后新开始的解析都会使用该解析规则
+
+	Args:
+		ruleset: 编译好的解析规则
+	"""
+	global _current
+
+	# 解析规则没有变化时沿用之前的机构前缀缓存
+	if _current is not None and _current.hash == ruleset.hash:
+		ruleset.prefix_cache = _current.prefix_cache
+
+	_current = ruleset
+	logger.debug(f'已发布解析规则：{ruleset.hash}')
+
+def get_ruleset() -> Ruleset:
+	"""
+	获取当前发布的解析规则，尚未发布时根据全局配置编译并发布
+
+	Returns:
+		Ruleset: 当前发布的解析规则
+	"""
+	ruleset = _current
+	if ruleset is not None:
+		return ruleset
+
+	with _publish_lock:
+		if _current is None:
+			publish_ruleset(compile_ruleset(config))
+
+	return _current
@@ -0,0 +1,249 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+姓氏锚定的姓名提取
+
+此模块直接从机构名称之后的剩余字符中提取姓名，不依赖分词：
+1. 身份标识自动机：使用身份关键词的正向和反向字符前缀树，逐字去除开头和末尾的
+   连接符和身份标识（例如“学生”“（教师）”），单字身份标识（例如“学”）只有与
+   连接符相邻时才会被去除，避免误删姓名用字
+2. 姓氏前缀树：剩余部分以单姓或复姓（欧阳、司马等）开头，且总长度为2～4个字时，
+   即认为是姓名
+
+每个字符只需要一次字典查找，因此像“王化学生”这样的粘连文本不再依赖HMM的切分结果。
+无法以姓氏锚定时返回None，由调用方回退到基于分词的提取。
+
+使用示例：
+
+from iparser.api.surname import SurnameNameExtractor
+
+
+extractor = SurnameNameExtractor(teacher_identity={'教师'}, student_identity={'学生'},
+	connectors={'-', '（', '）'})
+# NameMatch(name='王化', segments=('王化', '学生'), is_teacher=False)
+print(extractor.extract('-王化学生'))
+"""
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+
+# 常见单姓
+SINGLE_SURNAMES = (
+	'王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余'
+	'杜叶程苏魏吕丁任沈姚卢姜崔钟谭陆汪范金石廖贾夏韦付方白邹孟熊秦邱江尹薛闫段雷侯龙'
+	'史陶黎贺顾毛郝龚邵万钱严覃武戴莫孔向汤常温康施文牛樊葛邢安齐易乔伍庞颜倪庄聂章鲁'
+	'岳翟殷詹申欧耿关兰焦俞左柳甘祝包宁尚符舒阮柯纪梅童凌毕单季裴霍涂成苗谷盛曲翁冉骆'
+	'蓝路游辛靳管柴蒙鲍华喻祁蒲房滕屈饶解牟艾尤阳时穆农司卓古吉缪简车项连芦麦褚娄窦戚'
+	'岑景党宫费卜冷晏席卫米柏宗瞿桂全佟应臧闵苟邬边卞姬师和仇栾隋商刁沙荣巫寇桑郎甄丛'
+	'仲虞敖巩明佘池查麻苑迟邝官封谈匡鞠惠荆乐冀郁胥南班储原栗燕楚鄢劳谌奚皮粟冼蔺楼盘'
+	'满闻位厉伊仝区郜海阚花权强帅屠豆朴盖练廉禹井祖漆巴丰支卿国狄平计索宣晋相初门云容'
+	'敬来扈晁芮都普阙浦戈伏鹿薄邸雍辜羊阿乌母裘亓修邰赫杭况那宿鲜印逯隆茹诸战慕危玉银'
+	'亢嵇公哈湛宾戎勾茅利於呼居揭干但尉冶斯元束檀衣信展阴昝智幸奉植衡富尧闭由'
+)
+
+# 常见复姓
+COMPOUND_SURNAMES = (
+	'欧阳', '司马', '上官', '诸葛', '东方', '皇甫', '尉迟', '公孙', '慕容', '长孙',
+	'宇文', '司徒', '夏侯', '轩辕', '令狐', '端木', '独孤', '南宫', '西门', '钟离',
+	'澹台', '百里', '呼延', '东郭', '闻人', '万俟', '赫连', '申屠', '太史', '公冶',
+	'宗政', '濮阳', '淳于', '单于', '仲孙', '司空', '羊舌', '微生', '梁丘', '左丘',
+	'第五', '拓跋', '完颜', '公羊', '谷梁', '乐正', '东门', '巫马', '子车', '颛孙',
+)
+
+# 前缀树中标记词条结尾的键，单个字符不会与之冲突
+_END = ''
+
+
+class CharTrie:
+	"""
+	字符前缀树类
+
+	reverse为True时按从后向前的顺序保存词条，用于匹配以某个位置结尾的词条。
+	"""
+	def __init__(self, words: Iterable[str] = (), reverse: bool = False):
+		"""
+		初始化字符前缀树
+
+		Args:
+			words: 词条
+			reverse: 是否按从后向前的顺序匹配
+		"""
+		self.reverse = reverse
+		self.__root: dict = {}
+
+		for word in words:
+			self.add(word)
+
+	def add(self, word: str):
+		"""
+		添加词条
+
+		Args:
+			word: 词条，空字符串会被忽略
+		"""
+		if not word:
+			return
+
+		node = self.__root
+		for char in reversed(word) if self.reverse else word:
+			node = node.setdefault(char, {})
+		node[_END] = True
+
+	def matches(self, text: str, start: int, end: int) -> Iterator[int]:
+		"""
+		按长度从短到长查找text[start:end]中从开头（反向时为末尾）开始的词条
+
+		Args:
+			text: 文本
+			start: 起始位置
+			end: 结束位置（不包含）
+
+		Yields:
+			int: 匹配到的词条长度
+		"""
+		node = self.__root
+		positions = range(end - 1, start - 1, -1) if self.reverse else range(start, end)
+
+		for length, position in enumerate(positions, 1):
+			node = node.get(text[position])
+			if node is None:
+				return
+			if _END in node:
+				yield length
+
+	def longest(self, text: str, start: int, end: int) -> int:
+		"""
+		查找最长的匹配词条
+
+		Args:
+			text: 文本
+			start: 起始位置
+			end: 结束位置（不包含）
+
+		Returns:
+			int: 最长匹配词条的长度，未匹配时返回0
+		"""
+		length = 0
+		for length in self.matches(text, start, end):
+			pass
+
+		return length
+
+
+class NameMatch(NamedTuple):
+	"""姓氏锚定提取出的姓名"""
+	name: str                  # 姓名
+	segments: Tuple[str, ...]  # 按顺序排列的身份标识和姓名
+	is_teacher: bool           # 是否出现了教师身份标识
+
+
+class SurnameNameExtractor:
+	"""
+	姓氏锚定的姓名提取类
+
+	Attributes:
+		min_length: 姓名的最小长度
+		max_length: 姓名的最大长度
+	"""
+	def __init__(self, teacher_identity: Iterable[str], student_identity: Iterable[str],
+		connectors: Iterable[str], blocked: Iterable[str] = (),
+		surnames: Iterable[str] = (), min_length: int = 2, max_length: int = 4):
+		"""
+		初始化姓名提取
+
+		Args:
+			teacher_identity: 教师身份关键词
+			student_identity: 学生身份关键词
+			connectors: 连接符和分隔符
+			blocked: 姓名中不应出现的关键词（例如机构后缀和简称）
+			surnames: 在内置姓氏之外追加的姓氏
+			min_length: 姓名的最小长度
+			max_length: 姓名的最大长度
+		"""
+		self.min_length = min_length
+		self.max_length = max_length
+
+		self.__teacher = frozenset(teacher_identity)
+		identity = self.__teacher.union(student_identity)
+		self.__connectors = frozenset(connectors)
+		self.__head = CharTrie(identity)
+		self.__tail = CharTrie(identity, reverse=True)
+		self.__blocked = CharTrie(blocked)
+		self.__surnames = CharTrie(SINGLE_SURNAMES)
+		for surname in (*COMPOUND_SURNAMES, *surnames):
+			self.__surnames.add(surname)
+
+	def surname_lengths(self, text: str) -> Iterator[int]:
+		"""
+		获取文本开头可能的姓氏长度
+
+		Args:
+			text: 文本
+
+		Yields:
+			int: 姓氏长度，按从短到长排列
+		"""
+		return self.__surnames.matches(text, 0, len(text))
+
+	def extract(self, text: str) -> Optional[NameMatch]:
+		"""
+		从机构名称之后的剩余字符中提取姓名
+
+		Args:
+			text: 机构名称之后的剩余字符
+
+		Returns:
+			Optional[NameMatch]: 提取出的姓名，无法以姓氏锚定时返回None
+		"""
+		connectors = self.__connectors
+		start, end = 0, len(text)
+		head, tail = [], []
+
+		# 去除开头的连接符和身份标识
+		while start < end:
+			if text[start] in connectors:
+				start += 1
+				continue
+
+			length = self.__head.longest(text, start, end)
+			if length > 1 or (length == 1 and start + 1 < end
+				and text[start + 1] in connectors):
+				head.append(text[start:start + length])
+				start += length
+				continue
+
+			break
+
+		# 去除末尾的连接符和身份标识
+		while start < end:
+			if text[end - 1] in connectors:
+				end -= 1
+				continue
+
+			length = self.__tail.longest(text, start, end)
+			if length > 1 or (length == 1 and end - 1 > start
+				and text[end - 2] in connectors):
+				tail.append(text[end - length:end])
+				end -= length
+				continue
+
+			break
+
+		name = text[start:end]
+		if not self.min_length <= len(name) <= self.max_length:
+			return None
+
+		for position, char in enumerate(name):
+			if char in connectors or not '一' <= char <= '鿿' \
+				or self.__blocked.longest(name, position, len(name)):
+				return None
+
+		# 姓氏之后还需要1～2个字的名字
+		lengths = self.surname_lengths(name)
+		if not any(1 <= len(name) - length <= 2 for length in lengths):
+			return None
+
+		identities = head + tail[::-1]
+		return NameMatch(name, (*head, name, *tail[::-1]),
+			any(identity in self.__teacher for identity in identities))
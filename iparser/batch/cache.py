@@ -0,0 +1,247 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+持久化解析缓存
+
+此模块将解析结果保存在本地SQLite数据库中，进程退出后仍然有效：
+- 缓存键为规范化后的申请信息和解析规则的哈希值，修改解析规则后旧的缓存自然失效
+- 数据库使用WAL模式，多个进程（例如批量任务的多个工作进程和GUI）可以同时读写
+- 支持按批次查询和写入，批量解析时每批只需要少量几次查询
+- 超过最大条数或最长保存时间的缓存会被淘汰
+
+使用示例：
+
+from iparser.batch.cache import PersistentParseCache
+from iparser.batch.engine import parse_lines
+
+
+cache = PersistentParseCache('parse_cache.db')
+results = parse_lines(['河南科技职业大学杨怡宁', '河南工学院-郭自强（教师）'], cache=cache)
+cache.close()
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from iparser.config import ParseCache, config
+from iparser.logger import logger
+
+
+# 单次查询使用的最多参数数量，低于SQLite的参数数量限制
+_CHUNK_SIZE = 500
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS parse_cache (
+	ruleset TEXT NOT NULL,
+	info TEXT NOT NULL,
+	institution TEXT NOT NULL,
+	name TEXT NOT NULL,
+	is_teacher INTEGER NOT NULL,
+	created REAL NOT NULL,
+	PRIMARY KEY (ruleset, info)
+);
+CREATE INDEX IF NOT EXISTS parse_cache_created ON parse_cache (created);
+'''
+
+
+def normalize_info(info: str) -> str:
+	"""
+	规范化申请信息，作为缓存键
+
+	只去除首尾空白，不改变其他字符，以免不同的申请信息被当作同一条。
+
+	Args:
+		info: 申请信息
+
+	Returns:
+		str: 规范化后的申请信息
+	"""
+	return info.strip()
+
+
+class PersistentParseCache:
+	"""
+	持久化解析缓存类
+
+	每个线程使用独立的数据库连接，因此同一个缓存对象可以在多个线程中使用。
+
+	Attributes:
+		path: 数据库文件路径
+		max_entries: 最多保存的缓存条数
+		max_age: 缓存最长保存时间，单位为秒
+		hits: 命中次数
+		misses: 未命中次数
+	"""
+	def __init__(self, path: str | Path, max_entries: int = 1_000_000,
+		max_age_days: float = 365.0):
+		"""
+		初始化持久化解析缓存，打开（或创建）数据库并淘汰过期的缓存
+
+		Args:
+			path: 数据库文件路径
+			max_entries: 最多保存的缓存条数
+			max_age_days: 缓存最长保存天数
+		"""
+		self.path = Path(path)
+		self.max_entries = max_entries
+		self.max_age = max_age_days * _SECONDS_PER_DAY
+		self.hits = 0
+		self.misses = 0
+
+		self.__local = threading.local()
+		self.__lock = threading.Lock()
+		self.__writes = 0
+
+		connection = self.__connection()
+		with connection:
+			connection.executescript(_SCHEMA)
+
+		self.evict()
+
+	def __connection(self) -> sqlite3.Connection:
+		"""获取当前线程的数据库连接"""
+		connection = getattr(self.__local, 'connection', None)
+		if connection is None:
+			connection = sqlite3.connect(self.path, timeout=30)
+			connection.execute('PRAGMA journal_mode=WAL')
+			connection.execute('PRAGMA synchronous=NORMAL')
+			self.__local.connection = connection
+
+		return connection
+
+	def __len__(self):
+		"""返回缓存条数"""
+		cursor = self.__connection().execute('SELECT COUNT(*) FROM parse_cache')
+		return cursor.fetchone()[0]
+
+	def get_many(self, infos: Iterable[str],
+		ruleset_hash: str) -> Dict[str, Tuple[str, str, bool]]:
+		"""
+		批量查询解析结果
+
+		Args:
+			infos: 申请信息
+			ruleset_hash: 解析规则的哈希值
+
+		Returns:
+			Dict[str, Tuple[str, str, bool]]: 命中缓存的申请信息到机构名称、姓名、
+				是否为教师的映射，未命中的申请信息不包含在内
+		"""
+		keys: Dict[str, List[str]] = {}
+		for info in infos:
+			keys.setdefault(normalize_info(info), []).append(info)
+
+		connection = self.__connection()
+		normalized = list(keys)
+		found = {}
+
+		for index in range(0, len(normalized), _CHUNK_SIZE):
+			chunk = normalized[index:index + _CHUNK_SIZE]
+			rows = connection.execute(
+				'SELECT info, institution, name, is_teacher FROM parse_cache '
+				f'WHERE ruleset = ? AND info IN ({",".join("?" * len(chunk))})',
+				(ruleset_hash, *chunk))
+
+			for key, institution, name, is_teacher in rows:
+				for info in keys[key]:
+					found[info] = (institution, name, bool(is_teacher))
+
+		misses = sum(len(keys[key]) for key in normalized) - len(found)
+		with self.__lock:
+			self.hits += len(found)
+			self.misses += misses
+
+		return found
+
+	def put_many(self, parsed: Dict[str, Tuple[str, str, bool]], ruleset_hash: str):
+		"""
+		批量写入解析结果，写入的条数较多时顺便淘汰旧的缓存
+
+		Args:
+			parsed: 申请信息到机构名称、姓名、是否为教师的映射
+			ruleset_hash: 解析规则的哈希值
+		"""
+		if not parsed:
+			return
+
+		now = time.time()
+		connection = self.__connection()
+		with connection:
+			connection.executemany(
+				'INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?, ?, ?)',
+				((ruleset_hash, normalize_info(info), institution, name,
+					int(is_teacher), now)
+				for info, (institution, name, is_teacher) in parsed.items()))
+
+		with self.__lock:
+			self.__writes += len(parsed)
+			evict = self.__writes >= max(1000, self.max_entries // 10)
+			if evict:
+				self.__writes = 0
+
+		if evict:
+			self.evict()
+
+	def evict(self) -> int:
+		"""
+		淘汰超过最长保存时间的缓存，以及超出最大条数的最早写入的缓存
+
+		Returns:
+			int: 淘汰的缓存条数
+		"""
+		connection = self.__connection()
+		with connection:
+			evicted = connection.execute('DELETE FROM parse_cache WHERE created < ?',
+				(time.time() - self.max_age,)).rowcount
+
+			overflow = len(self) - self.max_entries
+			if overflow > 0:
+				evicted += connection.execute(
+					'DELETE FROM parse_cache WHERE rowid IN '
+					'(SELECT rowid FROM parse_cache ORDER BY created LIMIT ?)',
+					(overflow,)).rowcount
+
+		if evicted:
+			logger.debug(f'已淘汰持久化解析缓存 {evicted} 条')
+
+		return evicted
+
+	def clear(self):
+		"""清空缓存"""
+		connection = self.__connection()
+		with connection:
+			connection.execute('DELETE FROM parse_cache')
+
+		self.hits = 0
+		self.misses = 0
+
+	def close(self):
+		"""关闭当前线程的数据库连接"""
+		connection = getattr(self.__local, 'connection', None)
+		if connection is not None:
+			connection.close()
+			self.__local.connection = None
+
+
+def open_parse_cache(
+	settings: Optional[ParseCache] = None) -> Optional[PersistentParseCache]:
+	"""
+	按配置打开持久化解析缓存
+
+	Args:
+		settings: 持久化解析缓存配置，默认使用config.yml中的parse_cache配置
+
+	Returns:
+		Optional[PersistentParseCache]: 未启用持久化解析缓存时返回None
+	"""
+	settings = settings or config.parse_cache
+	if not settings.enabled:
+		return None
+
+	return PersistentParseCache(settings.file, settings.max_entries,
+		settings.max_age_days)
@@ -0,0 +1,360 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+列式解析结果存储
+
+此模块提供按列存储批量解析结果的容器，适合导出或统计大量解析结果：
+- 机构名称保存为整数编码，指向去重后的机构名称表
+- 教师身份标识保存为紧凑的字节数组
+- 原始信息和姓名分别保存在一块连续的UTF-8缓冲区中，并记录每条记录的偏移量
+
+使用示例：
+
+from iparser.api.applicant import Applicant
+from iparser.batch.columnar import ResultColumns
+
+
+results = ResultColumns()
+for line in ['河南科技职业大学杨怡宁', '河南工学院-郭自强（教师）']:
+	applicant = Applicant(line)
+	applicant.parse()
+	results.append_applicant(applicant)
+
+results.to_csv('results.csv')
+"""
+import csv
+import json
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from iparser.api.applicant import Applicant
+from iparser.api.ruleset import Ruleset, get_ruleset
+
+
+FIELDS = ('info', 'institution', 'name', 'is_teacher', 'full_info')
+
+
+class ParseResult(NamedTuple):
+	"""单条解析结果"""
+	info: str          # 原始申请信息
+	institution: str   # 机构名称
+	name: str          # 姓名
+	is_teacher: bool   # 是否为教师
+	full_info: str     # 格式化后的申请人信息
+
+
+class _StringColumn:
+	"""将多个字符串保存在一块连续UTF-8缓冲区中的列"""
+	__slots__ = ('data', 'offsets')
+
+	def __init__(self):
+		"""初始化空的字符串列"""
+		self.data = bytearray()
+		self.offsets = array('q', [0])
+
+	def __len__(self):
+		"""返回字符串数量"""
+		return len(self.offsets) - 1
+
+	def __getitem__(self, index: int) -> str:
+		"""解码并返回第index个字符串"""
+		return self.data[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+	def raw(self, index: int) -> memoryview:
+		"""返回第index个字符串的UTF-8编码（不复制）"""
+		return memoryview(self.data)[self.offsets[index]:self.offsets[index + 1]]
+
+	def append(self, value: str):
+		"""追加一个字符串"""
+		self.data += value.encode('utf-8')
+		self.offsets.append(len(self.data))
+
+	def slice(self, start: int, stop: int) -> '_StringColumn':
+		"""复制[start, stop)范围内的字符串，生成新的字符串列"""
+		column = _StringColumn()
+		begin, end = self.offsets[start], self.offsets[stop]
+		column.data = self.data[begin:end]
+		column.offsets = array('q',
+			(offset - begin for offset in self.offsets[start:stop + 1]))
+
+		return column
+
+
+class ResultColumns:
+	"""
+	列式解析结果容器
+
+	按列保存批量解析结果。支持按下标访问、切片、迭代，以及导出为CSV、JSONL
+	和（安装了pyarrow时）Arrow表格或Parquet文件。
+
+	Attributes:
+		output_pattern_teacher: 教师输出格式
+		output_pattern_student: 学生输出格式
+	"""
+	def __init__(self, ruleset: Optional[Ruleset] = None):
+		"""
+		初始化列式解析结果容器
+
+		Args:
+			ruleset: 用于格式化输出的解析规则，默认使用当前发布的解析规则
+		"""
+		formatting = (ruleset or get_ruleset()).config.formatting
+		self.output_pattern_teacher: str = formatting.output_pattern_teacher
+		self.output_pattern_student: str = formatting.output_pattern_student
+
+		self.__infos = _StringColumn()
+		self.__names = _StringColumn()
+		self.__institutions: List[str] = []
+		self.__institution_index: Dict[str, int] = {}
+		self.__institution_codes = array('I')
+		self.__is_teacher = bytearray()
+
+	def __len__(self):
+		"""返回解析结果数量"""
+		return len(self.__is_teacher)
+
+	def __iter__(self) -> Iterator[ParseResult]:
+		"""按顺序迭代解析结果"""
+		for index in range(len(self)):
+			yield self.__result(index)
+
+	def __getitem__(self, key: int | slice) -> 'ParseResult | ResultColumns':
+		"""
+		按下标获取单条解析结果，或按切片获取新的列式解析结果容器
+
+		Args:
+			key: 下标或步长为1的切片
+		"""
+		if isinstance(key, slice):
+			start, stop, step = key.indices(len(self))
+			if step != 1:
+				raise ValueError('列式解析结果只支持步长为1的切片')
+
+			return self.__slice(start, max(start, stop))
+
+		if key < 0:
+			key += len(self)
+		if not 0 <= key < len(self):
+			raise IndexError('解析结果下标超出范围')
+
+		return self.__result(key)
+
+	def __result(self, index: int) -> ParseResult:
+		"""构造第index条解析结果"""
+		institution = self.__institutions[self.__institution_codes[index]]
+		name = self.__names[index]
+		is_teacher = bool(self.__is_teacher[index])
+
+		return ParseResult(self.__infos[index], institution, name, is_teacher,
+			self.format(institution, name, is_teacher))
+
+	def __slice(self, start: int, stop: int) -> 'ResultColumns':
+		"""复制[start, stop)范围内的解析结果"""
+		columns = ResultColumns.__new__(ResultColumns)
+		columns.output_pattern_teacher = self.output_pattern_teacher
+		columns.output_pattern_student = self.output_pattern_student
+		columns.__infos = self.__infos.slice(start, stop)
+		columns.__names = self.__names.slice(start, stop)
+		columns.__institutions = list(self.__institutions)
+		columns.__institution_index = dict(self.__institution_index)
+		columns.__institution_codes = self.__institution_codes[start:stop]
+		columns.__is_teacher = self.__is_teacher[start:stop]
+
+		return columns
+
+	def format(self, institution: str, name: str, is_teacher: bool) -> str:
+		"""
+		按输出格式格式化申请人信息
+
+		Args:
+			institution: 机构名称
+			name: 姓名
+			is_teacher: 是否为教师
+		"""
+		output_pattern = self.output_pattern_teacher \
+			if is_teacher else self.output_pattern_student
+
+		return output_pattern.format(institution=institution, name=name)
+
+	def append(self, info: str, institution: str, name: str, is_teacher: bool):
+		"""
+		追加一条解析结果
+
+		Args:
+			info: 原始申请信息
+			institution: 机构名称
+			name: 姓名
+			is_teacher: 是否为教师
+		"""
+		code = self.__institution_index.get(institution)
+		if code is None:
+			code = len(self.__institutions)
+			self.__institutions.append(institution)
+			self.__institution_index[institution] = code
+
+		self.__infos.append(info)
+		self.__names.append(name)
+		self.__institution_codes.append(code)
+		self.__is_teacher.append(1 if is_teacher else 0)
+
+	def append_applicant(self, applicant: Applicant):
+		"""
+		追加一个已解析的申请人对象
+
+		Args:
+			applicant: 已调用过parse()的申请人对象
+		"""
+		self.append(applicant.info, applicant.institution, applicant.name,
+			applicant.is_teacher)
+
+	def extend(self, results: Iterable[ParseResult]):
+		"""
+		追加多条解析结果
+
+		Args:
+			results: 解析结果
+		"""
+		for result in results:
+			self.append(result.info, result.institution, result.name, result.is_teacher)
+
+	#region Columns
+	@property
+	def institutions(self) -> List[str]:
+		"""获取去重后的机构名称表"""
+		return self.__institutions
+
+	@property
+	def institution_codes(self) -> array:
+		"""获取每条记录的机构编码"""
+		return self.__institution_codes
+
+	@property
+	def is_teacher(self) -> bytearray:
+		"""获取每条记录的教师身份标识（1表示教师，0表示学生）"""
+		return self.__is_teacher
+
+	def infos(self) -> List[str]:
+		"""解码并返回所有原始申请信息"""
+		return [self.__infos[index] for index in range(len(self))]
+
+	def names(self) -> List[str]:
+		"""解码并返回所有姓名"""
+		return [self.__names[index] for index in range(len(self))]
+
+	def institution_counts(self) -> Dict[str, int]:
+		"""统计每个机构的记录数量"""
+		counts = Counter(self.__institution_codes)
+		return {self.__institutions[code]: count
+			for code, count in counts.most_common()}
+	#endregion Columns
+
+	#region Export
+	def to_csv(self, target: str | Path | IO[str]):
+		"""
+		导出为CSV文件
+
+		Args:
+			target: 文件路径或已打开的文本文件对象
+		"""
+		with _open_target(target) as f:
+			writer = csv.writer(f)
+			writer.writerow(FIELDS)
+			for result in self:
+				writer.writerow((result.info, result.institution, result.name,
+					int(result.is_teacher), result.full_info))
+
+	def to_jsonl(self, target: str | Path | IO[str]):
+		"""
+		导出为JSONL文件，每行一条解析结果
+
+		Args:
+			target: 文件路径或已打开的文本文件对象
+		"""
+		with _open_target(target) as f:
+			for result in self:
+				f.write(json.dumps(result._asdict(), ensure_ascii=False))
+				f.write('\n')
+
+	def to_arrow(self):
+		"""
+		转换为Arrow表格，机构列使用字典编码，需要安装pyarrow
+
+		Returns:
+			pyarrow.Table: 包含info、institution、name、is_teacher列的表格
+		"""
+		pa = _import_pyarrow()
+		count = len(self)
+
+		def string_array(column: _StringColumn):
+			return pa.LargeStringArray.from_buffers(count,
+				pa.py_buffer(column.offsets), pa.py_buffer(bytes(column.data)))
+
+		institution = pa.DictionaryArray.from_arrays(
+			pa.array(self.__institution_codes, type=pa.uint32()),
+			pa.array(self.__institutions, type=pa.string()))
+		is_teacher = pa.array(self.__is_teacher, type=pa.uint8()).cast(pa.bool_())
+
+		return pa.table({
+			'info': string_array(self.__infos),
+			'institution': institution,
+			'name': string_array(self.__names),
+			'is_teacher': is_teacher,
+		})
+
+	def write_parquet(self, path: str | Path):
+		"""
+		导出为Parquet文件，需要安装pyarrow
+
+		Args:
+			path: 文件路径
+		"""
+		_import_pyarrow()
+		import pyarrow.parquet as pq
+
+
+		pq.write_table(self.to_arrow(), str(path))
+
+	def write_records(self, path: str | Path, ruleset: Optional[Ruleset] = None):
+		"""
+		导出为二进制解析结果文件，参见 iparser.batch.records
+
+		Args:
+			path: 文件路径
+			ruleset: 提供输出格式的解析规则，默认使用当前发布的解析规则
+		"""
+		from iparser.batch.records import RecordWriter
+
+
+		with RecordWriter(path, ruleset) as writer:
+			# 原始信息和姓名已经是UTF-8编码，直接写入，不需要解码后重新编码
+			for index in range(len(self)):
+				writer.write_raw(self.__infos.raw(index),
+					self.__institutions[self.__institution_codes[index]],
+					self.__names.raw(index), bool(self.__is_teacher[index]))
+	#endregion Export
+
+
+@contextmanager
+def _open_target(target: str | Path | IO[str]) -> Iterator[IO[str]]:
+	"""打开导出目标，传入已打开的文件对象时不负责关闭"""
+	if hasattr(target, 'write'):
+		yield target
+		return
+
+	with open(target, 'w', encoding='utf-8', newline='') as f:
+		yield f
+
+def _import_pyarrow():
+	"""导入可选依赖pyarrow"""
+	try:
+		import pyarrow
+	except ImportError as e:
+		raise ImportError(
+			'导出Arrow/Parquet需要安装pyarrow：pip install iparser[arrow]') from e
+
+	return pyarrow
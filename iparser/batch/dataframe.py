@@ -0,0 +1,125 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+pandas 集成
+
+此模块批量解析 pandas.Series 中的申请信息，需要安装pandas：
+- 先对整列做因子化（factorize），每个不同的申请信息只解析一次，可选使用线程池并发解析
+- 解析结果按唯一值保存在数组中，再用因子化得到的编码通过take一次性展开为结果列，
+  不为每一行创建Python对象
+- 机构列使用分类类型（category），缺失值所在行的结果为缺失值
+
+使用示例：
+
+import pandas as pd
+
+from iparser.batch.dataframe import parse_series, register_accessor
+
+
+df = pd.DataFrame({'raw': ['河南科技职业大学杨怡宁', '河南工学院-郭自强（教师）']})
+result = parse_series(df['raw'])
+
+# 注册访问器后也可以写作
+register_accessor()
+result = df['raw'].iparser.parse(max_workers=4)
+"""
+from typing import Optional
+
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.batch.cache import PersistentParseCache
+from iparser.batch.engine import parse_unique
+
+
+COLUMNS = ('institution', 'name', 'is_teacher', 'full_info')
+
+
+def parse_series(series, ruleset: Optional[Ruleset] = None, max_workers: int = 1,
+	cache: Optional[PersistentParseCache] = None):
+	"""
+	解析一列申请信息
+
+	Args:
+		series: 申请信息列（pandas.Series），非字符串的值会先转换为字符串
+		ruleset: 解析规则，默认使用当前发布的解析规则
+		max_workers: 并发解析唯一值的线程数，为1时在当前线程中解析
+		cache: 持久化解析缓存
+
+	Returns:
+		pandas.DataFrame: 与输入列索引相同，包含institution、name、is_teacher、
+			full_info列的表格
+	"""
+	pd = _import_pandas()
+	import numpy as np
+
+
+	ruleset = ruleset or get_ruleset()
+	formatting = ruleset.config.formatting
+
+	codes, uniques = pd.factorize(series)
+	values = [str(value) for value in uniques]
+	parsed = parse_unique(values, ruleset, max_workers, cache=cache)
+
+	# 每个唯一值的解析结果，末尾多出的一项对应缺失值，编码-1经take后正好取到它
+	count = len(values)
+	names = np.empty(count + 1, dtype=object)
+	full_infos = np.empty(count + 1, dtype=object)
+	institutions = np.empty(count, dtype=object)
+	is_teacher = np.zeros(count + 1, dtype=bool)
+
+	for index, value in enumerate(values):
+		institution, name, teacher = parsed[value]
+		output_pattern = formatting.output_pattern_teacher \
+			if teacher else formatting.output_pattern_student
+
+		institutions[index] = institution
+		names[index] = name
+		is_teacher[index] = teacher
+		full_infos[index] = output_pattern.format(institution=institution, name=name)
+
+	names[count] = full_infos[count] = None
+
+	institution_codes, categories = pd.factorize(institutions)
+	institution_codes = np.append(institution_codes, -1)
+	missing = codes < 0
+
+	return pd.DataFrame({
+		'institution': pd.Categorical.from_codes(np.take(institution_codes, codes),
+			categories=categories),
+		'name': np.take(names, codes),
+		'is_teacher': pd.arrays.BooleanArray(np.take(is_teacher, codes), missing),
+		'full_info': np.take(full_infos, codes),
+	}, index=series.index)
+
+def register_accessor(name: str = 'iparser'):
+	"""
+	注册pandas.Series访问器，之后可以使用 series.iparser.parse() 解析申请信息
+
+	Args:
+		name: 访问器名称
+	"""
+	pd = _import_pandas()
+
+
+	@pd.api.extensions.register_series_accessor(name)
+	class ApplicantAccessor:
+		"""申请信息列访问器"""
+		def __init__(self, series):
+			self.__series = series
+
+		def parse(self, ruleset: Optional[Ruleset] = None, max_workers: int = 1,
+			cache: Optional[PersistentParseCache] = None):
+			"""解析申请信息列，参数与parse_series相同"""
+			return parse_series(self.__series, ruleset, max_workers, cache)
+
+	return ApplicantAccessor
+
+def _import_pandas():
+	"""导入可选依赖pandas"""
+	try:
+		import pandas
+	except ImportError as e:
+		raise ImportError('使用pandas集成需要安装pandas：pip install iparser[pandas]') from e
+
+	return pandas
@@ -0,0 +1,183 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+批量解析引擎
+
+此模块对一批申请信息进行解析：相同的申请信息只解析一次，可选使用线程池并发解析，
+结果按输入顺序保存到列式解析结果容器中。
+
+使用示例：
+
+from iparser.batch.engine import parse_lines
+
+
+results = parse_lines(['河南科技职业大学杨怡宁', '河南工学院-郭自强（教师）'])
+print([result.full_info for result in results])
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from iparser.api.applicant import Applicant
+from iparser.api.guard import TimeBudgetExceeded, looks_like_applicant, truncate
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.batch.cache import PersistentParseCache
+from iparser.batch.columnar import ResultColumns
+from iparser.batch.profiling import active_profiler
+
+
+# 单条解析结果：机构名称、姓名、是否为教师
+Parsed = Tuple[str, str, bool]
+
+
+def parse_one(info: str, ruleset: Ruleset) -> Parsed:
+	"""
+	解析单条申请信息
+
+	启用了性能分析器（iparser.batch.profiling.Profiler）时，由性能分析器按抽样比例分析。
+
+	Args:
+		info: 申请信息
+		ruleset: 解析规则
+
+	Returns:
+		Parsed: 机构名称、姓名、是否为教师
+	"""
+	profiler = active_profiler()
+	if profiler is not None:
+		return profiler.run(_parse, info, ruleset)
+
+	return _parse(info, ruleset)
+
+def _parse(info: str, ruleset: Ruleset) -> Parsed:
+	"""解析单条申请信息，启用性能分析时在性能分析器中调用"""
+	applicant = Applicant(info, ruleset)
+	applicant.parse()
+
+	return applicant.institution, applicant.name, applicant.is_teacher
+
+def parse_unique(infos: Iterable[str], ruleset: Optional[Ruleset] = None,
+	max_workers: int = 1, time_budget: Optional[float] = None,
+	cache: Optional[PersistentParseCache] = None) -> Dict[str, Parsed]:
+	"""
+	解析去重后的申请信息
+
+	提供持久化解析缓存时，先批量查询缓存，只解析未命中的申请信息，
+	解析结果（包括超出时间预算前已解析的部分）写回缓存。
+
+	Args:
+		infos: 申请信息，可以包含重复项
+		ruleset: 解析规则，默认使用当前发布的解析规则
+		max_workers: 并发解析的线程数，为1时在当前线程中解析
+		time_budget: 时间预算，单位为秒，为None时不限制
+		cache: 持久化解析缓存
+
+	Returns:
+		Dict[str, Parsed]: 申请信息到解析结果的映射
+
+	Raises:
+		TimeBudgetExceeded: 解析超出时间预算
+	"""
+	ruleset = ruleset or get_ruleset()
+	uniques = list(dict.fromkeys(infos))
+	deadline = time.perf_counter() + time_budget if time_budget is not None else None
+	parsed = cache.get_many(uniques, ruleset.hash) if cache is not None else {}
+	pending = [info for info in uniques if info not in parsed] if parsed else uniques
+
+	def parse_chunk(chunk: List[str]) -> List[Parsed]:
+		results = []
+		for info in chunk:
+			if deadline is not None and time.perf_counter() > deadline:
+				raise TimeBudgetExceeded(len(parsed) + len(results), len(uniques))
+			results.append(parse_one(info, ruleset))
+
+		return results
+
+	try:
+		if max_workers <= 1 or len(pending) < max_workers:
+			# 分块解析，以便在块与块之间检查时间预算
+			for index in range(0, len(pending), 64):
+				chunk = pending[index:index + 64]
+				parsed.update(zip(chunk, parse_chunk(chunk)))
+
+			return parsed
+
+		chunk_size = max(1, len(pending) // (max_workers * 4))
+		chunks = [pending[index:index + chunk_size]
+			for index in range(0, len(pending), chunk_size)]
+
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			try:
+				for chunk, results in zip(chunks, executor.map(parse_chunk, chunks)):
+					parsed.update(zip(chunk, results))
+			except TimeBudgetExceeded:
+				executor.shutdown(wait=False, cancel_futures=True)
+				raise
+
+		return parsed
+	finally:
+		if cache is not None:
+			cache.put_many({info: parsed[info] for info in pending if info in parsed},
+				ruleset.hash)
+
+def parse_lines(lines: Iterable[str], ruleset: Optional[Ruleset] = None,
+	max_workers: int = 1, time_budget: Optional[float] = None,
+	cache: Optional[PersistentParseCache] = None) -> ResultColumns:
+	"""
+	批量解析申请信息，结果按输入顺序保存
+
+	Args:
+		lines: 申请信息，每项一条
+		ruleset: 解析规则，默认使用当前发布的解析规则
+		max_workers: 并发解析的线程数，为1时在当前线程中解析
+		time_budget: 时间预算，单位为秒，为None时不限制
+		cache: 持久化解析缓存
+
+	Returns:
+		ResultColumns: 按输入顺序保存的解析结果
+
+	Raises:
+		TimeBudgetExceeded: 解析超出时间预算
+	"""
+	ruleset = ruleset or get_ruleset()
+	lines = list(lines)
+	parsed = parse_unique(lines, ruleset, max_workers, time_budget, cache)
+
+	results = ResultColumns(ruleset)
+	for line in lines:
+		results.append(line, *parsed[line])
+
+	return results
+
+def parse_pasted_lines(lines: Iterable[str], ruleset: Optional[Ruleset] = None,
+	time_budget: Optional[float] = None,
+	cache: Optional[PersistentParseCache] = None) -> Tuple[str, int]:
+	"""
+	批量解析从表格复制的多行内容，按原来的行顺序拼接解析结果
+
+	剪贴板监听（GUI和无界面守护进程）解析多行内容时使用。空行和不像申请信息的行
+	保持原样，确保粘贴回表格时与原来的行一一对应。
+
+	Args:
+		lines: 按行拆分后的内容
+		ruleset: 解析规则，默认使用当前发布的解析规则
+		time_budget: 时间预算，单位为秒，为None时不限制
+		cache: 持久化解析缓存
+
+	Returns:
+		Tuple[str, int]: 按行拼接的解析结果，以及实际解析的行数
+
+	Raises:
+		TimeBudgetExceeded: 解析超出时间预算
+	"""
+	ruleset = ruleset or get_ruleset()
+	rows = [line.strip() for line in lines]
+	candidates = {row: truncate(row) for row in rows
+		if row and looks_like_applicant(row, ruleset)}
+	results = parse_lines(list(candidates.values()), ruleset, time_budget=time_budget,
+		cache=cache)
+
+	outputs = dict(zip(candidates, (result.full_info for result in results)))
+	return '\n'.join(outputs.get(row, row) for row in rows), len(results)
@@ -0,0 +1,302 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+表格文件批量解析
+
+此模块解析用户在GUI中打开的表格文件，输出文件写在输入文件旁边：
+- TXT：每行一条申请信息，输出为CSV文件，包含info、institution、name、is_teacher、
+  full_info列
+- CSV：自动识别申请信息所在的列（包含机构后缀或简称最多的列）和表头，在原有列之后
+  追加institution、name、is_teacher、full_info列；依次尝试UTF-8和GB18030编码
+- XLSX：与CSV相同，读取第一个工作表，需要安装openpyxl
+
+解析在调用方的线程中分块进行，每块完成后报告进度，并检查是否已取消，
+GUI在后台线程中运行，界面不会失去响应。
+
+使用示例：
+
+from iparser.batch.files import FileParseJob
+
+
+job = FileParseJob('名单.xlsx')
+output = job.run(
+	progress=lambda done, total, rate: print(f'{done}/{total}，{rate:.0f} 行/秒'))
+print(output)    # 名单.parsed.xlsx
+"""
+import csv
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from iparser.api.guard import looks_like_applicant, truncate
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.batch.cache import PersistentParseCache
+from iparser.batch.columnar import FIELDS
+from iparser.batch.engine import parse_lines
+from iparser.logger import logger
+
+
+SUPPORTED_SUFFIXES = ('.txt', '.csv', '.xlsx')
+ENCODINGS = ('utf-8-sig', 'gb18030')
+
+# 识别申请信息所在的列时检查的行数
+PROBE_ROWS = 200
+
+
+class ParseCancelled(Exception):
+	"""表格文件解析已取消"""
+	def __init__(self, completed: int, total: int):
+		"""
+		初始化异常
+
+		Args:
+			completed: 取消前已解析的行数
+			total: 总行数
+		"""
+		super().__init__(f'已取消，已解析 {completed}/{total} 行')
+		self.completed = completed
+		self.total = total
+
+
+def output_path_for(path: str | Path) -> Path:
+	"""
+	获取输入文件旁边的输出文件路径
+
+	Args:
+		path: 输入文件路径
+
+	Returns:
+		Path: 输出文件路径，例如 名单.xlsx 对应 名单.parsed.xlsx，名单.txt 对应 名单.parsed.csv
+	"""
+	path = Path(path)
+	suffix = '.xlsx' if path.suffix.lower() == '.xlsx' else '.csv'
+
+	return path.with_name(f'{path.stem}.parsed{suffix}')
+
+def read_table(path: str | Path) -> List[List[str]]:
+	"""
+	读取表格文件中的所有行
+
+	Args:
+		path: TXT、CSV或XLSX文件路径
+
+	Returns:
+		List[List[str]]: 所有行，每行为各单元格的文本，TXT文件每行只有一个单元格
+
+	Raises:
+		ValueError: 文件类型不受支持，或者无法识别文件编码
+	"""
+	path = Path(path)
+	suffix = path.suffix.lower()
+
+	if suffix == '.xlsx':
+		openpyxl = _import_openpyxl()
+		workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+		try:
+			return [['' if value is None else str(value) for value in row]
+				for row in workbook.worksheets[0].iter_rows(values_only=True)]
+		finally:
+			workbook.close()
+
+	if suffix not in SUPPORTED_SUFFIXES:
+		raise ValueError(f'不支持的文件类型：{path.suffix}，仅支持 {", ".join(SUPPORTED_SUFFIXES)}')
+
+	for encoding in ENCODINGS:
+		try:
+			with open(path, 'r', encoding=encoding, newline='') as f:
+				if suffix == '.csv':
+					return [row for row in csv.reader(f)]
+				return [[line.rstrip('\r\n')] for line in f]
+		except UnicodeDecodeError:
+			continue
+
+	raise ValueError(f'无法识别文件编码，请另存为UTF-8编码：{path}')
+
+def detect_column(rows: List[List[str]],
+	ruleset: Optional[Ruleset] = None) -> Tuple[int, bool]:
+	"""
+	识别申请信息所在的列和表头
+
+	Args:
+		rows: 表格的所有行
+		ruleset: 解析规则，默认使用当前发布的解析规则
+
+	Returns:
+		Tuple[int, bool]: 申请信息所在的列序号，以及第一行是否为表头
+
+	Raises:
+		ValueError: 表格中没有像申请信息的内容
+	"""
+	ruleset = ruleset or get_ruleset()
+	counts = {}
+
+	for row in rows[:PROBE_ROWS]:
+		for index, cell in enumerate(row):
+			if cell and looks_like_applicant(cell, ruleset):
+				counts[index] = counts.get(index, 0) + 1
+
+	if not counts:
+		raise ValueError('没有找到申请信息，请确认表格中有包含机构名称的列')
+
+	column = max(counts, key=lambda index: (counts[index], -index))
+	first = rows[0][column] if column < len(rows[0]) else ''
+	has_header = len(rows) > 1 and not looks_like_applicant(first, ruleset)
+
+	return column, has_header
+
+
+class FileParseJob:
+	"""
+	表格文件批量解析类
+
+	Attributes:
+		input_path: 输入文件路径
+		output_path: 输出文件路径
+		column: 申请信息所在的列序号，运行后有效
+		has_header: 第一行是否为表头，运行后有效
+		rows: 表格的数据行数（不含表头），运行后有效
+	"""
+	def __init__(self, input_path: str | Path, output_path: Optional[str | Path] = None,
+		ruleset: Optional[Ruleset] = None, chunk_size: int = 500, max_workers: int = 1,
+		cache: Optional[PersistentParseCache] = None):
+		"""
+		初始化表格文件批量解析
+
+		Args:
+			input_path: 输入文件路径
+			output_path: 输出文件路径，默认写在输入文件旁边
+			ruleset: 解析规则，默认使用当前发布的解析规则
+			chunk_size: 每块的行数，每块完成后报告进度并检查是否已取消
+			max_workers: 并发解析的线程数
+			cache: 持久化解析缓存
+		"""
+		self.input_path = Path(input_path)
+		self.output_path = Path(output_path) if output_path \
+			else output_path_for(input_path)
+		self.column = 0
+		self.has_header = False
+		self.rows = 0
+
+		self.__ruleset = ruleset or get_ruleset()
+		self.__chunk_size = chunk_size
+		self.__max_workers = max_workers
+		self.__cache = cache
+
+	def run(self, progress: Optional[Callable[[int, int, float], None]] = None,
+		cancel: Optional[threading.Event] = None) -> Path:
+		"""
+		解析表格文件并写入输出文件
+
+		Args:
+			progress: 进度回调，参数为已解析的行数、总行数和每秒解析的行数
+			cancel: 取消事件，设置后在当前块完成时停止，不写入输出文件
+
+		Returns:
+			Path: 输出文件路径
+
+		Raises:
+			ParseCancelled: 解析已取消
+			ValueError: 文件类型不受支持，或者没有找到申请信息
+		"""
+		table = read_table(self.input_path)
+		if not table:
+			raise ValueError(f'文件为空：{self.input_path}')
+
+		txt = self.input_path.suffix.lower() == '.txt'
+		if txt:
+			self.column, self.has_header = 0, False
+		else:
+			self.column, self.has_header = detect_column(table, self.__ruleset)
+
+		header = table[0] if self.has_header else None
+		data = table[1:] if self.has_header else table
+		self.rows = len(data)
+
+		results = [None] * len(data)
+		start = time.perf_counter()
+
+		for offset in range(0, len(data), self.__chunk_size):
+			if cancel is not None and cancel.is_set():
+				raise ParseCancelled(offset, len(data))
+
+			chunk = data[offset:offset + self.__chunk_size]
+			cells = [row[self.column].strip() if self.column < len(row) else ''
+				for row in chunk]
+			candidates = [(index, truncate(cell)) for index, cell in enumerate(cells)
+				if cell and (txt or looks_like_applicant(cell, self.__ruleset))]
+
+			parsed = parse_lines([info for _, info in candidates], self.__ruleset,
+				self.__max_workers, cache=self.__cache)
+			for (index, _), result in zip(candidates, parsed):
+				results[offset + index] = result
+
+			done = offset + len(chunk)
+			if progress is not None:
+				elapsed = time.perf_counter() - start
+				progress(done, len(data), done / elapsed if elapsed > 0 else 0.0)
+
+		self.__write(header, data, results)
+		logger.info(f'表格文件解析完成：{self.rows} 行，用时 {time.perf_counter() - start:.1f} 秒，'
+			f'{self.output_path}')
+
+		return self.output_path
+
+	def __write(self, header: Optional[List[str]], data: List[List[str]],
+		results: List):
+		"""写入输出文件（原子写入），不像申请信息的行解析结果为空"""
+		if self.input_path.suffix.lower() == '.txt':
+			header = list(FIELDS)
+			rows = [[row[0] if row else '', *self.__result_cells(result)]
+				for row, result in zip(data, results)]
+		else:
+			# 各行的列数可能不同，解析结果统一追加在最宽的一行之后
+			header = header or []
+			width = max(len(header), *(len(row) for row in data))
+			header = [*header, *([''] * (width - len(header))), *FIELDS[1:]]
+			rows = [[*row, *([''] * (width - len(row))), *self.__result_cells(result)]
+				for row, result in zip(data, results)]
+
+		temp = self.output_path.with_name(self.output_path.name + '.tmp')
+		try:
+			if self.output_path.suffix.lower() == '.xlsx':
+				openpyxl = _import_openpyxl()
+				workbook = openpyxl.Workbook(write_only=True)
+				sheet = workbook.create_sheet()
+				sheet.append(header)
+				for row in rows:
+					sheet.append(row)
+				workbook.save(temp)
+			else:
+				# 带BOM的UTF-8，Excel可以直接打开
+				with open(temp, 'w', encoding='utf-8-sig', newline='') as f:
+					writer = csv.writer(f)
+					writer.writerow(header)
+					writer.writerows(rows)
+		except BaseException:
+			temp.unlink(missing_ok=True)
+			raise
+
+		os.replace(temp, self.output_path)
+
+	@staticmethod
+	def __result_cells(result) -> List:
+		"""获取一行解析结果的单元格"""
+		if result is None:
+			return ['', '', '', '']
+
+		return [result.institution, result.name, int(result.is_teacher),
+			result.full_info]
+
+
+def _import_openpyxl():
+	"""导入可选依赖openpyxl"""
+	try:
+		import openpyxl
+	except ImportError as e:
+		raise ImportError('读写XLSX文件需要安装openpyxl：pip install iparser[xlsx]') from e
+
+	return openpyxl
@@ -0,0 +1,373 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+可断点续传的批量任务
+
+此模块按固定行数将输入文件分块解析，适合处理数百万行的输入文件：
+- 每块的解析结果先写入临时文件，再原子地替换为分块输出文件
+- 每完成一块都会更新检查点清单（manifest.json），记录每块在输入文件中的字节偏移、
+  行数以及解析规则的哈希值
+- 任务中断后再次运行，从最后一个完成的分块继续解析
+- 解析规则、输入文件或输出格式发生变化时，丢弃已有的分块重新开始；
+  续传时可以使用不同的分块大小
+- 所有分块完成后按顺序合并为最终的输出文件
+- 指定多个工作进程时，通过 mmap 将输入文件切分为按行首对齐的字节范围，
+  由工作进程并行解码和解析，分块按顺序写入（参见 iparser.batch.mapped）
+
+输入文件为UTF-8编码的文本文件，每行一条申请信息，空行会被跳过。
+
+使用示例：
+
+from iparser.batch.jobs import BatchJob
+
+
+job = BatchJob('applicants.txt', 'applicants.csv', chunk_size=10000)
+job.run()
+"""
+import codecs
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.batch.cache import PersistentParseCache
+from iparser.batch.columnar import ResultColumns
+from iparser.batch.engine import parse_lines
+from iparser.batch.mapped import MappedInput, parse_ranges
+from iparser.batch.records import RecordReader, RecordWriter
+from iparser.logger import logger
+
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+FORMATS = ('csv', 'jsonl', 'iprec')
+
+
+class ChunkRecord(NamedTuple):
+	"""已完成分块的检查点记录"""
+	index: int  # 分块序号
+	start: int  # 在输入文件中的起始字节偏移
+	end: int    # 在输入文件中的结束字节偏移（不含）
+	rows: int   # 解析的行数
+	file: str   # 分块输出文件名
+
+
+def read_rows(path: str | Path, start: int = 0, end: Optional[int] = None,
+	limit: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+	"""
+	从输入文件的指定字节偏移开始逐行读取申请信息
+
+	跳过文件开头的UTF-8 BOM、行尾的换行符（包括CRLF）和空行。
+
+	Args:
+		path: 输入文件路径
+		start: 起始字节偏移，必须位于行首
+		end: 结束字节偏移（不含），为None时读取到文件末尾
+		limit: 最多读取的行数（不含空行），为None时不限制
+
+	Yields:
+		Tuple[int, str]: 读取完该行后的字节偏移，以及该行的申请信息
+	"""
+	count = 0
+
+	with open(path, 'rb') as f:
+		f.seek(start)
+		if start == 0 and f.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+			f.seek(0)
+
+		offset = f.tell()
+		while (end is None or offset < end) and (limit is None or count < limit):
+			line = f.readline()
+			if not line:
+				break
+
+			offset += len(line)
+			row = line.decode('utf-8').rstrip('\r\n')
+			if not row.strip():
+				continue
+
+			count += 1
+			yield offset, row
+
+def atomic_write_json(path: Path, content: Dict):
+	"""
+	原子地写入JSON文件，先写入临时文件再替换
+
+	Args:
+		path: 文件路径
+		content: 文件内容
+	"""
+	temp = path.with_name(path.name + '.tmp')
+	with open(temp, 'w', encoding='utf-8') as f:
+		json.dump(content, f, ensure_ascii=False, indent='\t')
+
+	os.replace(temp, path)
+
+
+class BatchJob:
+	"""
+	可断点续传的批量任务类
+
+	分块输出文件和检查点清单保存在输出文件旁边的工作目录（输出文件名加上.parts）中，
+	全部分块完成并合并后，分块输出文件会被删除，只保留检查点清单。
+
+	Attributes:
+		input_path: 输入文件路径
+		output_path: 输出文件路径
+		work_dir: 保存分块输出文件和检查点清单的工作目录
+		chunk_size: 每块的行数
+		format: 输出格式，csv、jsonl或iprec（二进制解析结果文件）
+		chunks: 已完成分块的检查点记录
+	"""
+	def __init__(self, input_path: str | Path, output_path: str | Path,
+		chunk_size: int = 10000, ruleset: Optional[Ruleset] = None,
+		max_workers: int = 1, cache: Optional[PersistentParseCache] = None,
+		output_format: Optional[str] = None, processes: int = 1):
+		"""
+		初始化批量任务
+
+		Args:
+			input_path: 输入文件路径
+			output_path: 输出文件路径
+			chunk_size: 每块的行数
+			ruleset: 解析规则，默认使用当前发布的解析规则
+			max_workers: 并发解析的线程数
+			cache: 持久化解析缓存
+			output_format: 输出格式，csv、jsonl或iprec，默认根据输出文件扩展名判断
+			processes: 并行解码和解析的工作进程数，大于1时每块的行数按抽样估算的
+				平均行长换算为字节数，实际行数与chunk_size大致相同
+
+		Raises:
+			ValueError: 不支持的输出格式或分块大小
+		"""
+		self.input_path = Path(input_path)
+		self.output_path = Path(output_path)
+		self.work_dir = self.output_path.with_name(self.output_path.name + '.parts')
+		self.chunk_size = chunk_size
+		self.format = output_format or self.output_path.suffix.lstrip('.').lower()
+		self.chunks: List[ChunkRecord] = []
+
+		self.__ruleset = ruleset or get_ruleset()
+		self.__max_workers = max_workers
+		self.__cache = cache
+		self.__processes = processes
+
+		if self.format not in FORMATS:
+			raise ValueError(f'不支持的输出格式：{self.format}，仅支持 {", ".join(FORMATS)}')
+		if chunk_size <= 0:
+			raise ValueError('分块大小必须大于0')
+
+	@property
+	def manifest_path(self) -> Path:
+		"""获取检查点清单文件路径"""
+		return self.work_dir / MANIFEST_FILE
+
+	@property
+	def rows(self) -> int:
+		"""获取已完成分块的总行数"""
+		return sum(chunk.rows for chunk in self.chunks)
+
+	def __fingerprint(self) -> Dict:
+		"""获取决定任务能否续传的输入文件、解析规则和分块信息"""
+		stat = self.input_path.stat()
+
+		return {
+			'version': MANIFEST_VERSION,
+			'input': str(self.input_path.resolve()),
+			'input_size': stat.st_size,
+			'input_mtime_ns': stat.st_mtime_ns,
+			'ruleset_hash': self.__ruleset.hash,
+			'format': self.format,
+		}
+
+	def __save_manifest(self, completed: bool = False):
+		"""保存检查点清单"""
+		atomic_write_json(self.manifest_path, {
+			**self.__fingerprint(),
+			'chunk_size': self.chunk_size,
+			'completed': completed,
+			'chunks': [chunk._asdict() for chunk in self.chunks],
+		})
+
+	def __load_manifest(self) -> bool:
+		"""
+		加载检查点清单，只保留分块输出文件仍然存在的连续分块
+
+		Returns:
+			bool: 检查点清单有效且任务已经全部完成时返回True
+		"""
+		self.chunks = []
+
+		if not self.manifest_path.exists():
+			return False
+
+		try:
+			with open(self.manifest_path, 'r', encoding='utf-8') as f:
+				manifest = json.load(f)
+		except (OSError, ValueError) as e:
+			logger.warning(f'检查点清单无法读取，重新开始：{str(e)}')
+			return False
+
+		fingerprint = self.__fingerprint()
+		changed = [key for key, value in fingerprint.items()
+			if manifest.get(key) != value]
+		if changed:
+			if 'ruleset_hash' in changed:
+				logger.info('解析规则已变化，批量任务重新开始')
+			else:
+				logger.info(f'批量任务的 {", ".join(changed)} 已变化，重新开始')
+			return False
+
+		if manifest.get('completed'):
+			self.chunks = [ChunkRecord(**chunk) for chunk in manifest['chunks']]
+			return True
+
+		for chunk in manifest['chunks']:
+			chunk = ChunkRecord(**chunk)
+			if chunk.index != len(self.chunks) \
+				or not (self.work_dir / chunk.file).exists():
+				break
+			self.chunks.append(chunk)
+
+		return False
+
+	def reset(self):
+		"""丢弃已完成的分块和检查点清单"""
+		if self.work_dir.exists():
+			shutil.rmtree(self.work_dir)
+
+		self.chunks = []
+
+	def run(self, restart: bool = False,
+		progress: Optional[Callable[[int, int, int], None]] = None) -> Path:
+		"""
+		运行批量任务，已有有效的检查点时从最后一个完成的分块继续
+
+		Args:
+			restart: 是否忽略已有的检查点重新开始
+			progress: 进度回调函数，每完成一块调用一次，参数为已处理的字节数、
+				输入文件的总字节数和已解析的行数
+
+		Returns:
+			Path: 输出文件路径
+		"""
+		if not restart and self.__load_manifest():
+			if self.output_path.exists():
+				logger.info(f'批量任务已完成：{self.output_path}')
+				return self.output_path
+
+			# 输出文件已被删除，分块输出文件也已清理，只能重新开始
+			self.chunks = []
+
+		if not self.chunks:
+			self.reset()
+			self.work_dir.mkdir(parents=True, exist_ok=True)
+		else:
+			logger.info(f'从第 {len(self.chunks) + 1} 块继续批量任务，'
+				f'已完成 {self.rows} 行')
+
+		total = self.input_path.stat().st_size
+		start = self.chunks[-1].end if self.chunks else 0
+
+		if self.__processes > 1:
+			self.__run_mapped(start, total, progress)
+		else:
+			self.__run_rows(start, total, progress)
+
+		self.__combine()
+		self.__save_manifest(completed=True)
+
+		for chunk in self.chunks:
+			(self.work_dir / chunk.file).unlink(missing_ok=True)
+
+		logger.info(f'批量任务完成，共 {len(self.chunks)} 块 {self.rows} 行：{self.output_path}')
+		return self.output_path
+
+	def __run_rows(self, start: int, total: int,
+		progress: Optional[Callable[[int, int, int], None]]):
+		"""从start开始，在当前进程中逐行读取并按行数分块解析"""
+		while True:
+			offsets, rows = [], []
+			for offset, row in read_rows(self.input_path, start, limit=self.chunk_size):
+				offsets.append(offset)
+				rows.append(row)
+
+			if not rows:
+				break
+
+			self.__write_chunk(start, offsets[-1], rows)
+			start = offsets[-1]
+
+			if progress is not None:
+				progress(start, total, self.rows)
+
+	def __run_mapped(self, start: int, total: int,
+		progress: Optional[Callable[[int, int, int], None]]):
+		"""从start开始，由工作进程并行解析按行首对齐的字节范围，按顺序写入分块"""
+		with MappedInput(self.input_path) as mapped:
+			range_bytes = int(mapped.line_bytes(start) * self.chunk_size)
+			ranges = list(mapped.ranges(range_bytes, start))
+
+		logger.info(f'使用 {self.__processes} 个工作进程解析 {len(ranges)} 块')
+
+		for (begin, end), results in zip(ranges, parse_ranges(self.input_path, ranges,
+			self.__ruleset, self.__processes, self.__cache)):
+			self.__save_chunk(begin, end, results)
+
+			if progress is not None:
+				progress(end, total, self.rows)
+
+	def __write_chunk(self, start: int, end: int, rows: List[str]):
+		"""解析一块申请信息，原子地写入分块输出文件并更新检查点清单"""
+		results = parse_lines(rows, self.__ruleset, self.__max_workers,
+			cache=self.__cache)
+		self.__save_chunk(start, end, results)
+
+	def __save_chunk(self, start: int, end: int, results: ResultColumns):
+		"""原子地写入一块解析结果并更新检查点清单"""
+		index = len(self.chunks)
+		name = f'chunk-{index:06d}.{self.format}'
+		temp = self.work_dir / (name + '.tmp')
+
+		if self.format == 'iprec':
+			results.write_records(temp, self.__ruleset)
+		else:
+			with open(temp, 'w', encoding='utf-8', newline='') as f:
+				if self.format == 'csv':
+					results.to_csv(f)
+				else:
+					results.to_jsonl(f)
+
+		os.replace(temp, self.work_dir / name)
+
+		self.chunks.append(ChunkRecord(index, start, end, len(results), name))
+		self.__save_manifest()
+
+		logger.debug(f'已完成第 {index + 1} 块，{len(results)} 行，字节偏移 {start}-{end}')
+
+	def __combine(self):
+		"""按顺序合并分块输出文件，CSV只保留第一块的表头"""
+		temp = self.output_path.with_name(self.output_path.name + '.tmp')
+
+		if self.format == 'iprec':
+			# 二进制文件各有自己的字符串表，逐块复制记录并重新映射机构编码
+			with RecordWriter(temp, self.__ruleset) as writer:
+				for chunk in self.chunks:
+					with RecordReader(self.work_dir / chunk.file) as reader:
+						writer.copy_from(reader)
+
+			os.replace(temp, self.output_path)
+			return
+
+		with open(temp, 'wb') as output:
+			for position, chunk in enumerate(self.chunks):
+				with open(self.work_dir / chunk.file, 'rb') as f:
+					if self.format == 'csv' and position > 0:
+						f.readline()
+					shutil.copyfileobj(f, output)
+
+		os.replace(temp, self.output_path)
@@ -0,0 +1,307 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+基于内存映射的并行输入
+
+逐行读取数GB的输入文件时，Python层面的读取本身就会成为瓶颈。此模块通过 mmap 映射
+输入文件，将其切分为按行首对齐的字节范围，由多个工作进程各自解码、解析自己的范围，
+结果按范围的顺序返回：
+- 切分点总是落在换行符之后。UTF-8中换行符不会出现在多字节字符内部，
+  因此每个范围都可以独立解码
+- 跳过文件开头的UTF-8 BOM，兼容CRLF换行；空行被跳过，与 iparser.batch.jobs.read_rows 一致
+- 工作进程根据父进程解析规则的配置快照重新编译解析规则，并校验哈希值一致
+- 主进程启用了性能分析器时，工作进程按相同的抽样比例分析各自的范围，分析结果合并回主进程
+
+使用示例：
+
+from iparser.batch.mapped import parse_file
+
+
+for results in parse_file('applicants.txt', workers=4):
+	results.to_csv(...)
+"""
+import codecs
+import mmap
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from iparser.api.ruleset import Ruleset, compile_ruleset, get_ruleset, publish_ruleset
+from iparser.batch.cache import PersistentParseCache
+from iparser.batch.columnar import ResultColumns
+from iparser.batch.engine import parse_lines
+from iparser.batch.profiling import Profiler, active_profiler
+from iparser.config import Config
+
+
+# 字节范围：起始偏移和结束偏移（不含）
+ByteRange = Tuple[int, int]
+
+# 估算每行平均字节数时检查的字节数
+SAMPLE_BYTES = 1 << 20
+
+
+def decode_rows(data: bytes | memoryview) -> List[str]:
+	"""
+	将一段按行首对齐的UTF-8字节解码为申请信息
+
+	只按换行符（\\n）拆分，去掉行尾的回车符（CRLF），跳过空行。
+
+	Args:
+		data: UTF-8编码的字节
+
+	Returns:
+		List[str]: 申请信息
+	"""
+	rows = (line.rstrip('\r') for line in str(data, 'utf-8').split('\n'))
+
+	return [row for row in rows if row.strip()]
+
+
+class MappedInput:
+	"""
+	内存映射的输入文件类
+
+	Attributes:
+		path: 输入文件路径
+		size: 文件大小（字节）
+		start: 第一行的字节偏移，有UTF-8 BOM时为3，否则为0
+	"""
+	def __init__(self, path: str | Path):
+		"""
+		打开并映射输入文件
+
+		Args:
+			path: 输入文件路径
+		"""
+		self.path = Path(path)
+
+		with open(self.path, 'rb') as f:
+			self.size = f.seek(0, 2)
+			# 空文件无法映射
+			self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) \
+				if self.size else None
+
+		bom = len(codecs.BOM_UTF8)
+		self.start = bom \
+			if self.__mmap is not None and self.__mmap[:bom] == codecs.BOM_UTF8 else 0
+
+	def __enter__(self) -> 'MappedInput':
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def align(self, offset: int) -> int:
+		"""
+		将字节偏移对齐到所在行的下一行行首
+
+		Args:
+			offset: 字节偏移
+
+		Returns:
+			int: 不小于offset的第一个行首偏移，超过文件末尾时为文件大小
+		"""
+		if offset <= self.start:
+			return self.start
+		if offset >= self.size:
+			return self.size
+		if self.__mmap[offset - 1] == ord('\n'):
+			return offset
+
+		newline = self.__mmap.find(b'\n', offset)
+		return self.size if newline < 0 else newline + 1
+
+	def split(self, parts: int, start: Optional[int] = None) -> List[ByteRange]:
+		"""
+		将文件切分为大致相等、按行首对齐的字节范围
+
+		Args:
+			parts: 范围数量，某一行比范围还长时实际数量会更少
+			start: 起始字节偏移，默认为第一行
+
+		Returns:
+			List[ByteRange]: 按顺序排列、互不重叠的非空字节范围
+		"""
+		start = self.align(self.start if start is None else start)
+		step = (self.size - start) / max(1, parts)
+		bounds = [start,
+			*(self.align(start + int(step * index)) for index in range(1, parts)),
+			self.size]
+
+		return [(begin, end) for begin, end in zip(bounds, bounds[1:]) if begin < end]
+
+	def ranges(self, range_bytes: int,
+		start: Optional[int] = None) -> Iterator[ByteRange]:
+		"""
+		从起始偏移开始，依次生成大约range_bytes字节、按行首对齐的字节范围
+
+		Args:
+			range_bytes: 每个范围的目标字节数
+			start: 起始字节偏移，默认为第一行
+
+		Yields:
+			ByteRange: 非空字节范围
+		"""
+		begin = self.align(self.start if start is None else start)
+		while begin < self.size:
+			end = self.align(begin + max(1, range_bytes))
+			yield begin, end
+			begin = end
+
+	def line_bytes(self, start: Optional[int] = None) -> float:
+		"""
+		估算每行的平均字节数
+
+		Args:
+			start: 从哪个字节偏移开始抽样，默认为第一行
+
+		Returns:
+			float: 抽样范围内每行的平均字节数，文件为空时为1
+		"""
+		start = self.align(self.start if start is None else start)
+		end = self.align(start + SAMPLE_BYTES)
+		lines = self.__mmap[start:end].count(b'\n') if self.__mmap is not None else 0
+
+		return (end - start) / lines if lines else max(1, end - start)
+
+	def rows(self, start: int, end: int) -> List[str]:
+		"""
+		解码字节范围内的申请信息
+
+		Args:
+			start: 起始字节偏移，必须位于行首
+			end: 结束字节偏移（不含），必须位于行首或文件末尾
+
+		Returns:
+			List[str]: 申请信息
+		"""
+		if self.__mmap is None or start >= end:
+			return []
+
+		return decode_rows(self.__mmap[start:end])
+
+	def close(self):
+		"""关闭文件映射"""
+		if self.__mmap is not None:
+			self.__mmap.close()
+
+
+_worker_ruleset: Optional[Ruleset] = None
+_worker_cache: Optional[PersistentParseCache] = None
+_worker_profiling: Optional[Tuple[float, float]] = None
+
+
+def _init_worker(snapshot: Config, cache_path: Optional[str],
+	profiling: Optional[Tuple[float, float]] = None):
+	"""
+	工作进程初始化：根据配置快照编译并发布解析规则，打开持久化解析缓存，
+	记录主进程性能分析器的抽样比例和调用栈采样间隔
+	"""
+	global _worker_ruleset, _worker_cache, _worker_profiling
+
+	_worker_ruleset = compile_ruleset(snapshot)
+	publish_ruleset(_worker_ruleset)
+	_worker_cache = PersistentParseCache(cache_path) if cache_path else None
+	_worker_profiling = profiling
+
+def _parse_range(path: str, start: int, end: int,
+	ruleset_hash: str) -> Tuple[ResultColumns, Optional[Dict[str, Any]]]:
+	"""在工作进程中解码并解析一个字节范围，返回解析结果和导出的性能分析结果"""
+	if _worker_ruleset.hash != ruleset_hash:
+		raise RuntimeError(f'工作进程的解析规则与主进程不一致：'
+			f'{_worker_ruleset.hash} != {ruleset_hash}')
+
+	with MappedInput(path) as mapped:
+		rows = mapped.rows(start, end)
+
+	if _worker_profiling is None:
+		return parse_lines(rows, _worker_ruleset, cache=_worker_cache), None
+
+	with Profiler(*_worker_profiling) as profiler:
+		results = parse_lines(rows, _worker_ruleset, cache=_worker_cache)
+
+	return results, profiler.export()
+
+def parse_ranges(path: str | Path, ranges: Iterable[ByteRange],
+	ruleset: Optional[Ruleset] = None, workers: int = 1,
+	cache: Optional[PersistentParseCache] = None) -> Iterator[ResultColumns]:
+	"""
+	并行解码并解析输入文件中的字节范围，按范围的顺序返回解析结果
+
+	最多同时提交 workers * 2 个范围，已完成但尚未按顺序取走的结果不会无限堆积。
+	启用了性能分析器时，工作进程的分析结果在取走每个范围的解析结果时合并到该分析器。
+
+	Args:
+		path: 输入文件路径
+		ranges: 按行首对齐的字节范围
+		ruleset: 解析规则，默认使用当前发布的解析规则
+		workers: 工作进程数量，为1时在当前进程中解析
+		cache: 持久化解析缓存，工作进程按相同的路径各自打开
+
+	Yields:
+		ResultColumns: 每个字节范围的解析结果
+	"""
+	ruleset = ruleset or get_ruleset()
+
+	if workers <= 1:
+		with MappedInput(path) as mapped:
+			for start, end in ranges:
+				yield parse_lines(mapped.rows(start, end), ruleset, cache=cache)
+		return
+
+	cache_path = str(cache.path) if cache is not None else None
+	profiler = active_profiler()
+	profiling = (profiler.sample_rate, profiler.interval) \
+		if profiler is not None else None
+	pending: Deque[Future] = deque()
+	ranges = iter(ranges)
+
+	with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+		initargs=(ruleset.config, cache_path, profiling)) as executor:
+		try:
+			while True:
+				while len(pending) < workers * 2:
+					byte_range = next(ranges, None)
+					if byte_range is None:
+						break
+					pending.append(executor.submit(_parse_range, str(path), *byte_range,
+						ruleset.hash))
+
+				if not pending:
+					break
+
+				results, exported = pending.popleft().result()
+				if exported is not None:
+					profiler.merge(exported)
+				yield results
+		finally:
+			for future in pending:
+				future.cancel()
+
+def parse_file(path: str | Path, ruleset: Optional[Ruleset] = None, workers: int = 1,
+	range_bytes: Optional[int] = None,
+	cache: Optional[PersistentParseCache] = None) -> Iterator[ResultColumns]:
+	"""
+	并行解析整个输入文件，按文件中的顺序返回解析结果
+
+	Args:
+		path: 输入文件路径，UTF-8编码（可以带BOM），每行一条申请信息
+		ruleset: 解析规则，默认使用当前发布的解析规则
+		workers: 工作进程数量，为1时在当前进程中解析
+		range_bytes: 每个字节范围的目标字节数，默认将文件切分为 workers * 4 份
+		cache: 持久化解析缓存
+
+	Yields:
+		ResultColumns: 每个字节范围的解析结果
+	"""
+	with MappedInput(path) as mapped:
+		if range_bytes is None:
+			ranges = mapped.split(max(1, workers) * 4)
+		else:
+			ranges = list(mapped.ranges(range_bytes))
+
+	yield from parse_ranges(path, ranges, ruleset, workers, cache)
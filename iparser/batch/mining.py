@@ -0,0 +1,310 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+机构简称挖掘
+
+此模块对大量解析结果做一次流式扫描，挖掘缺失的机构简称和排除关键词：
+- 机构为默认名称（未知机构）的记录通常说明缺少对应的机构简称。取连接符之前的部分，
+  或去掉末尾身份标识和2～3个字的姓名后剩下的部分，作为候选简称
+- 识别出了机构、但机构名称不以机构后缀或简称结尾的记录，通常说明某个包含机构后缀的
+  词条（例如“学院路”）被当作了机构名称的一部分，取最后一个机构后缀及其后的字作为
+  候选排除关键词
+
+候选的出现次数使用计数最小草图（Count-Min Sketch）近似统计，并只保留出现次数最多的
+若干候选（Heavy Hitters），内存占用与记录数量无关，可以单次扫描数千万条记录。
+
+使用示例：
+
+from iparser.batch.mining import ShortenedNameMiner
+
+
+miner = ShortenedNameMiner()
+for info, institution in records:
+	miner.add(info, institution)
+
+print(miner.suggestions())
+"""
+import heapq
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+from iparser.api.ruleset import Ruleset, get_ruleset
+
+
+class CountMinSketch:
+	"""
+	计数最小草图类
+
+	使用depth行、每行width个计数器近似统计元素出现的次数，估计值不会小于真实值。
+	更新时只增加当前最小的计数器（保守更新），以减小高估。
+
+	Attributes:
+		width: 每行的计数器数量
+		depth: 行数
+	"""
+	def __init__(self, width: int = 1 << 18, depth: int = 4):
+		"""
+		初始化计数最小草图
+
+		Args:
+			width: 每行的计数器数量，越大越精确
+			depth: 行数，越大高估的概率越小
+		"""
+		self.width = width
+		self.depth = depth
+		self.__rows = [array('I', bytes(4 * width)) for _ in range(depth)]
+
+	def __indexes(self, item: str) -> List[int]:
+		"""计算元素在每一行中的计数器位置（双重哈希）"""
+		value = hash(item)
+		step = (value >> 32) | 1
+
+		return [(value + row * step) % self.width for row in range(self.depth)]
+
+	def add(self, item: str) -> int:
+		"""
+		将元素的出现次数加1
+
+		Args:
+			item: 元素
+
+		Returns:
+			int: 更新后的出现次数估计值
+		"""
+		indexes = self.__indexes(item)
+		estimate = min(row[index] for row, index in zip(self.__rows, indexes)) + 1
+
+		for row, index in zip(self.__rows, indexes):
+			if row[index] < estimate:
+				row[index] = estimate
+
+		return estimate
+
+	def estimate(self, item: str) -> int:
+		"""
+		估计元素的出现次数
+
+		Args:
+			item: 元素
+
+		Returns:
+			int: 出现次数估计值
+		"""
+		return min(row[index] for row, index in zip(self.__rows, self.__indexes(item)))
+
+
+class HeavyHitters:
+	"""
+	高频元素统计类
+
+	使用计数最小草图统计出现次数，只保留估计次数最多的capacity个元素。
+
+	Attributes:
+		capacity: 最多保留的元素数量
+	"""
+	def __init__(self, capacity: int = 1000, width: int = 1 << 18, depth: int = 4):
+		"""
+		初始化高频元素统计
+
+		Args:
+			capacity: 最多保留的元素数量
+			width: 计数最小草图每行的计数器数量
+			depth: 计数最小草图的行数
+		"""
+		self.capacity = capacity
+		self.__sketch = CountMinSketch(width, depth)
+		self.__top: Dict[str, int] = {}
+		self.__heap: List[Tuple[int, str]] = []
+
+	def add(self, item: str):
+		"""
+		记录元素出现一次
+
+		Args:
+			item: 元素
+		"""
+		estimate = self.__sketch.add(item)
+
+		if item in self.__top:
+			self.__top[item] = estimate
+			heapq.heappush(self.__heap, (estimate, item))
+		elif len(self.__top) < self.capacity:
+			self.__top[item] = estimate
+			heapq.heappush(self.__heap, (estimate, item))
+		elif estimate > self.__min():
+			_, evicted = heapq.heappop(self.__heap)
+			del self.__top[evicted]
+			self.__top[item] = estimate
+			heapq.heappush(self.__heap, (estimate, item))
+
+		# 堆中过期的记录过多时重建堆
+		if len(self.__heap) > 4 * self.capacity:
+			self.__heap = [(count, key) for key, count in self.__top.items()]
+			heapq.heapify(self.__heap)
+
+	def __min(self) -> int:
+		"""获取保留的元素中的最小估计次数，同时丢弃堆顶过期的记录"""
+		while self.__heap:
+			count, item = self.__heap[0]
+			if self.__top.get(item) == count:
+				return count
+			heapq.heappop(self.__heap)
+
+		return 0
+
+	def most_common(self, count: Optional[int] = None) -> List[Tuple[str, int]]:
+		"""
+		获取估计次数最多的元素
+
+		Args:
+			count: 返回的元素数量，为None时返回所有保留的元素
+
+		Returns:
+			List[Tuple[str, int]]: 按估计次数从多到少排列的元素和估计次数
+		"""
+		items = sorted(self.__top.items(), key=lambda item: (-item[1], item[0]))
+		return items[:count] if count is not None else items
+
+
+class ShortenedNameMiner:
+	"""
+	机构简称挖掘类
+
+	Attributes:
+		records: 已扫描的记录数量
+		unresolved: 机构为默认名称的记录数量
+		suspicious: 机构名称不以机构后缀或简称结尾的记录数量
+	"""
+	def __init__(self, ruleset: Optional[Ruleset] = None, capacity: int = 1000,
+		width: int = 1 << 18, depth: int = 4, min_length: int = 2, max_length: int = 6):
+		"""
+		初始化机构简称挖掘
+
+		Args:
+			ruleset: 解析规则，默认使用当前发布的解析规则
+			capacity: 每类候选最多保留的数量
+			width: 计数最小草图每行的计数器数量
+			depth: 计数最小草图的行数
+			min_length: 候选简称的最小长度
+			max_length: 候选简称的最大长度
+		"""
+		ruleset = ruleset or get_ruleset()
+		self.records = 0
+		self.unresolved = 0
+		self.suspicious = 0
+
+		self.__default_name = ruleset.config.institution.default_name
+		self.__connectors = ruleset.connectors
+		self.__all_suffixes = tuple(sorted(ruleset.all_suffixes, key=len, reverse=True))
+		self.__excluded = ruleset.config.institution.excluded_keywords
+		self.__identity = tuple(sorted(ruleset.identity, key=len, reverse=True))
+		self.__min_length = min_length
+		self.__max_length = max_length
+		self.__shortened = HeavyHitters(capacity, width, depth)
+		self.__keywords = HeavyHitters(capacity, width, depth)
+
+	def __strip_identity(self, text: str) -> str:
+		"""去除末尾的括号和身份标识"""
+		text = text.rstrip('()（）')
+		for identity in self.__identity:
+			if text.endswith(identity):
+				return text[:-len(identity)].rstrip('()（）')
+
+		return text
+
+	def shortened_candidates(self, info: str) -> Set[str]:
+		"""
+		获取未识别出机构的申请信息中的候选简称
+
+		申请信息包含连接符时，取第一个连接符之前的部分；否则去掉末尾的身份标识，
+		再分别去掉末尾2个字和3个字（常见的姓名长度）。
+
+		Args:
+			info: 申请信息
+
+		Returns:
+			Set[str]: 候选简称
+		"""
+		text = self.__strip_identity(info.strip())
+		position = min((text.find(connector) for connector in self.__connectors
+			if connector in text), default=-1)
+
+		if position > 0:
+			heads = [text[:position]]
+		else:
+			heads = [text[:-2], text[:-3]]
+
+		return {head for head in heads
+			if self.__min_length <= len(head) <= self.__max_length
+			and not head.endswith(self.__all_suffixes)}
+
+	def keyword_candidate(self, institution: str) -> Optional[str]:
+		"""
+		获取不以机构后缀或简称结尾的机构名称中的候选排除关键词
+
+		Args:
+			institution: 机构名称
+
+		Returns:
+			Optional[str]: 最后一个机构后缀（或简称）及其后最多2个字，机构名称以机构后缀
+				或简称结尾时返回None
+		"""
+		if institution.endswith(self.__all_suffixes):
+			return None
+
+		best = None
+		for keyword in self.__all_suffixes:
+			position = institution.rfind(keyword)
+			if position >= 0 and (best is None or position > best[0]):
+				best = (position, keyword)
+
+		if best is None:
+			return None
+
+		position, keyword = best
+		candidate = institution[position:position + len(keyword) + 2]
+
+		return candidate if candidate not in self.__excluded else None
+
+	def add(self, info: str, institution: str):
+		"""
+		扫描一条解析结果
+
+		Args:
+			info: 原始申请信息
+			institution: 解析出的机构名称
+		"""
+		self.records += 1
+
+		if institution == self.__default_name:
+			self.unresolved += 1
+			for candidate in self.shortened_candidates(info):
+				self.__shortened.add(candidate)
+			return
+
+		candidate = self.keyword_candidate(institution)
+		if candidate is not None:
+			self.suspicious += 1
+			self.__keywords.add(candidate)
+
+	def suggestions(self, top: int = 50,
+		min_count: int = 2) -> Dict[str, List[Tuple[str, int]]]:
+		"""
+		获取按估计次数排列的建议
+
+		Args:
+			top: 每类建议最多返回的数量
+			min_count: 估计次数的下限
+
+		Returns:
+			Dict[str, List[Tuple[str, int]]]: shortened_names和excluded_keywords两类建议，
+				每项为候选和估计次数
+		"""
+		return {
+			'shortened_names': [(candidate, count) for candidate, count
+				in self.__shortened.most_common(top) if count >= min_count],
+			'excluded_keywords': [(candidate, count) for candidate, count
+				in self.__keywords.most_common(top) if count >= min_count],
+		}
@@ -0,0 +1,341 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+解析性能分析
+
+此模块在批量解析时对一部分记录进行性能分析，用于判断时间花在分词、关键词匹配、
+信息清理还是日志上：
+- 每个解析线程使用各自的 cProfile.Profile，结束后合并为一份 pstats 统计，
+  可以用 python -m pstats 或 snakeviz 等工具查看
+- 同时由一个采样线程定期抓取正在解析被抽样记录的线程的调用栈，输出为折叠栈文本
+  （collapsed stacks），可以直接交给 flamegraph.pl、speedscope 等火焰图工具
+
+抽样比例为1时分析每一条记录，为0.01时每100条记录分析1条，抽样是确定性的。
+Python 3.12 起同一时刻只能有一个线程启用 cProfile，此时并发线程中抽样到的记录
+只参与调用栈采样，不计入 pstats 统计（计入skipped）。
+
+多进程批量解析时，各工作进程使用相同的抽样比例各自分析，
+通过 export() 导出分析结果，由主进程的性能分析器 merge() 合并。
+
+使用示例：
+
+from iparser.batch.engine import parse_lines
+from iparser.batch.profiling import Profiler
+
+
+with Profiler(sample_rate=0.1) as profiler:
+	parse_lines(lines, max_workers=4)
+
+profiler.save('profile')    # 生成 profile.pstats 和 profile.folded
+print(profiler.summary())
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from iparser.logger import logger
+
+
+_active: Optional['Profiler'] = None
+
+
+def _forget_after_fork():
+	"""fork出的子进程中没有采样线程，继承的性能分析器不再可用"""
+	global _active
+	_active = None
+
+if hasattr(os, 'register_at_fork'):
+	os.register_at_fork(after_in_child=_forget_after_fork)
+
+
+def active_profiler() -> Optional['Profiler']:
+	"""
+	获取当前启用的性能分析器
+
+	Returns:
+		Optional[Profiler]: 当前启用的性能分析器，未启用时返回None
+	"""
+	return _active
+
+
+class Profiler:
+	"""
+	解析性能分析类
+
+	作为上下文管理器使用，退出后可以获取合并的统计数据和折叠栈。同一时刻只能启用一个。
+
+	Attributes:
+		sample_rate: 抽样比例，范围为(0, 1]
+		interval: 调用栈采样间隔，单位为秒
+		records: 经过分析器的记录数量
+		sampled: 抽样分析的记录数量
+		skipped: 抽样到但无法启用cProfile的记录数量
+	"""
+	def __init__(self, sample_rate: float = 1.0, interval: float = 0.001):
+		"""
+		初始化性能分析器
+
+		Args:
+			sample_rate: 抽样比例，范围为(0, 1]
+			interval: 调用栈采样间隔，单位为秒
+
+		Raises:
+			ValueError: 抽样比例超出范围
+		"""
+		if not 0 < sample_rate <= 1:
+			raise ValueError(f'抽样比例超出范围：{sample_rate}，应大于0且不大于1')
+
+		self.sample_rate = sample_rate
+		self.interval = interval
+		self.records = 0
+		self.sampled = 0
+		self.skipped = 0
+
+		self.__lock = threading.Lock()
+		self.__local = threading.local()
+		self.__profiles: List[cProfile.Profile] = []
+		self.__threads: Dict[int, Any] = {}
+		self.__stacks: Counter = Counter()
+		self.__merged: List[Dict] = []
+		self.__stop = threading.Event()
+		self.__sampler: Optional[threading.Thread] = None
+
+	def __enter__(self) -> 'Profiler':
+		"""启用性能分析器并开始调用栈采样"""
+		global _active
+
+		if _active is not None:
+			raise RuntimeError('已经有一个性能分析器在运行')
+
+		_active = self
+		self.__stop.clear()
+		self.__sampler = threading.Thread(target=self.__sample_stacks,
+			name='iparser-profiler', daemon=True)
+		self.__sampler.start()
+
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		"""停用性能分析器"""
+		global _active
+
+		_active = None
+		self.__stop.set()
+		self.__sampler.join()
+
+		logger.info(f'性能分析完成：共 {self.records} 条记录，抽样 {self.sampled} 条，'
+			f'跳过 {self.skipped} 条，采样调用栈 {sum(self.__stacks.values())} 个')
+
+	def __is_sampled(self, index: int) -> bool:
+		"""按抽样比例判断第index条记录是否需要分析"""
+		return int((index + 1) * self.sample_rate) > int(index * self.sample_rate)
+
+	def run(self, func: Callable, *args) -> Any:
+		"""
+		调用解析函数，抽样到的记录在当前线程的cProfile下运行
+
+		Args:
+			func: 解析函数
+			*args: 解析函数的参数
+
+		Returns:
+			Any: 解析函数的返回值
+		"""
+		with self.__lock:
+			index = self.records
+			self.records += 1
+			sampled = self.__is_sampled(index)
+			if sampled:
+				self.sampled += 1
+
+		if not sampled:
+			return func(*args)
+
+		profile = getattr(self.__local, 'profile', None)
+		if profile is None:
+			profile = self.__local.profile = cProfile.Profile()
+			with self.__lock:
+				self.__profiles.append(profile)
+
+		ident = threading.get_ident()
+		self.__threads[ident] = sys._getframe()
+
+		try:
+			profile.enable()
+		except ValueError:
+			# 其他线程正在使用cProfile（Python 3.12+），只参与调用栈采样
+			with self.__lock:
+				self.skipped += 1
+			try:
+				return func(*args)
+			finally:
+				self.__threads.pop(ident, None)
+
+		try:
+			return func(*args)
+		finally:
+			profile.disable()
+			self.__threads.pop(ident, None)
+
+	def __sample_stacks(self):
+		"""定期抓取正在解析被抽样记录的线程的调用栈"""
+		while not self.__stop.wait(self.interval):
+			threads = dict(self.__threads)
+			if not threads:
+				continue
+
+			frames = sys._current_frames()
+			for ident, anchor in threads.items():
+				frame = frames.get(ident)
+				if frame is not None:
+					stack = _collapse(frame, anchor)
+					if stack:
+						self.__stacks[stack] += 1
+
+	def export(self) -> Dict[str, Any]:
+		"""
+		导出可以跨进程传递的分析结果
+
+		Returns:
+			Dict[str, Any]: 记录数量、抽样数量、跳过数量、pstats统计数据（没有时为None）和折叠栈
+		"""
+		stats = self.stats()
+
+		return {
+			'records': self.records,
+			'sampled': self.sampled,
+			'skipped': self.skipped,
+			'stats': stats.stats if stats is not None else None,
+			'stacks': dict(self.__stacks),
+		}
+
+	def merge(self, exported: Dict[str, Any]):
+		"""
+		合并其他性能分析器（通常在工作进程中）导出的分析结果
+
+		Args:
+			exported: export() 的返回值
+		"""
+		with self.__lock:
+			self.records += exported['records']
+			self.sampled += exported['sampled']
+			self.skipped += exported['skipped']
+			self.__stacks.update(exported['stacks'])
+			if exported['stats']:
+				self.__merged.append(exported['stats'])
+
+	def stats(self) -> Optional[pstats.Stats]:
+		"""
+		合并各线程以及合并进来的统计数据
+
+		Returns:
+			Optional[pstats.Stats]: 合并后的统计数据，没有抽样到任何记录时返回None
+		"""
+		merged = None
+		sources = [*self.__profiles,
+			*(_StatsSnapshot(stats) for stats in self.__merged)]
+		for profile in sources:
+			profile.create_stats()
+			if not profile.stats:
+				continue
+
+			if merged is None:
+				merged = pstats.Stats(profile)
+			else:
+				merged.add(profile)
+
+		return merged
+
+	def collapsed_stacks(self) -> List[Tuple[str, int]]:
+		"""
+		获取折叠栈
+
+		Returns:
+			List[Tuple[str, int]]: 按采样次数从多到少排列的调用栈（从外到内以分号分隔）
+				和采样次数
+		"""
+		return self.__stacks.most_common()
+
+	def summary(self, limit: int = 20, sort: str = 'cumulative') -> str:
+		"""
+		获取统计数据摘要
+
+		Args:
+			limit: 输出的函数数量
+			sort: 排序方式，参见 pstats.Stats.sort_stats
+
+		Returns:
+			str: 统计数据摘要
+		"""
+		stats = self.stats()
+		if stats is None:
+			return '没有抽样到任何记录'
+
+		output = io.StringIO()
+		stats.stream = output
+		stats.sort_stats(sort).print_stats(limit)
+
+		return output.getvalue()
+
+	def save(self, prefix: str | Path) -> Tuple[Optional[Path], Path]:
+		"""
+		保存pstats统计数据和折叠栈
+
+		Args:
+			prefix: 输出文件路径前缀，分别保存为 <prefix>.pstats 和 <prefix>.folded
+
+		Returns:
+			Tuple[Optional[Path], Path]: pstats文件路径（没有统计数据时为None）和折叠栈文件路径
+		"""
+		prefix = Path(prefix)
+		prefix.parent.mkdir(parents=True, exist_ok=True)
+
+		stats_path = prefix.with_name(prefix.name + '.pstats')
+		stats = self.stats()
+		if stats is not None:
+			stats.dump_stats(stats_path)
+		else:
+			stats_path = None
+
+		folded_path = prefix.with_name(prefix.name + '.folded')
+		with open(folded_path, 'w', encoding='utf-8') as f:
+			for stack, count in self.collapsed_stacks():
+				f.write(f'{stack} {count}\n')
+
+		logger.info(f'已保存性能分析结果：{stats_path}，{folded_path}')
+		return stats_path, folded_path
+
+
+class _StatsSnapshot:
+	"""导出的统计数据，提供 pstats.Stats 加载统计数据所需的 create_stats() 接口"""
+	def __init__(self, stats: Dict):
+		self.__data = stats
+		self.stats: Dict = {}
+
+	def create_stats(self):
+		# pstats.Stats 加载后会清空并修改统计数据，每次加载使用副本
+		self.stats = dict(self.__data)
+
+
+def _collapse(frame, anchor) -> str:
+	"""将anchor之内的调用栈折叠为从外到内以分号分隔的字符串"""
+	names = []
+	while frame is not None and frame is not anchor:
+		code = frame.f_code
+		names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:'
+			f'{code.co_firstlineno})'.replace(';', ':'))
+		frame = frame.f_back
+
+	# 采样时该线程已经离开了被分析的记录
+	if frame is None:
+		return ''
+
+	return ';'.join(reversed(names))
@@ -0,0 +1,573 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+二进制解析结果文件
+
+此模块定义在批量解析的各个阶段之间传递解析结果的紧凑二进制格式（.iprec），
+避免JSONL为每条记录重复编码和解码中文文本与字段名：
+
+	文件头    magic(4) 版本(u16) 保留(u16) 记录数(u64) 字符串表偏移(u64)
+	记录      长度(u32) 机构编码(u32) 姓名长度(u32) 教师标识(u8) 姓名 原始信息
+	字符串表  机构数量(u32) [长度(u32) 机构名称]... 元数据长度(u32) 元数据(JSON)
+
+所有整数为小端序，文本为UTF-8编码。机构名称去重后保存在文件末尾的字符串表中，
+记录中只保存编码；每条记录以自身的总长度开头，读取时可以直接跳过。
+元数据中保存写入时的输出格式，读取时据此生成格式化后的申请人信息。
+
+RecordReader 通过 mmap 读取文件，遍历时不复制记录，字段只在访问时解码。
+
+使用示例：
+
+from iparser.batch.records import RecordReader, RecordWriter
+
+
+with RecordWriter('results.iprec') as writer:
+	writer.write('河南科技职业大学杨怡宁', '河南科技职业大学', '杨怡宁', False)
+
+with RecordReader('results.iprec') as reader:
+	for record in reader:
+		print(record.institution, record.name)
+"""
+import csv
+import json
+import mmap
+import struct
+from array import array
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional
+
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.batch.columnar import FIELDS, ParseResult, _open_target
+from iparser.logger import logger
+
+
+MAGIC = b'IPRC'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHQQ')
+RECORD = struct.Struct('<IIIB')
+LENGTH = struct.Struct('<I')
+
+
+class RecordFormatError(ValueError):
+	"""二进制解析结果文件格式错误"""
+
+
+class RecordWriter:
+	"""
+	二进制解析结果文件写入类
+
+	作为上下文管理器使用，关闭时写入字符串表并回填文件头。写入的文件必须可以定位（seek）。
+
+	Attributes:
+		path: 文件路径
+		count: 已写入的记录数量
+	"""
+	def __init__(self, path: str | Path, ruleset: Optional[Ruleset] = None):
+		"""
+		初始化写入器并写入占位的文件头
+
+		Args:
+			path: 文件路径
+			ruleset: 提供输出格式的解析规则，默认使用当前发布的解析规则
+		"""
+		formatting = (ruleset or get_ruleset()).config.formatting
+
+		self.path = Path(path)
+		self.count = 0
+
+		self.__meta = {
+			'output_pattern_teacher': formatting.output_pattern_teacher,
+			'output_pattern_student': formatting.output_pattern_student,
+		}
+		self.__institutions: List[str] = []
+		self.__institution_index: Dict[str, int] = {}
+		self.__file = open(self.path, 'wb')
+		self.__file.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+
+	def __enter__(self) -> 'RecordWriter':
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def __code(self, institution: str) -> int:
+		"""获取机构名称的编码，新的机构名称追加到字符串表"""
+		code = self.__institution_index.get(institution)
+		if code is None:
+			code = len(self.__institutions)
+			self.__institutions.append(institution)
+			self.__institution_index[institution] = code
+
+		return code
+
+	def __write_record(self, code: int, name: bytes | memoryview, is_teacher: bool,
+		info: bytes | memoryview):
+		"""写入一条已编码的记录"""
+		size = RECORD.size + len(name) + len(info)
+		self.__file.write(RECORD.pack(size, code, len(name), 1 if is_teacher else 0))
+		self.__file.write(name)
+		self.__file.write(info)
+		self.count += 1
+
+	def write(self, info: str, institution: str, name: str, is_teacher: bool):
+		"""
+		写入一条解析结果
+
+		Args:
+			info: 原始申请信息
+			institution: 机构名称
+			name: 姓名
+			is_teacher: 是否为教师
+		"""
+		self.__write_record(self.__code(institution), name.encode('utf-8'), is_teacher,
+			info.encode('utf-8'))
+
+	def write_raw(self, info: bytes | memoryview, institution: str,
+		name: bytes | memoryview, is_teacher: bool):
+		"""
+		写入一条原始信息和姓名已经编码为UTF-8的解析结果
+
+		Args:
+			info: 原始申请信息的UTF-8编码
+			institution: 机构名称
+			name: 姓名的UTF-8编码
+			is_teacher: 是否为教师
+		"""
+		self.__write_record(self.__code(institution), name, is_teacher, info)
+
+	def extend(self, results: Iterable[ParseResult]):
+		"""
+		写入多条解析结果
+
+		Args:
+			results: 解析结果，也可以是列式解析结果容器或RecordReader
+		"""
+		if isinstance(results, RecordReader):
+			self.copy_from(results)
+			return
+
+		for result in results:
+			self.write(result.info, result.institution, result.name, result.is_teacher)
+
+	def copy_from(self, reader: 'RecordReader'):
+		"""
+		复制另一个文件中的所有记录，只重新映射机构编码，不解码原始信息和姓名
+
+		Args:
+			reader: 已打开的读取器
+		"""
+		codes = [self.__code(institution) for institution in reader.institutions]
+
+		for record in reader:
+			self.__write_record(codes[record.institution_code], record.raw_name,
+				record.is_teacher, record.raw_info)
+
+	def close(self):
+		"""写入字符串表和元数据，回填文件头并关闭文件"""
+		if self.__file.closed:
+			return
+
+		try:
+			table_offset = self.__file.tell()
+			self.__file.write(LENGTH.pack(len(self.__institutions)))
+			for institution in self.__institutions:
+				data = institution.encode('utf-8')
+				self.__file.write(LENGTH.pack(len(data)))
+				self.__file.write(data)
+
+			meta = json.dumps(self.__meta, ensure_ascii=False).encode('utf-8')
+			self.__file.write(LENGTH.pack(len(meta)))
+			self.__file.write(meta)
+
+			self.__file.seek(0)
+			self.__file.write(HEADER.pack(MAGIC, VERSION, 0, self.count, table_offset))
+		finally:
+			self.__file.close()
+
+
+class Record:
+	"""
+	二进制解析结果文件中的一条记录
+
+	只保存记录在文件中的偏移量，字段在访问时才从文件中解码。
+	读取器关闭后不能再访问。
+	"""
+	__slots__ = ('__reader', '__offset')
+
+	def __init__(self, reader: 'RecordReader', offset: int):
+		"""
+		初始化记录
+
+		Args:
+			reader: 所属的读取器
+			offset: 记录在文件中的字节偏移
+		"""
+		self.__reader = reader
+		self.__offset = offset
+
+	def __repr__(self):
+		return f'Record({self.info!r}, {self.institution!r}, {self.name!r}, ' \
+			f'{self.is_teacher})'
+
+	def __header(self) -> tuple:
+		"""读取记录头：长度、机构编码、姓名长度、教师标识"""
+		return RECORD.unpack_from(self.__reader.buffer, self.__offset)
+
+	@property
+	def raw_name(self) -> memoryview:
+		"""获取姓名的UTF-8编码（不复制）"""
+		_, _, name_size, _ = self.__header()
+		start = self.__offset + RECORD.size
+
+		return self.__reader.buffer[start:start + name_size]
+
+	@property
+	def raw_info(self) -> memoryview:
+		"""获取原始申请信息的UTF-8编码（不复制）"""
+		size, _, name_size, _ = self.__header()
+		start = self.__offset + RECORD.size + name_size
+
+		return self.__reader.buffer[start:self.__offset + size]
+
+	@property
+	def institution_code(self) -> int:
+		"""获取机构编码，即机构名称在字符串表中的序号"""
+		return self.__header()[1]
+
+	@property
+	def is_teacher(self) -> bool:
+		"""是否为教师"""
+		return bool(self.__header()[3])
+
+	@property
+	def info(self) -> str:
+		"""原始申请信息"""
+		return str(self.raw_info, 'utf-8')
+
+	@property
+	def name(self) -> str:
+		"""姓名"""
+		return str(self.raw_name, 'utf-8')
+
+	@property
+	def institution(self) -> str:
+		"""机构名称"""
+		return self.__reader.institutions[self.institution_code]
+
+	@property
+	def full_info(self) -> str:
+		"""按写入时的输出格式格式化后的申请人信息"""
+		return self.__reader.format(self.institution, self.name, self.is_teacher)
+
+	def to_result(self) -> ParseResult:
+		"""
+		解码所有字段
+
+		Returns:
+			ParseResult: 解析结果
+		"""
+		reader, offset = self.__reader, self.__offset
+		size, code, name_size, is_teacher = RECORD.unpack_from(reader.buffer, offset)
+		start = offset + RECORD.size
+
+		institution = reader.institutions[code]
+		name = str(reader.buffer[start:start + name_size], 'utf-8')
+		info = str(reader.buffer[start + name_size:offset + size], 'utf-8')
+		is_teacher = bool(is_teacher)
+
+		return ParseResult(info, institution, name, is_teacher,
+			reader.format(institution, name, is_teacher))
+
+
+class RecordReader:
+	"""
+	二进制解析结果文件读取类
+
+	通过 mmap 映射整个文件，打开时只解码字符串表。支持按顺序迭代、按下标访问
+	（第一次按下标访问时扫描一遍记录长度建立偏移表）和导出为CSV或JSONL。
+
+	Attributes:
+		path: 文件路径
+		institutions: 去重后的机构名称表
+		meta: 写入时保存的元数据
+	"""
+	def __init__(self, path: str | Path):
+		"""
+		打开并映射文件
+
+		Args:
+			path: 文件路径
+
+		Raises:
+			RecordFormatError: 文件不是二进制解析结果文件，或者文件已损坏
+		"""
+		self.path = Path(path)
+
+		with open(self.path, 'rb') as f:
+			size = f.seek(0, 2)
+			if size < HEADER.size:
+				raise RecordFormatError(f'不是二进制解析结果文件：{self.path}')
+			self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+		self.__buffer = memoryview(self.__mmap)
+		self.__offsets: Optional[array] = None
+
+		try:
+			magic, version, _, self.__count, self.__table_offset = \
+				HEADER.unpack_from(self.__buffer)
+			if magic != MAGIC:
+				raise RecordFormatError(f'不是二进制解析结果文件：{self.path}')
+			if version != VERSION:
+				raise RecordFormatError(f'不支持的二进制解析结果文件版本：{version}')
+			if not HEADER.size <= self.__table_offset <= size:
+				raise RecordFormatError(f'二进制解析结果文件不完整：{self.path}')
+
+			self.institutions, self.meta = self.__read_table()
+		except (RecordFormatError, struct.error, UnicodeDecodeError, ValueError) as e:
+			self.close()
+			if isinstance(e, RecordFormatError):
+				raise
+			raise RecordFormatError(f'二进制解析结果文件已损坏：{self.path}') from e
+
+		self.output_pattern_teacher: str = self.meta['output_pattern_teacher']
+		self.output_pattern_student: str = self.meta['output_pattern_student']
+
+	def __enter__(self) -> 'RecordReader':
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def __len__(self):
+		"""返回记录数量"""
+		return self.__count
+
+	def __iter__(self) -> Iterator[Record]:
+		"""按顺序迭代记录"""
+		for offset in self.__scan():
+			yield Record(self, offset)
+
+	def __getitem__(self, index: int) -> Record:
+		"""
+		按下标获取记录
+
+		Args:
+			index: 记录下标
+		"""
+		if index < 0:
+			index += self.__count
+		if not 0 <= index < self.__count:
+			raise IndexError('记录下标超出范围')
+
+		if self.__offsets is None:
+			self.__offsets = array('Q', self.__scan())
+
+		return Record(self, self.__offsets[index])
+
+	def __scan(self) -> Iterator[int]:
+		"""按记录长度依次跳过记录，生成每条记录的偏移量"""
+		offset = HEADER.size
+		for _ in range(self.__count):
+			yield offset
+			offset += LENGTH.unpack_from(self.__buffer, offset)[0]
+
+	def __read_table(self) -> tuple:
+		"""解码文件末尾的字符串表和元数据"""
+		offset = self.__table_offset
+		count, = LENGTH.unpack_from(self.__buffer, offset)
+		offset += LENGTH.size
+
+		institutions = []
+		for _ in range(count):
+			size, = LENGTH.unpack_from(self.__buffer, offset)
+			offset += LENGTH.size
+			institutions.append(str(self.__buffer[offset:offset + size], 'utf-8'))
+			offset += size
+
+		size, = LENGTH.unpack_from(self.__buffer, offset)
+		offset += LENGTH.size
+		meta = json.loads(str(self.__buffer[offset:offset + size], 'utf-8'))
+
+		return institutions, meta
+
+	@property
+	def buffer(self) -> memoryview:
+		"""获取映射整个文件的内存视图"""
+		return self.__buffer
+
+	def format(self, institution: str, name: str, is_teacher: bool) -> str:
+		"""
+		按写入时的输出格式格式化申请人信息
+
+		Args:
+			institution: 机构名称
+			name: 姓名
+			is_teacher: 是否为教师
+		"""
+		output_pattern = self.output_pattern_teacher \
+			if is_teacher else self.output_pattern_student
+
+		return output_pattern.format(institution=institution, name=name)
+
+	def results(self) -> Iterator[ParseResult]:
+		"""按顺序迭代解码后的解析结果"""
+		for record in self:
+			yield record.to_result()
+
+	def to_csv(self, target: str | Path | IO[str]):
+		"""
+		导出为CSV文件，字段与 ResultColumns.to_csv 相同
+
+		Args:
+			target: 文件路径或已打开的文本文件对象
+		"""
+		write_csv(self.results(), target)
+
+	def to_jsonl(self, target: str | Path | IO[str]):
+		"""
+		导出为JSONL文件，字段与 ResultColumns.to_jsonl 相同
+
+		Args:
+			target: 文件路径或已打开的文本文件对象
+		"""
+		write_jsonl(self.results(), target)
+
+	def close(self):
+		"""
+		关闭文件映射，之后不能再访问记录
+
+		raw_info、raw_name 返回的内存视图直接引用文件映射，应当在关闭之前释放（或者复制为bytes）。
+		仍有未释放的内存视图时无法立即关闭，文件映射在这些视图被回收后由垃圾回收关闭，
+		不会抛出异常，也不会掩盖 with 语句中已经抛出的异常。
+		"""
+		self.__buffer.release()
+		try:
+			self.__mmap.close()
+		except BufferError:
+			logger.warning(f'仍有未释放的内存视图，二进制解析结果文件将在视图回收后关闭：{self.path}')
+
+
+def write_csv(results: Iterable[ParseResult], target: str | Path | IO[str]):
+	"""
+	流式写入CSV格式的解析结果
+
+	Args:
+		results: 解析结果
+		target: 文件路径或已打开的文本文件对象
+	"""
+	with _open_target(target) as f:
+		writer = csv.writer(f)
+		writer.writerow(FIELDS)
+		for result in results:
+			writer.writerow((result.info, result.institution, result.name,
+				int(result.is_teacher), result.full_info))
+
+def write_jsonl(results: Iterable[ParseResult], target: str | Path | IO[str]):
+	"""
+	流式写入JSONL格式的解析结果
+
+	Args:
+		results: 解析结果
+		target: 文件路径或已打开的文本文件对象
+	"""
+	with _open_target(target) as f:
+		for result in results:
+			f.write(json.dumps(result._asdict(), ensure_ascii=False))
+			f.write('\n')
+
+def read_results(path: str | Path) -> Iterator[ParseResult]:
+	"""
+	流式读取批量任务输出的解析结果，格式由扩展名决定
+
+	Args:
+		path: CSV、JSONL或二进制解析结果文件（.iprec）路径，文本格式至少包含info和
+			institution字段
+
+	Yields:
+		ParseResult: 解析结果，文本格式中缺失的name、full_info字段为空字符串，
+			is_teacher字段为False
+	"""
+	if Path(path).suffix.lower() == '.iprec':
+		with RecordReader(path) as reader:
+			yield from reader.results()
+		return
+
+	def result(record: Dict) -> ParseResult:
+		is_teacher = record.get('is_teacher') or False
+		if isinstance(is_teacher, str):
+			is_teacher = is_teacher.strip().lower() in ('1', 'true')
+
+		return ParseResult(record['info'], record['institution'],
+			record.get('name') or '', bool(is_teacher), record.get('full_info') or '')
+
+	with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+		if Path(path).suffix.lower() == '.jsonl':
+			for line in f:
+				if line.strip():
+					yield result(json.loads(line))
+		else:
+			for record in csv.DictReader(f):
+				yield result(record)
+
+def convert(source: str | Path, target: str | Path,
+	ruleset: Optional[Ruleset] = None) -> int:
+	"""
+	在二进制、CSV和JSONL格式之间转换解析结果，格式由扩展名决定
+
+	二进制文件之间的转换直接复制记录；从CSV或JSONL转换时，full_info按目标的输出格式重新生成
+	（写入二进制文件时）或保持原样（写入CSV或JSONL时）。
+
+	Args:
+		source: 源文件路径，扩展名为.iprec、.csv或.jsonl
+		target: 目标文件路径，扩展名为.iprec、.csv或.jsonl
+		ruleset: 写入二进制文件时提供输出格式的解析规则，默认使用当前发布的解析规则
+
+	Returns:
+		int: 转换的记录数量
+
+	Raises:
+		ValueError: 不支持的文件格式
+	"""
+	source, target = Path(source), Path(target)
+	formats = ('.iprec', '.csv', '.jsonl')
+	for path in (source, target):
+		if path.suffix.lower() not in formats:
+			raise ValueError(f'不支持的文件格式：{path.suffix}，仅支持 {", ".join(formats)}')
+
+	temp = target.with_name(target.name + '.tmp')
+
+	try:
+		if source.suffix.lower() == '.iprec':
+			with RecordReader(source) as reader:
+				count = len(reader)
+				if target.suffix.lower() == '.iprec':
+					with RecordWriter(temp, ruleset) as writer:
+						writer.copy_from(reader)
+				elif target.suffix.lower() == '.csv':
+					reader.to_csv(temp)
+				else:
+					reader.to_jsonl(temp)
+		elif target.suffix.lower() == '.iprec':
+			with RecordWriter(temp, ruleset) as writer:
+				writer.extend(read_results(source))
+				count = writer.count
+		else:
+			count = 0
+
+			def counted(results: Iterable[ParseResult]) -> Iterator[ParseResult]:
+				nonlocal count
+				for result in results:
+					count += 1
+					yield result
+
+			write = write_csv if target.suffix.lower() == '.csv' else write_jsonl
+			write(counted(read_results(source)), temp)
+	except BaseException:
+		temp.unlink(missing_ok=True)
+		raise
+
+	temp.replace(target)
+	return count
@@ -0,0 +1,400 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+增量重新解析
+
+此模块为已解析的历史语料建立倒排索引（单字和二元字组到记录编号），并保存解析时
+使用的关键词。修改解析规则（例如在 custom_config.json 中添加了机构简称或排除关键词）
+后，只重新解析包含新增或删除关键词的记录，并输出机构、姓名或身份发生变化的记录。
+
+关键词只影响包含它的申请信息：分词词典中新增或删除的词条、机构后缀、简称和身份
+关键词都只在申请信息包含该关键词时才起作用。关键词以外的解析规则（例如格式、
+分词模式）发生变化时，所有记录都需要重新解析。词典总词频随词条增减产生的细微变化
+忽略不计，需要与完整重新解析严格一致时可以使用 full=True。
+
+使用示例：
+
+from iparser.api.ruleset import get_ruleset
+from iparser.batch.reindex import CorpusIndex
+
+
+index = CorpusIndex.build(lines)
+index.save('corpus.index.json')
+
+# 修改解析规则后
+index = CorpusIndex.load('corpus.index.json')
+report = index.reparse(get_ruleset())
+report.to_csv('changes.csv')
+index.save('corpus.index.json')
+"""
+import base64
+import csv
+import json
+import os
+from array import array
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.batch.cache import normalize_info
+from iparser.batch.columnar import _open_target
+from iparser.batch.engine import Parsed, parse_unique
+from iparser.config import Config
+from iparser.logger import logger
+
+
+INDEX_VERSION = 1
+
+# 关键词集合的名称，变化时只需重新解析包含变化关键词的记录
+KEYWORD_SETS = ('suffixes', 'shortened_names', 'excluded_keywords', 'words', 'teacher',
+	'student')
+
+
+def grams(text: str) -> Set[str]:
+	"""
+	获取文本中的单字和二元字组
+
+	Args:
+		text: 文本
+
+	Returns:
+		Set[str]: 单字和二元字组
+	"""
+	return set(text) | {text[index:index + 2] for index in range(len(text) - 1)}
+
+def rule_snapshot(config: Config) -> Dict:
+	"""
+	获取解析规则中的关键词集合，以及其余解析规则的哈希值
+
+	Args:
+		config: 解析规则对应的配置
+
+	Returns:
+		Dict: 各关键词集合（排序后的列表）和其余解析规则的哈希值
+	"""
+	institution = config.institution
+	segmentation = config.segmentation
+	others = config.model_copy(update={
+		'identity': config.identity.model_copy(
+			update={'teacher': set(), 'student': set()}),
+		'institution': institution.model_copy(update={
+			'suffixes': set(), 'shortened_names': set(), 'excluded_keywords': set()}),
+		'segmentation': segmentation.model_copy(update={'words': {}}),
+	})
+
+	return {
+		'suffixes': sorted(institution.suffixes),
+		'shortened_names': sorted(institution.shortened_names),
+		'excluded_keywords': sorted(institution.excluded_keywords),
+		'words': sorted(f'{word}\t{freq}' for word, freq in segmentation.words.items()),
+		'teacher': sorted(config.identity.teacher),
+		'student': sorted(config.identity.student),
+		'others': others.ruleset_hash,
+	}
+
+def changed_keywords(old: Dict, new: Dict) -> Optional[Set[str]]:
+	"""
+	比较两个解析规则快照，获取新增或删除的关键词
+
+	Args:
+		old: 原来的解析规则快照
+		new: 新的解析规则快照
+
+	Returns:
+		Optional[Set[str]]: 新增或删除的关键词，关键词以外的解析规则发生变化时返回None
+	"""
+	if old['others'] != new['others']:
+		return None
+
+	keywords = set()
+	for name in KEYWORD_SETS:
+		for item in set(old[name]) ^ set(new[name]):
+			keywords.add(item.split('\t')[0])
+
+	return keywords
+
+
+class RecordChange(NamedTuple):
+	"""解析结果发生变化的记录"""
+	id: int        # 记录编号
+	info: str      # 原始申请信息
+	old: Parsed    # 原来的机构名称、姓名、是否为教师
+	new: Parsed    # 新的机构名称、姓名、是否为教师
+
+
+class ReindexReport:
+	"""
+	增量重新解析报告
+
+	Attributes:
+		keywords: 新增或删除的关键词，为None表示关键词以外的解析规则发生了变化
+		total: 记录总数
+		reparsed: 重新解析的记录数
+		changes: 解析结果发生变化的记录
+	"""
+	FIELDS = ('id', 'info', 'old_institution', 'new_institution', 'old_name',
+		'new_name', 'old_is_teacher', 'new_is_teacher')
+
+	def __init__(self, keywords: Optional[Set[str]], total: int, reparsed: int,
+		changes: List[RecordChange]):
+		"""
+		初始化增量重新解析报告
+
+		Args:
+			keywords: 新增或删除的关键词
+			total: 记录总数
+			reparsed: 重新解析的记录数
+			changes: 解析结果发生变化的记录
+		"""
+		self.keywords = keywords
+		self.total = total
+		self.reparsed = reparsed
+		self.changes = changes
+
+	def __str__(self):
+		"""返回报告摘要"""
+		keywords = '、'.join(sorted(self.keywords)) if self.keywords is not None \
+			else '（关键词以外的解析规则已变化）'
+		return f'变化的关键词：{keywords or "无"}，共 {self.total} 条记录，' \
+			f'重新解析 {self.reparsed} 条，解析结果变化 {len(self.changes)} 条'
+
+	def rows(self) -> Iterable[Tuple]:
+		"""按报告字段顺序迭代变化的记录"""
+		for change in self.changes:
+			yield (change.id, change.info, change.old[0], change.new[0], change.old[1],
+				change.new[1], int(change.old[2]), int(change.new[2]))
+
+	def to_csv(self, target: str | Path | IO[str]):
+		"""
+		导出为CSV文件
+
+		Args:
+			target: 文件路径或已打开的文本文件对象
+		"""
+		with _open_target(target) as f:
+			writer = csv.writer(f)
+			writer.writerow(self.FIELDS)
+			writer.writerows(self.rows())
+
+	def to_jsonl(self, target: str | Path | IO[str]):
+		"""
+		导出为JSONL文件，每行一条变化的记录
+
+		Args:
+			target: 文件路径或已打开的文本文件对象
+		"""
+		with _open_target(target) as f:
+			for row in self.rows():
+				f.write(json.dumps(dict(zip(self.FIELDS, row)), ensure_ascii=False))
+				f.write('\n')
+
+
+class CorpusIndex:
+	"""
+	已解析语料的倒排索引类
+
+	保存每条记录的原始申请信息和解析结果，以及从单字和二元字组到记录编号的倒排索引。
+	查找包含某个关键词的记录时，取关键词中各个二元字组的记录编号的交集，
+	再检查申请信息是否确实包含该关键词。
+
+	Attributes:
+		ruleset_hash: 解析记录时使用的解析规则的哈希值
+		rules: 解析记录时使用的解析规则快照
+	"""
+	def __init__(self, ruleset_hash: str, rules: Dict):
+		"""
+		初始化空的倒排索引
+
+		Args:
+			ruleset_hash: 解析规则的哈希值
+			rules: 解析规则快照
+		"""
+		self.ruleset_hash = ruleset_hash
+		self.rules = rules
+
+		self.__infos: List[str] = []
+		self.__results: List[Parsed] = []
+		self.__postings: Dict[str, array] = {}
+
+	def __len__(self):
+		"""返回记录数量"""
+		return len(self.__infos)
+
+	def __getitem__(self, record_id: int) -> Tuple[str, Parsed]:
+		"""获取记录的原始申请信息和解析结果"""
+		return self.__infos[record_id], self.__results[record_id]
+
+	@classmethod
+	def build(cls, lines: Iterable[str], ruleset: Optional[Ruleset] = None,
+		max_workers: int = 1) -> 'CorpusIndex':
+		"""
+		解析语料并建立倒排索引
+
+		Args:
+			lines: 申请信息，每项一条，编号从0开始
+			ruleset: 解析规则，默认使用当前发布的解析规则
+			max_workers: 并发解析的线程数
+
+		Returns:
+			CorpusIndex: 倒排索引
+		"""
+		ruleset = ruleset or get_ruleset()
+		lines = list(lines)
+		parsed = parse_unique(lines, ruleset, max_workers)
+
+		index = cls(ruleset.hash, rule_snapshot(ruleset.config))
+		for line in lines:
+			index.add(line, parsed[line])
+
+		logger.info(f'已建立倒排索引：{len(index)} 条记录，{len(index.__postings)} 个字组')
+		return index
+
+	def add(self, info: str, result: Parsed) -> int:
+		"""
+		添加一条已解析的记录
+
+		Args:
+			info: 原始申请信息
+			result: 机构名称、姓名、是否为教师
+
+		Returns:
+			int: 记录编号
+		"""
+		record_id = len(self.__infos)
+		self.__infos.append(info)
+		self.__results.append(tuple(result))
+
+		for gram in grams(normalize_info(info)):
+			posting = self.__postings.get(gram)
+			if posting is None:
+				posting = self.__postings[gram] = array('I')
+			posting.append(record_id)
+
+		return record_id
+
+	def lookup(self, keyword: str) -> Set[int]:
+		"""
+		查找包含关键词的记录
+
+		Args:
+			keyword: 关键词
+
+		Returns:
+			Set[int]: 记录编号
+		"""
+		if not keyword:
+			return set(range(len(self)))
+
+		keys = [keyword] if len(keyword) == 1 else \
+			[keyword[index:index + 2] for index in range(len(keyword) - 1)]
+		postings = sorted((self.__postings.get(key, ()) for key in keys), key=len)
+
+		candidates = set(postings[0])
+		for posting in postings[1:]:
+			if not candidates:
+				break
+			candidates.intersection_update(posting)
+
+		return {record_id for record_id in candidates
+			if keyword in self.__infos[record_id]}
+
+	def reparse(self, ruleset: Optional[Ruleset] = None, max_workers: int = 1,
+		full: bool = False) -> ReindexReport:
+		"""
+		使用新的解析规则重新解析受影响的记录，并更新索引中保存的解析结果
+
+		Args:
+			ruleset: 新的解析规则，默认使用当前发布的解析规则
+			max_workers: 并发解析的线程数
+			full: 是否重新解析所有记录
+
+		Returns:
+			ReindexReport: 增量重新解析报告
+		"""
+		ruleset = ruleset or get_ruleset()
+		rules = rule_snapshot(ruleset.config)
+		keywords = None if full else changed_keywords(self.rules, rules)
+
+		if keywords is None:
+			record_ids = range(len(self))
+		else:
+			record_ids = set()
+			for keyword in keywords:
+				record_ids |= self.lookup(keyword)
+			record_ids = sorted(record_ids)
+
+		parsed = parse_unique((self.__infos[record_id] for record_id in record_ids),
+			ruleset, max_workers)
+
+		changes = []
+		for record_id in record_ids:
+			info = self.__infos[record_id]
+			old, new = self.__results[record_id], parsed[info]
+			if old != new:
+				changes.append(RecordChange(record_id, info, old, new))
+				self.__results[record_id] = new
+
+		self.ruleset_hash = ruleset.hash
+		self.rules = rules
+
+		report = ReindexReport(keywords, len(self), len(record_ids), changes)
+		logger.info(f'增量重新解析完成：{report}')
+
+		return report
+
+	def save(self, path: str | Path):
+		"""
+		保存倒排索引到文件（原子写入）
+
+		Args:
+			path: 文件路径
+		"""
+		path = Path(path)
+		temp = path.with_name(path.name + '.tmp')
+
+		with open(temp, 'w', encoding='utf-8') as f:
+			json.dump({
+				'version': INDEX_VERSION,
+				'ruleset_hash': self.ruleset_hash,
+				'rules': self.rules,
+				'records': [[info, *result] for info, result
+					in zip(self.__infos, self.__results)],
+				'postings': {gram: base64.b64encode(posting.tobytes()).decode('ascii')
+					for gram, posting in self.__postings.items()},
+			}, f, ensure_ascii=False)
+
+		os.replace(temp, path)
+
+	@classmethod
+	def load(cls, path: str | Path) -> 'CorpusIndex':
+		"""
+		从文件加载倒排索引
+
+		Args:
+			path: 文件路径
+
+		Returns:
+			CorpusIndex: 倒排索引
+
+		Raises:
+			ValueError: 文件版本不受支持
+		"""
+		with open(path, 'r', encoding='utf-8') as f:
+			data = json.load(f)
+
+		if data.get('version') != INDEX_VERSION:
+			raise ValueError(f'不支持的倒排索引版本：{data.get("version")}')
+
+		index = cls(data['ruleset_hash'], data['rules'])
+		for info, institution, name, is_teacher in data['records']:
+			index.__infos.append(info)
+			index.__results.append((institution, name, is_teacher))
+
+		for gram, encoded in data['postings'].items():
+			posting = array('I')
+			posting.frombytes(base64.b64decode(encoded))
+			index.__postings[gram] = posting
+
+		return index
@@ -0,0 +1,327 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+分片批量解析
+
+此模块将批量解析拆分到多台机器上运行，分为三个步骤：
+1. plan：扫描输入文件，按规范化后的申请信息的哈希值将每一行分配到N个分片之一，
+   相同的申请信息总是落在同一个分片上，因此各个分片的解析缓存仍然有效。
+   分片计划（plan.json）记录输入文件的大小和SHA-256、分片数量、各分片的行数
+   以及解析规则的哈希值
+2. run：在任意一台机器上，只需要输入文件、配置文件和分片计划，即可解析第k个分片，
+   输出的每条结果都带有在原始输入中的行号
+3. merge：检查所有分片都已完成且使用了相同的解析规则，按原始行号归并各分片的输出
+
+分片序号从0开始，即 --shard 0/4 到 --shard 3/4。
+
+使用示例：
+
+from iparser.batch.sharding import merge_shards, plan_shards, run_shard
+
+
+plan_shards(['applicants.txt'], 'shards', 4)
+for index in range(4):
+	run_shard('shards', index)
+merge_shards('shards', 'results.csv')
+"""
+import csv
+import hashlib
+import heapq
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.batch.cache import PersistentParseCache, normalize_info
+from iparser.batch.columnar import FIELDS
+from iparser.batch.engine import parse_lines
+from iparser.batch.jobs import atomic_write_json, read_rows
+from iparser.logger import logger
+
+
+PLAN_FILE = 'plan.json'
+PLAN_VERSION = 1
+
+
+def shard_of(info: str, shards: int) -> int:
+	"""
+	计算申请信息所属的分片
+
+	使用规范化后的申请信息的SHA-1哈希值，结果与机器和Python进程无关。
+
+	Args:
+		info: 申请信息
+		shards: 分片数量
+
+	Returns:
+		int: 分片序号，范围为[0, shards)
+	"""
+	digest = hashlib.sha1(normalize_info(info).encode('utf-8')).digest()
+	return int.from_bytes(digest[:8], 'big') % shards
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+	"""
+	解析形如 k/N 的分片参数
+
+	Args:
+		spec: 分片参数，例如 0/4
+
+	Returns:
+		Tuple[int, int]: 分片序号和分片数量
+
+	Raises:
+		ValueError: 分片参数格式错误或超出范围
+	"""
+	try:
+		index, shards = (int(part) for part in spec.split('/'))
+	except ValueError as e:
+		raise ValueError(f'分片参数格式错误：{spec}，应为 k/N，例如 0/4') from e
+
+	if shards <= 0 or not 0 <= index < shards:
+		raise ValueError(f'分片参数超出范围：{spec}，k 的范围为 0 到 N-1')
+
+	return index, shards
+
+def file_sha256(path: str | Path) -> str:
+	"""
+	计算文件的SHA-256
+
+	Args:
+		path: 文件路径
+
+	Returns:
+		str: 十六进制的SHA-256
+	"""
+	digest = hashlib.sha256()
+	with open(path, 'rb') as f:
+		for block in iter(lambda: f.read(1 << 20), b''):
+			digest.update(block)
+
+	return digest.hexdigest()
+
+def iter_input_rows(paths: Sequence[str | Path]) -> Iterator[Tuple[int, str]]:
+	"""
+	按顺序读取多个输入文件中的申请信息，并为每行分配全局行号
+
+	Args:
+		paths: 输入文件路径
+
+	Yields:
+		Tuple[int, str]: 全局行号（从0开始，不计空行）和申请信息
+	"""
+	row_id = 0
+	for path in paths:
+		for _, row in read_rows(path):
+			yield row_id, row
+			row_id += 1
+
+def shard_file(directory: Path, index: int, shards: int) -> Path:
+	"""获取分片输出文件路径"""
+	return directory / f'shard-{index:05d}-of-{shards:05d}.jsonl'
+
+
+def plan_shards(inputs: Sequence[str | Path], directory: str | Path, shards: int,
+	ruleset: Optional[Ruleset] = None) -> Dict:
+	"""
+	生成分片计划
+
+	Args:
+		inputs: 输入文件路径，按顺序拼接为一个输入
+		directory: 保存分片计划和分片输出文件的目录
+		shards: 分片数量
+		ruleset: 解析规则，默认使用当前发布的解析规则
+
+	Returns:
+		Dict: 分片计划
+
+	Raises:
+		ValueError: 分片数量小于1
+	"""
+	if shards <= 0:
+		raise ValueError('分片数量必须大于0')
+
+	ruleset = ruleset or get_ruleset()
+	directory = Path(directory)
+	directory.mkdir(parents=True, exist_ok=True)
+
+	rows = [0] * shards
+	for _, row in iter_input_rows(inputs):
+		rows[shard_of(row, shards)] += 1
+
+	plan = {
+		'version': PLAN_VERSION,
+		'shards': shards,
+		'ruleset_hash': ruleset.hash,
+		'inputs': [{
+			'path': str(Path(path).resolve()),
+			'size': Path(path).stat().st_size,
+			'sha256': file_sha256(path),
+		} for path in inputs],
+		'rows': rows,
+	}
+	plan['id'] = hashlib.sha256(
+		json.dumps(plan, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+	atomic_write_json(directory / PLAN_FILE, plan)
+	logger.info(f'已生成分片计划：{shards} 个分片，共 {sum(rows)} 行')
+
+	return plan
+
+def load_plan(directory: str | Path) -> Dict:
+	"""
+	读取分片计划
+
+	Args:
+		directory: 保存分片计划的目录
+
+	Returns:
+		Dict: 分片计划
+	"""
+	with open(Path(directory) / PLAN_FILE, 'r', encoding='utf-8') as f:
+		return json.load(f)
+
+def run_shard(directory: str | Path, index: int,
+	inputs: Optional[Sequence[str | Path]] = None, ruleset: Optional[Ruleset] = None,
+	max_workers: int = 1, cache: Optional[PersistentParseCache] = None) -> Path:
+	"""
+	解析一个分片
+
+	Args:
+		directory: 保存分片计划的目录，分片输出文件也写入此目录
+		index: 分片序号
+		inputs: 输入文件路径，在其他机器上运行时路径可能不同，默认使用分片计划中的路径
+		ruleset: 解析规则，默认使用当前发布的解析规则
+		max_workers: 并发解析的线程数
+		cache: 持久化解析缓存
+
+	Returns:
+		Path: 分片输出文件路径
+
+	Raises:
+		ValueError: 分片序号超出范围，或者输入文件、解析规则与分片计划不一致
+	"""
+	directory = Path(directory)
+	plan = load_plan(directory)
+	ruleset = ruleset or get_ruleset()
+	shards = plan['shards']
+
+	if not 0 <= index < shards:
+		raise ValueError(f'分片序号超出范围：{index}，分片数量为 {shards}')
+	if ruleset.hash != plan['ruleset_hash']:
+		raise ValueError('解析规则与分片计划不一致，请使用相同的配置文件')
+
+	inputs = [Path(path) for path in inputs] if inputs \
+		else [Path(item['path']) for item in plan['inputs']]
+	if len(inputs) != len(plan['inputs']):
+		raise ValueError(f'输入文件数量与分片计划不一致，应为 {len(plan["inputs"])} 个')
+
+	for path, item in zip(inputs, plan['inputs']):
+		if path.stat().st_size != item['size'] or file_sha256(path) != item['sha256']:
+			raise ValueError(f'输入文件与分片计划不一致：{path}')
+
+	row_ids, rows = [], []
+	for row_id, row in iter_input_rows(inputs):
+		if shard_of(row, shards) == index:
+			row_ids.append(row_id)
+			rows.append(row)
+
+	results = parse_lines(rows, ruleset, max_workers, cache=cache)
+
+	output = shard_file(directory, index, shards)
+	temp = output.with_name(output.name + '.tmp')
+	with open(temp, 'w', encoding='utf-8') as f:
+		# 第一行记录分片信息，合并时用于检查
+		f.write(json.dumps({'plan': plan['id'], 'shard': index, 'rows': len(rows),
+			'ruleset_hash': ruleset.hash}) + '\n')
+		for row_id, result in zip(row_ids, results):
+			f.write(json.dumps({'row': row_id, **result._asdict()}, ensure_ascii=False))
+			f.write('\n')
+
+	os.replace(temp, output)
+	logger.info(f'分片 {index}/{shards} 解析完成，共 {len(rows)} 行：{output}')
+
+	return output
+
+def _read_shard(path: Path) -> Iterator[Tuple[int, Dict]]:
+	"""按行号顺序读取分片输出文件中的解析结果"""
+	with open(path, 'r', encoding='utf-8') as f:
+		f.readline()
+		for line in f:
+			record = json.loads(line)
+			yield record.pop('row'), record
+
+def merge_shards(directory: str | Path, output: str | Path,
+	output_format: Optional[str] = None) -> int:
+	"""
+	按原始行号归并所有分片的输出
+
+	各分片输出文件已按行号排序，归并时逐行读取，不需要把所有结果读入内存。
+
+	Args:
+		directory: 保存分片计划和分片输出文件的目录
+		output: 输出文件路径
+		output_format: 输出格式，csv或jsonl，默认根据输出文件扩展名判断
+
+	Returns:
+		int: 合并的总行数
+
+	Raises:
+		ValueError: 分片缺失、不完整或与分片计划不一致
+	"""
+	directory = Path(directory)
+	output = Path(output)
+	output_format = output_format or output.suffix.lstrip('.').lower()
+	if output_format not in ('csv', 'jsonl'):
+		raise ValueError(f'不支持的输出格式：{output_format}，仅支持 csv, jsonl')
+
+	plan = load_plan(directory)
+	paths = []
+
+	for index in range(plan['shards']):
+		path = shard_file(directory, index, plan['shards'])
+		if not path.exists():
+			raise ValueError(f'分片 {index}/{plan["shards"]} 尚未完成：{path}')
+
+		with open(path, 'r', encoding='utf-8') as f:
+			header = json.loads(f.readline())
+
+		if header['plan'] != plan['id'] \
+			or header['ruleset_hash'] != plan['ruleset_hash'] \
+			or header['rows'] != plan['rows'][index]:
+			raise ValueError(f'分片 {index}/{plan["shards"]} 与分片计划不一致：{path}')
+
+		paths.append(path)
+
+	temp = output.with_name(output.name + '.tmp')
+	count = 0
+
+	try:
+		with open(temp, 'w', encoding='utf-8', newline='') as f:
+			writer = csv.writer(f) if output_format == 'csv' else None
+			if writer is not None:
+				writer.writerow(FIELDS)
+
+			for row_id, record in heapq.merge(*(_read_shard(path) for path in paths),
+				key=lambda item: item[0]):
+				if row_id != count:
+					raise ValueError(f'分片输出缺少第 {count} 行')
+
+				if writer is not None:
+					writer.writerow((record['info'], record['institution'],
+						record['name'], int(record['is_teacher']), record['full_info']))
+				else:
+					f.write(json.dumps(record, ensure_ascii=False))
+					f.write('\n')
+
+				count += 1
+	except BaseException:
+		temp.unlink(missing_ok=True)
+		raise
+
+	os.replace(temp, output)
+	logger.info(f'已合并 {plan["shards"]} 个分片，共 {count} 行：{output}')
+
+	return count
@@ -0,0 +1,310 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+本地解析结果仓库
+
+此模块将批量解析结果导入本地SQLite数据库，回答解析之后总要问的几个问题：
+每个机构有多少人、教师和学生各有多少、哪些记录是未知机构或无名无姓。
+- 每次导入记为一个批次，按批次大小分事务批量写入
+- 解析结果表在机构和教师身份上建有索引，列出未识别的记录时不需要扫描全表
+- 导入时同时按批次累加每个机构的人数，统计查询只读取汇总表，数百万行也只需要几毫秒
+
+使用示例：
+
+from iparser.batch.warehouse import ResultWarehouse
+
+
+with ResultWarehouse('results.db') as warehouse:
+	warehouse.load_file('results.csv')
+	for institution, total, teachers in warehouse.institution_counts(10):
+		print(institution, total, teachers)
+"""
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.batch.columnar import ParseResult
+from iparser.batch.records import read_results
+from iparser.logger import logger
+
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS loads (
+	id INTEGER PRIMARY KEY,
+	source TEXT NOT NULL,
+	ruleset TEXT NOT NULL,
+	rows INTEGER NOT NULL DEFAULT 0,
+	created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+	id INTEGER PRIMARY KEY,
+	load INTEGER NOT NULL REFERENCES loads (id) ON DELETE CASCADE,
+	info TEXT NOT NULL,
+	institution TEXT NOT NULL,
+	name TEXT NOT NULL,
+	is_teacher INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_institution ON results (institution, is_teacher);
+CREATE INDEX IF NOT EXISTS results_is_teacher ON results (is_teacher);
+CREATE INDEX IF NOT EXISTS results_name ON results (name);
+CREATE TABLE IF NOT EXISTS institution_counts (
+	load INTEGER NOT NULL REFERENCES loads (id) ON DELETE CASCADE,
+	institution TEXT NOT NULL,
+	total INTEGER NOT NULL,
+	teachers INTEGER NOT NULL,
+	PRIMARY KEY (load, institution)
+);
+'''
+
+
+class Load(NamedTuple):
+	"""一次导入的批次"""
+	id: int           # 批次编号
+	source: str       # 导入的文件或来源说明
+	ruleset: str      # 解析规则的哈希值
+	rows: int         # 导入的行数
+	created: float    # 导入时间（Unix时间戳）
+
+
+class InstitutionCount(NamedTuple):
+	"""一个机构的人数统计"""
+	institution: str  # 机构名称
+	total: int        # 总人数
+	teachers: int     # 教师人数
+
+
+class ResultWarehouse:
+	"""
+	本地解析结果仓库类
+
+	Attributes:
+		path: 数据库文件路径
+		batch_size: 每个事务写入的行数
+	"""
+	def __init__(self, path: str | Path, batch_size: int = 50000,
+		ruleset: Optional[Ruleset] = None):
+		"""
+		打开（或创建）解析结果仓库
+
+		Args:
+			path: 数据库文件路径
+			batch_size: 每个事务写入的行数
+			ruleset: 提供未知机构和无名无姓默认名称的解析规则，默认使用当前发布的解析规则
+		"""
+		self.path = Path(path)
+		self.batch_size = batch_size
+
+		self.__ruleset = ruleset or get_ruleset()
+		self.__connection = sqlite3.connect(self.path, timeout=30)
+		self.__connection.execute('PRAGMA journal_mode=WAL')
+		self.__connection.execute('PRAGMA synchronous=NORMAL')
+		self.__connection.execute('PRAGMA foreign_keys=ON')
+
+		with self.__connection:
+			self.__connection.executescript(_SCHEMA)
+
+	def __enter__(self) -> 'ResultWarehouse':
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	#region Load
+	def load(self, results: Iterable[ParseResult], source: str = '',
+		ruleset_hash: Optional[str] = None) -> int:
+		"""
+		导入一批解析结果
+
+		Args:
+			results: 解析结果，也可以是列式解析结果容器或 RecordReader.results()
+			source: 来源说明，例如导入的文件路径
+			ruleset_hash: 解析规则的哈希值，默认使用当前解析规则的哈希值
+
+		Returns:
+			int: 批次编号
+		"""
+		connection = self.__connection
+		with connection:
+			load = connection.execute(
+				'INSERT INTO loads (source, ruleset, created) VALUES (?, ?, ?)',
+				(source, ruleset_hash or self.__ruleset.hash, time.time())).lastrowid
+
+		rows = 0
+		batch: List[Tuple] = []
+		start = time.perf_counter()
+
+		try:
+			for result in results:
+				batch.append((load, result.info, result.institution, result.name,
+					int(result.is_teacher)))
+				if len(batch) >= self.batch_size:
+					self.__insert(load, batch)
+					rows += len(batch)
+					batch = []
+
+			self.__insert(load, batch)
+			rows += len(batch)
+		except BaseException:
+			# 导入失败时删除不完整的批次
+			self.delete(load)
+			raise
+
+		with connection:
+			connection.execute('UPDATE loads SET rows = ? WHERE id = ?', (rows, load))
+
+		logger.info(f'已导入解析结果 {rows} 行（批次 {load}），'
+			f'用时 {time.perf_counter() - start:.1f} 秒：{source}')
+		return load
+
+	def __insert(self, load: int, batch: List[Tuple]):
+		"""在一个事务中写入一批解析结果，并累加机构人数"""
+		if not batch:
+			return
+
+		totals, teachers = Counter(), Counter()
+		for _, _, institution, _, is_teacher in batch:
+			totals[institution] += 1
+			teachers[institution] += is_teacher
+
+		with self.__connection:
+			self.__connection.executemany(
+				'INSERT INTO results (load, info, institution, name, is_teacher) '
+				'VALUES (?, ?, ?, ?, ?)', batch)
+			self.__connection.executemany(
+				'INSERT INTO institution_counts VALUES (?, ?, ?, ?) '
+				'ON CONFLICT (load, institution) DO UPDATE SET '
+				'total = total + excluded.total, '
+				'teachers = teachers + excluded.teachers',
+				((load, institution, total, teachers[institution])
+				for institution, total in totals.items()))
+
+	def load_file(self, path: str | Path) -> int:
+		"""
+		导入批量任务输出的解析结果文件
+
+		Args:
+			path: CSV、JSONL或二进制解析结果文件（.iprec）路径
+
+		Returns:
+			int: 批次编号
+		"""
+		return self.load(read_results(path), str(path))
+
+	def delete(self, load: int):
+		"""
+		删除一个批次及其解析结果
+
+		Args:
+			load: 批次编号
+		"""
+		with self.__connection:
+			self.__connection.execute('DELETE FROM loads WHERE id = ?', (load,))
+	#endregion Load
+
+	#region Query
+	def loads(self) -> List[Load]:
+		"""
+		获取所有批次
+
+		Returns:
+			List[Load]: 按导入顺序排列的批次
+		"""
+		rows = self.__connection.execute(
+			'SELECT id, source, ruleset, rows, created FROM loads ORDER BY id')
+
+		return [Load(*row) for row in rows]
+
+	def institution_counts(self, limit: Optional[int] = None,
+		load: Optional[int] = None) -> List[InstitutionCount]:
+		"""
+		统计每个机构的人数
+
+		Args:
+			limit: 最多返回的机构数量，为None时返回所有机构
+			load: 只统计指定批次，为None时统计所有批次
+
+		Returns:
+			List[InstitutionCount]: 按总人数从多到少排列的机构人数统计
+		"""
+		where = 'WHERE load = ?' if load is not None else ''
+		rows = self.__connection.execute(
+			'SELECT institution, SUM(total), SUM(teachers) '
+			f'FROM institution_counts {where} '
+			'GROUP BY institution ORDER BY SUM(total) DESC, institution LIMIT ?',
+			(*([load] if load is not None else []), -1 if limit is None else limit))
+
+		return [InstitutionCount(*row) for row in rows]
+
+	def totals(self, load: Optional[int] = None) -> Tuple[int, int]:
+		"""
+		统计教师和学生人数
+
+		Args:
+			load: 只统计指定批次，为None时统计所有批次
+
+		Returns:
+			Tuple[int, int]: 教师人数和学生人数
+		"""
+		where = 'WHERE load = ?' if load is not None else ''
+		total, teachers = self.__connection.execute(
+			f'SELECT SUM(total), SUM(teachers) FROM institution_counts {where}',
+			[load] if load is not None else []).fetchone()
+
+		return teachers or 0, (total or 0) - (teachers or 0)
+
+	def unresolved(self, limit: Optional[int] = 100,
+		load: Optional[int] = None) -> List[ParseResult]:
+		"""
+		列出机构为未知机构或姓名为无名无姓的记录
+
+		Args:
+			limit: 最多返回的记录数量，为None时返回所有记录
+			load: 只查询指定批次，为None时查询所有批次
+
+		Returns:
+			List[ParseResult]: 按导入顺序排列的记录，full_info为空字符串
+		"""
+		config = self.__ruleset.config
+		where = 'AND load = ?' if load is not None else ''
+		rows = self.__connection.execute(
+			'SELECT info, institution, name, is_teacher FROM results '
+			f'WHERE id IN (SELECT id FROM results WHERE institution = ? '
+			f'UNION SELECT id FROM results WHERE name = ?) {where} ORDER BY id LIMIT ?',
+			(config.institution.default_name, config.name.default_name,
+			*([load] if load is not None else []), -1 if limit is None else limit))
+
+		return [ParseResult(info, institution, name, bool(is_teacher), '')
+			for info, institution, name, is_teacher in rows]
+
+	def unresolved_count(self, load: Optional[int] = None) -> Tuple[int, int]:
+		"""
+		统计未知机构和无名无姓的记录数量
+
+		Args:
+			load: 只统计指定批次，为None时统计所有批次
+
+		Returns:
+			Tuple[int, int]: 未知机构的记录数量和无名无姓的记录数量
+		"""
+		config = self.__ruleset.config
+		where = 'AND load = ?' if load is not None else ''
+		parameters = [load] if load is not None else []
+
+		institutions, = self.__connection.execute(
+			f'SELECT COUNT(*) FROM results WHERE institution = ? {where}',
+			(config.institution.default_name, *parameters)).fetchone()
+		names, = self.__connection.execute(
+			f'SELECT COUNT(*) FROM results WHERE name = ? {where}',
+			(config.name.default_name, *parameters)).fetchone()
+
+		return institutions, names
+	#endregion Query
+
+	def close(self):
+		"""关闭数据库连接"""
+		self.__connection.close()
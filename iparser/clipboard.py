@@ -0,0 +1,310 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+剪贴板后端
+
+此模块将剪贴板的读写抽象为后端接口，剪贴板监听器只通过后端访问剪贴板：
+- TkClipboard：使用tkinter根窗口读写剪贴板，GUI默认使用，需要显示器
+- CommandClipboard：调用系统剪贴板命令（wl-clipboard、xclip、xsel、pbcopy/pbpaste），
+  不需要tkinter，适合无界面的剪贴板守护进程
+- MemoryClipboard：内存中的剪贴板，用于测试和基准测试
+
+使用示例：
+
+from iparser.clipboard import create_backend
+
+
+backend = create_backend('auto')
+backend.set('河南科技职业大学-杨怡宁')
+print(backend.get())
+"""
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from iparser.logger import logger
+
+if TYPE_CHECKING:
+	import tkinter as tk
+
+
+class ClipboardBackend:
+	"""
+	剪贴板后端基类
+
+	Attributes:
+		name: 后端名称
+	"""
+	name = 'base'
+
+	def get(self) -> Optional[str]:
+		"""
+		获取剪贴板文本
+
+		Returns:
+			Optional[str]: 剪贴板文本，剪贴板为空或不是文本时返回None
+		"""
+		raise NotImplementedError
+
+	def set(self, content: str):
+		"""
+		设置剪贴板文本
+
+		Args:
+			content: 要设置的文本
+		"""
+		raise NotImplementedError
+
+	def clear(self):
+		"""清除剪贴板内容"""
+		self.set('')
+
+
+class TkClipboard(ClipboardBackend):
+	"""
+	tkinter剪贴板后端
+
+	在主线程中使用根窗口读写剪贴板；在其他线程中创建临时的Tk实例读写，
+	每次读写都要创建一个Tcl解释器，开销较大。
+	"""
+	name = 'tk'
+
+	def __init__(self, root: 'tk.Tk'):
+		"""
+		初始化tkinter剪贴板后端
+
+		Args:
+			root: tkinter根窗口
+		"""
+		self.__root = root
+
+	def __run(self, action):
+		"""在主线程中使用根窗口，在其他线程中使用临时的Tk实例执行剪贴板操作"""
+		if threading.current_thread() is threading.main_thread():
+			return action(self.__root)
+
+		import tkinter as tk
+
+
+		temp_root = tk.Tk()
+		try:
+			temp_root.withdraw()
+			return action(temp_root)
+		finally:
+			temp_root.destroy()
+
+	def get(self) -> Optional[str]:
+		from tkinter import TclError
+
+
+		try:
+			return self.__run(lambda root: root.clipboard_get())
+		except TclError:
+			# 剪贴板内容不是文本或为空
+			return None
+
+	def set(self, content: str):
+		def action(root):
+			root.clipboard_clear()
+			root.clipboard_append(content)
+			root.update() # 确保剪贴板更新立即生效
+
+		self.__run(action)
+
+	def clear(self):
+		def action(root):
+			root.clipboard_clear()
+			root.update() # 确保剪贴板更新立即生效
+
+		self.__run(action)
+
+
+class CommandClipboard(ClipboardBackend):
+	"""
+	系统剪贴板命令后端
+
+	每次读写调用一次外部命令，不依赖tkinter，可以在任意线程中使用。
+	"""
+	# 后端名称：读取命令、写入命令、清除命令（None表示写入空字符串）
+	COMMANDS: Dict[str, Tuple[List[str], List[str], Optional[List[str]]]] = {
+		'wl-clipboard': (['wl-paste', '--no-newline'], ['wl-copy'],
+			['wl-copy', '--clear']),
+		'xclip': (['xclip', '-selection', 'clipboard', '-o'],
+			['xclip', '-selection', 'clipboard', '-i'], None),
+		'xsel': (['xsel', '--clipboard', '--output'],
+			['xsel', '--clipboard', '--input'], ['xsel', '--clipboard', '--clear']),
+		'pbcopy': (['pbpaste'], ['pbcopy'], None),
+	}
+
+	def __init__(self, name: str, timeout: float = 2.0):
+		"""
+		初始化系统剪贴板命令后端
+
+		Args:
+			name: 后端名称，参见COMMANDS
+			timeout: 每次调用命令的超时时间，单位为秒
+
+		Raises:
+			ValueError: 后端名称不受支持
+		"""
+		if name not in self.COMMANDS:
+			raise ValueError(f'不支持的剪贴板命令：{name}，'
+				f'仅支持 {", ".join(self.COMMANDS)}')
+
+		self.name = name
+		self.timeout = timeout
+		self.__get, self.__set, self.__clear = self.COMMANDS[name]
+
+	@classmethod
+	def available(cls, name: str) -> bool:
+		"""
+		判断系统剪贴板命令是否可用
+
+		Args:
+			name: 后端名称
+
+		Returns:
+			bool: 读取和写入命令都已安装时返回True
+		"""
+		get, put, _ = cls.COMMANDS[name]
+		return shutil.which(get[0]) is not None and shutil.which(put[0]) is not None
+
+	def get(self) -> Optional[str]:
+		result = subprocess.run(self.__get, capture_output=True, timeout=self.timeout)
+		if result.returncode != 0:
+			# 剪贴板为空或内容不是文本
+			return None
+
+		return result.stdout.decode('utf-8', errors='replace') or None
+
+	def set(self, content: str):
+		# xclip等命令会在后台保持剪贴板所有权，不能捕获其输出，否则会一直等待
+		subprocess.run(self.__set, input=content.encode('utf-8'),
+			stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=self.timeout,
+			check=True)
+
+	def clear(self):
+		if self.__clear is None:
+			self.set('')
+			return
+
+		subprocess.run(self.__clear, stdout=subprocess.DEVNULL,
+			stderr=subprocess.DEVNULL, timeout=self.timeout, check=True)
+
+
+class MemoryClipboard(ClipboardBackend):
+	"""
+	内存剪贴板后端，用于测试和基准测试
+
+	Attributes:
+		history: 每次写入的时间（time.perf_counter()）和内容
+	"""
+	name = 'memory'
+
+	def __init__(self, content: Optional[str] = None):
+		"""
+		初始化内存剪贴板
+
+		Args:
+			content: 初始内容
+		"""
+		self.history: List[Tuple[float, str]] = []
+		self.__content = content
+		self.__lock = threading.Lock()
+		self.__changed = threading.Condition(self.__lock)
+
+	def get(self) -> Optional[str]:
+		with self.__lock:
+			return self.__content or None
+
+	def set(self, content: str):
+		with self.__lock:
+			self.__content = content
+			self.history.append((time.perf_counter(), content))
+			self.__changed.notify_all()
+
+	def clear(self):
+		with self.__lock:
+			self.__content = None
+
+	def wait_for(self, content: str, timeout: Optional[float] = None) -> bool:
+		"""
+		等待剪贴板内容变为指定的文本
+
+		Args:
+			content: 期望的文本
+			timeout: 超时时间，单位为秒
+
+		Returns:
+			bool: 超时前内容变为期望的文本时返回True
+		"""
+		with self.__lock:
+			return self.__changed.wait_for(lambda: self.__content == content, timeout)
+
+
+def detect_command_clipboard() -> Optional[str]:
+	"""
+	根据当前的图形环境检测可用的系统剪贴板命令
+
+	Returns:
+		Optional[str]: 可用的后端名称，没有可用的命令时返回None
+	"""
+	candidates: Sequence[str] = []
+	if sys.platform == 'darwin':
+		candidates = ['pbcopy']
+	elif os.environ.get('WAYLAND_DISPLAY'):
+		candidates = ['wl-clipboard', 'xclip', 'xsel']
+	elif os.environ.get('DISPLAY'):
+		candidates = ['xclip', 'xsel']
+
+	for name in candidates:
+		if CommandClipboard.available(name):
+			return name
+
+	return None
+
+def create_backend(name: str = 'auto',
+	root: Optional['tk.Tk'] = None) -> ClipboardBackend:
+	"""
+	创建剪贴板后端
+
+	Args:
+		name: 后端名称，auto、tk、memory 或 CommandClipboard.COMMANDS 中的命令名称。
+			auto 在提供了根窗口时使用tkinter，否则自动检测系统剪贴板命令
+		root: tkinter根窗口，使用tkinter后端时必须提供
+
+	Returns:
+		ClipboardBackend: 剪贴板后端
+
+	Raises:
+		ValueError: 后端名称不受支持，或者没有可用的剪贴板
+	"""
+	if name == 'auto':
+		if root is not None:
+			return TkClipboard(root)
+
+		detected = detect_command_clipboard()
+		if detected is None:
+			raise ValueError('没有找到可用的剪贴板命令，'
+				'请安装 wl-clipboard、xclip 或 xsel，并确认已设置 DISPLAY 或 WAYLAND_DISPLAY')
+
+		name = detected
+
+	if name == 'tk':
+		if root is None:
+			raise ValueError('使用tkinter剪贴板后端时必须提供根窗口')
+		return TkClipboard(root)
+
+	if name == 'memory':
+		return MemoryClipboard()
+
+	backend = CommandClipboard(name)
+	logger.debug(f'使用剪贴板命令：{name}')
+
+	return backend
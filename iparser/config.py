@@ -3,10 +3,13 @@ This file is part of the Info Parser project, https://github.com/walklinewang/in
 The MIT License (MIT)
 Copyright © 2025 Walkline Wang <walkline@gmail.com>
 """
+import hashlib
+import json
 from pathlib import Path
-from typing import Set
+from typing import Dict, Literal, Optional, Set
 
 from confz import BaseConfig, FileSource
+from pydantic import Field
 
 from iparser.logger import logger
 from iparser.utils import resource_path
@@ -43,12 +46,46 @@ class Formatting(BaseConfig):
 	include_secondary_college: bool # 是否包含二级学院
 
 
+class Segmentation(BaseConfig):
+	"""分词配置"""
+	mode: Literal['precise', 'search'] = 'precise' # 分词模式（精确模式/搜索引擎模式）
+	hmm: bool = True                               # 是否启用HMM新词发现
+	tiered: bool = False                           # 是否启用分级分词（先关闭HMM，必要时回退）
+	words: Dict[str, int] = Field(default_factory=dict) # 自定义词条及词频
+
+
+class PrefixCache(BaseConfig):
+	"""机构前缀缓存配置"""
+	enabled: bool = True                         # 是否启用机构前缀缓存
+	max_size: int = 1024                         # 最多缓存的机构数量
+	file: str = 'institution_cache.json'         # 缓存持久化文件路径
+
+
+class ParseCache(BaseConfig):
+	"""持久化解析缓存配置"""
+	enabled: bool = False                        # 是否启用持久化解析缓存
+	file: str = 'parse_cache.db'                 # 缓存数据库文件路径
+	max_entries: int = 1_000_000                 # 最多保存的缓存条数
+	max_age_days: float = 365.0                  # 缓存最长保存天数
+
+
+class InputGuard(BaseConfig):
+	"""输入限制配置"""
+	max_content_length: int = 1_000_000 # 剪贴板内容最大长度，超出时跳过
+	max_length: int = 100               # 单条申请信息最大长度，超出部分截断
+	probe_length: int = 50              # 在前N个字符内查找机构后缀或简称
+	time_budget: float = 2.0            # 解析时间预算，单位为秒
+
+
 class Institution(BaseConfig):
 	"""机构解析配置"""
 	suffixes: Set[str]          # 机构后缀关键词
 	shortened_names: Set[str]       # 机构简称
 	excluded_keywords: Set[str] # 排除的关键词
 	default_name: str           # 默认机构名称
+	aliases: Dict[str, str] = Field(default_factory=dict)  # 机构别名（简称或变体 → 规范名称）
+	canonical_names: Set[str] = Field(default_factory=set) # 别名之外的规范名称，用于模糊匹配
+	fuzzy_distance: int = 1     # 模糊匹配错别字时允许的最大编辑距离，0表示只使用别名
 
 	def add_shortened_names(self, names: Set[str]):
 		"""添加机构简称"""
@@ -60,22 +97,92 @@ class Institution(BaseConfig):
 
 	@property
 	def all_suffixes(self) -> Set[str]:
-		"""获取所有机构后缀和简称关键词"""
-		return self.suffixes.union(self.shortened_names)
+		"""获取所有机构后缀和简称关键词（别名也作为简称）"""
+		return self.suffixes.union(self.shortened_names, self.aliases)
 
 
 class Name(BaseConfig):
 	"""姓名解析配置"""
 	default_name: str # 默认姓名
+	extractor: Literal['segments', 'surname'] = 'segments' # 姓名提取方式（分词/姓氏锚定）
+	surnames: Set[str] = Field(default_factory=set)         # 在内置姓氏之外追加的姓氏
+
+
+class Logging(BaseConfig):
+	"""日志配置"""
+	level: Literal['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'] = 'DEBUG' # 日志级别
+	file: str = 'iparser.log'                  # 日志文件路径
+	rotation: Literal['size', 'time'] = 'size' # 日志轮转方式（按大小/按时间）
+	max_bytes: int = 5 * 1024 * 1024           # 按大小轮转时单个日志文件的最大字节数
+	backup_count: int = 3                      # 保留的历史日志文件数量
+	when: str = 'midnight'                     # 按时间轮转时的轮转周期
+	sample_rate: int = 20                      # 同一位置每秒最多记录的调试日志条数，0表示不限制
+
+
+class Profile(BaseConfig):
+	"""配置档案，在基础配置上叠加的少量差异"""
+	shortened_names: Set[str] = Field(default_factory=set)   # 追加的机构简称
+	aliases: Dict[str, str] = Field(default_factory=dict)    # 追加的机构别名
+	excluded_keywords: Set[str] = Field(default_factory=set) # 追加的排除关键词
+	words: Dict[str, int] = Field(default_factory=dict)      # 追加的自定义词条及词频
+	output_pattern_teacher: Optional[str] = None             # 教师输出格式
+	output_pattern_student: Optional[str] = None             # 学生输出格式
+
+	def apply(self, base: 'Config') -> 'Config':
+		"""
+		将配置档案叠加到基础配置上
+
+		Args:
+			base: 基础配置
+
+		Returns:
+			叠加后的新配置，基础配置不会被修改
+		"""
+		institution = base.institution.model_copy(update={
+			'shortened_names': base.institution.shortened_names | self.shortened_names,
+			'excluded_keywords':
+				base.institution.excluded_keywords | self.excluded_keywords,
+			'aliases': {**base.institution.aliases, **self.aliases},
+		})
+		segmentation = base.segmentation.model_copy(update={
+			'words': {**base.segmentation.words, **self.words},
+		})
+		formatting = base.formatting.model_copy(update={
+			'output_pattern_teacher':
+				self.output_pattern_teacher or base.formatting.output_pattern_teacher,
+			'output_pattern_student':
+				self.output_pattern_student or base.formatting.output_pattern_student,
+		})
+
+		return base.model_copy(update={
+			'institution': institution,
+			'segmentation': segmentation,
+			'formatting': formatting,
+		})
 
 
 class Config(BaseConfig):
 	"""信息解析器主配置"""
 	identity: Identity
 	formatting: Formatting
+	segmentation: Segmentation = Field(default_factory=Segmentation)
 	institution: Institution
 	name: Name
+	prefix_cache: PrefixCache = Field(default_factory=PrefixCache)
+	parse_cache: ParseCache = Field(default_factory=ParseCache)
+	input_guard: InputGuard = Field(default_factory=InputGuard)
+	logging: Logging = Field(default_factory=Logging)
+	profiles: Dict[str, Profile] = Field(default_factory=dict)
 	CONFIG_SOURCES = get_config_source()
 
+	@property
+	def ruleset_hash(self) -> str:
+		"""获取解析规则的哈希值，解析相关的配置发生变化时哈希值随之变化"""
+		rules = self.model_dump(
+			include={'identity', 'formatting', 'segmentation', 'institution', 'name'})
+		content = json.dumps(rules, ensure_ascii=False, sort_keys=True, default=sorted)
+
+		return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
 
 config = Config()
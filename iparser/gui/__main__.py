@@ -6,15 +6,26 @@ Copyright © 2025 Walkline Wang <walkline@gmail.com>
 import sys
 import tkinter as tk
 
+from iparser.config import config
 from iparser.gui.main_window import MainWindow
-from iparser.logger import logger, setup_console_logging
+from iparser.logger import logger, setup_console_logging, setup_logging
 
 
+def create_root() -> tk.Tk:
+	"""创建根窗口，安装了tkinterdnd2时创建支持文件拖放的根窗口"""
+	try:
+		from tkinterdnd2 import TkinterDnD
+	except ImportError:
+		return tk.Tk()
+
+	return TkinterDnD.Tk()
+
 def main():
 	"""启动GUI应用的主函数"""
+	setup_logging(**config.logging.model_dump())
 	setup_console_logging()
 
-	root = tk.Tk()
+	root = create_root()
 	MainWindow(root)
 
 	try:
@@ -6,12 +6,14 @@ Copyright © 2025 Walkline Wang <walkline@gmail.com>
 import queue
 import threading
 import time
-import tkinter as tk
-from tkinter import TclError
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
+from iparser.clipboard import ClipboardBackend, TkClipboard
 from iparser.logger import logger
 
+if TYPE_CHECKING:
+	import tkinter as tk
+
 
 class ClipboardMonitor:
 	"""
@@ -19,21 +21,27 @@ class ClipboardMonitor:
 
 	负责监控系统剪贴板内容变化，并在检测到新内容时触发回调函数。
 	使用线程安全的方式实现，避免CPU占用过高。
+
+	剪贴板通过后端（iparser.clipboard.ClipboardBackend）访问。提供了根窗口时，
+	回调函数通过根窗口的事件队列在主线程中运行；没有根窗口（无界面运行）时，
+	回调函数直接在监听线程中运行。
 	"""
-	def __init__(self, root: tk.Tk,
+	def __init__(self, root: Optional['tk.Tk'],
 		on_clipboard_change: Callable[[str], None],
-		poll_interval: float = 0.3):
+		poll_interval: float = 0.3, backend: Optional[ClipboardBackend] = None):
 		"""
 		初始化剪贴板监听器
 
 		Args:
+			root: tkinter根窗口，无界面运行时为None
 			on_clipboard_change: 剪贴板内容变化时的回调函数
-			poll_interval: 轮询间隔，单位为秒，默认0.5秒
-			root: tkinter根窗口，优先使用已有的根窗口
+			poll_interval: 轮询间隔，单位为秒，默认0.3秒
+			backend: 剪贴板后端，默认使用根窗口的tkinter剪贴板
 		"""
-		assert root is not None, 'root不能为空'
+		assert root is not None or backend is not None, 'root和backend不能同时为空'
 
 		self.__root = root
+		self.__backend = backend or TkClipboard(root)
 		self.__on_clipboard_change = on_clipboard_change
 		self._poll_interval = poll_interval
 		self.__running = False
@@ -63,7 +71,7 @@ class ClipboardMonitor:
 			if self.__thread is None or not self.__thread.is_alive():
 				self.__thread = threading.Thread(target=self.monitor_loop, daemon=True)
 				self.__thread.start()
-				logger.debug('剪贴板监听已启动')
+				logger.debug(f'剪贴板监听已启动（{self.__backend.name}）')
 
 			return True
 
@@ -74,43 +82,28 @@ class ClipboardMonitor:
 				return False
 
 			self.__running = False
-			if self.__thread:
-				self.__thread.join(timeout=1.0)
-				self.__thread = None
-				logger.debug('剪贴板监听已停止')
+			thread = self.__thread
+			self.__thread = None
 
-			return True
+		# 在锁外等待，监听线程中的回调函数可能需要获取锁
+		if thread and thread is not threading.current_thread():
+			thread.join(timeout=1.0)
+			logger.debug('剪贴板监听已停止')
+
+		return True
 
-	def get_clipboard(self) -> Optional[str | None]:
+	def get_clipboard(self) -> Optional[str]:
 		"""
 		获取当前剪贴板内容
 
 		Returns:
 			剪贴板文本内容，如果获取失败返回None
 		"""
-		if threading.current_thread() is threading.main_thread():
-			try:
-				return self.__root.clipboard_get()
-			except TclError:
-				# 剪贴板内容不是文本或为空
-				return None
-			except Exception as e:
-				logger.error(f'获取剪贴板内容失败：{str(e)}')
-				return None
-		else:
-			# 在非主线程中，创建临时的Tk实例
-			try:
-				temp_root = tk.Tk()
-				temp_root.withdraw()
-				content = temp_root.clipboard_get()
-				temp_root.destroy()
-				return content
-			except TclError:
-				# 剪贴板内容不是文本或为空
-				return None
-			except Exception as e:
-				logger.error(f'获取剪贴板内容失败：{str(e)}')
-				return None
+		try:
+			return self.__backend.get()
+		except Exception as e:
+			logger.error(f'获取剪贴板内容失败：{str(e)}')
+			return None
 
 	def set_clipboard(self, content: str):
 		"""
@@ -119,57 +112,41 @@ class ClipboardMonitor:
 		Args:
 			content: 要设置的剪贴板内容
 		"""
-		if threading.current_thread() is threading.main_thread():
-			try:
-				self.__root.clipboard_clear()
-				self.__root.clipboard_append(content)
-				self.__root.update() # 确保剪贴板更新立即生效
-			except Exception as e:
-				logger.error(f'设置剪贴板内容失败：{str(e)}')
-		else:
-			# 在非主线程中，创建临时的Tk实例
-			try:
-				temp_root = tk.Tk()
-				temp_root.withdraw()
-				temp_root.clipboard_clear()
-				temp_root.clipboard_append(content)
-				temp_root.update()
-				temp_root.destroy()
-			except Exception as e:
-				logger.error(f'设置剪贴板内容失败：{str(e)}')
+		try:
+			self.__backend.set(content)
+		except Exception as e:
+			logger.error(f'设置剪贴板内容失败：{str(e)}')
 
 	def clear_clipboard(self):
 		"""清除剪贴板内容"""
-		if threading.current_thread() is threading.main_thread():
-			try:
-				self.__root.clipboard_clear()
-				self.__root.update()  # 确保剪贴板更新立即生效
-			except Exception as e:
-				logger.error(f'清除剪贴板内容失败：{str(e)}')
-		else:
-			# 在非主线程中，创建临时的Tk实例
-			try:
-				temp_root = tk.Tk()
-				temp_root.withdraw()
-				temp_root.clipboard_clear()
-				temp_root.update()
-				temp_root.destroy()
-			except Exception as e:
-				logger.error(f'清除剪贴板内容失败：{str(e)}')
+		try:
+			self.__backend.clear()
+		except Exception as e:
+			logger.error(f'清除剪贴板内容失败：{str(e)}')
+
+	def poll(self):
+		"""检查一次剪贴板内容，内容变化时放入队列，并通知主线程处理"""
+		content = self.get_clipboard()
+		dispatch = False
+
+		# 检查内容是否变化且不为空
+		with self.__lock:
+			if content and content != self.__last_parsed:
+				self.__queue.put(content)
+
+				if hasattr(self.__root, 'after_idle'):
+					self.__root.after_idle(self.process_queue)
+				else:
+					dispatch = True
+
+		if dispatch:
+			self.process_queue()
 
 	def monitor_loop(self):
 		"""剪贴板监听主循环"""
 		while self.__running:
 			try:
-				content = self.get_clipboard()
-
-				# 检查内容是否变化且不为空
-				with self.__lock:
-					if content and content != self.__last_parsed:
-						self.__queue.put(content)
-
-						if hasattr(self.__root, 'after_idle'):
-							self.__root.after_idle(self.process_queue)
+				self.poll()
 			except Exception as e:
 				logger.error(f'监听剪贴板时出错：{str(e)}')
 			finally:
@@ -186,6 +163,11 @@ class ClipboardMonitor:
 			finally:
 				self.__queue.task_done()
 
+	@property
+	def backend(self) -> ClipboardBackend:
+		"""获取剪贴板后端"""
+		return self.__backend
+
 	@property
 	def last_parsed(self) -> str:
 		"""获取/设置上次解析的内容"""
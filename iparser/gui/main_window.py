@@ -4,13 +4,21 @@ The MIT License (MIT)
 Copyright © 2025 Walkline Wang <walkline@gmail.com>
 """
 import json
+import threading
+import time
 import tkinter as tk
 from pathlib import Path
-from tkinter import messagebox, scrolledtext, ttk
-from typing import List
+from tkinter import filedialog, messagebox, scrolledtext, ttk
+from typing import List, Optional
 
 from iparser.__init__ import __version__
 from iparser.api.applicant import Applicant
+from iparser.api.guard import (TimeBudgetExceeded, is_oversized, looks_like_applicant,
+	truncate)
+from iparser.api.ruleset import get_ruleset
+from iparser.batch.cache import PersistentParseCache, open_parse_cache
+from iparser.batch.engine import parse_pasted_lines
+from iparser.batch.files import SUPPORTED_SUFFIXES, FileParseJob, ParseCancelled
 from iparser.config import config
 from iparser.gui.clipboard_monitor import ClipboardMonitor
 from iparser.logger import logger
@@ -45,16 +53,59 @@ class MainWindow:
 		# 初始化剪贴板监控器
 		self.__clipboard_monitor = ClipboardMonitor(self.__root, self.on_clipboard_change)
 
+		# 持久化解析缓存，批量解析时使用
+		self.__parse_cache: Optional[PersistentParseCache] = None
+
+		# 正在解析的表格文件的取消事件，没有正在解析的文件时为None
+		self.__file_cancel: Optional[threading.Event] = None
+
 		# 创建自定义样式，为只读输入框设置灰色背景
 		style = ttk.Style()
 		style.configure('readonly.TEntry', fieldbackground='#000000')
 
 		self.create_ui()
 		self.load_custom_config()
+		self.load_institution_cache()
+		self.open_parse_cache()
 		self.setup_layout()
+		self.setup_drop_target()
 
 		self.toggle_monitoring() # 自动开启剪贴板监听
 
+	@classmethod
+	def headless(cls, root, original_entry, split_entry, result_entry,
+		parse_cache: Optional[PersistentParseCache] = None) -> 'MainWindow':
+		"""
+		创建不构建界面的主窗口，只初始化剪贴板事件路径用到的属性
+
+		用于浸泡测试等不显示界面的场景，不读取配置文件，也不自动开启剪贴板监听。
+
+		Args:
+			root: tkinter根窗口，或实现了剪贴板和 after_idle 方法的替代对象
+			original_entry: 原始内容输入框
+			split_entry: 分割结果输入框
+			result_entry: 解析结果输入框
+			parse_cache: 持久化解析缓存，批量解析时使用
+
+		Returns:
+			MainWindow: 主窗口
+		"""
+		window = cls.__new__(cls)
+		window.__root = root
+		window.__parse_cache = parse_cache
+		window.__file_cancel = None
+		window.__clipboard_monitor = ClipboardMonitor(root, window.on_clipboard_change)
+		window.original_entry = original_entry
+		window.split_entry = split_entry
+		window.result_entry = result_entry
+
+		return window
+
+	@property
+	def clipboard_monitor(self) -> ClipboardMonitor:
+		"""剪贴板监控器"""
+		return self.__clipboard_monitor
+
 	# region UI related
 	def create_ui(self):
 		"""创建用户界面组件"""
@@ -79,6 +130,15 @@ class MainWindow:
 		)
 		self.monitor_button.pack(side=tk.LEFT, padx=5)
 
+		# 打开文件按钮，解析文件时用于取消
+		self.file_button = ttk.Button(
+			control_frame,
+			text='打开文件',
+			command=self.open_file,
+			width=8
+		)
+		self.file_button.pack(side=tk.LEFT, padx=5)
+
 		# 配置显示切换按钮
 		self.config_toggle_button = ttk.Button(
 			control_frame,
@@ -88,6 +148,10 @@ class MainWindow:
 		)
 		self.config_toggle_button.pack(side=tk.RIGHT, padx=5)
 
+		# 文件解析进度条，只在解析文件时显示
+		self.progress_bar = ttk.Progressbar(control_frame, mode='determinate',
+			maximum=1.0)
+
 	def create_display_area(self):
 		"""创建内容显示区域，包含原始内容、拆分结果和解析结果输入框"""
 		display_frame = ttk.LabelFrame(self.main_frame, text='内容显示', padding='5')
@@ -182,6 +246,17 @@ class MainWindow:
 			self.config_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
 		else:
 			self.config_frame.pack_forget()
+
+	def setup_drop_target(self):
+		"""安装了tkinterdnd2时，允许将文件拖放到窗口中解析"""
+		if not hasattr(self.__root, 'drop_target_register'):
+			return
+
+		try:
+			self.__root.drop_target_register('DND_Files')
+			self.__root.dnd_bind('<<Drop>>', self.on_drop)
+		except Exception as e:
+			logger.error(f'注册文件拖放失败：{str(e)}')
 	# endregion UI related
 
 	def toggle_monitoring(self):
@@ -331,8 +406,49 @@ class MainWindow:
 		except Exception as e:
 			messagebox.showerror('错误', f'刷新配置失败：{str(e)}')
 			logger.error(f'刷新配置失败：{str(e)}')
+
+	def load_institution_cache(self):
+		"""从文件加载机构前缀缓存"""
+		if not config.prefix_cache.enabled:
+			return
+
+		try:
+			ruleset = get_ruleset()
+			ruleset.prefix_cache.load(config.prefix_cache.file, ruleset.hash)
+		except Exception as e:
+			logger.error(f'加载机构前缀缓存失败：{str(e)}')
+
+	def save_institution_cache(self):
+		"""保存机构前缀缓存到文件"""
+		if not config.prefix_cache.enabled:
+			return
+
+		try:
+			get_ruleset().prefix_cache.save(config.prefix_cache.file)
+		except Exception as e:
+			logger.error(f'保存机构前缀缓存失败：{str(e)}')
+
+	def open_parse_cache(self):
+		"""打开持久化解析缓存"""
+		try:
+			self.__parse_cache = open_parse_cache()
+		except Exception as e:
+			logger.error(f'打开持久化解析缓存失败：{str(e)}')
 	# endregion Custom config file related
 
+	def set_readonly_entry(self, entry: ttk.Entry, content: str):
+		"""
+		设置只读输入框的内容
+
+		Args:
+			entry: 只读输入框
+			content: 要显示的内容
+		"""
+		entry.config(state='normal', style='TEntry')
+		entry.delete(0, tk.END)
+		entry.insert(0, content)
+		entry.config(state='readonly', style='readonly.TEntry')
+
 	# region Callback related
 	def on_clipboard_change(self, content: str):
 		"""
@@ -341,26 +457,41 @@ class MainWindow:
 		Args:
 			content: 新的剪贴板内容
 		"""
+		# 超长内容（例如整篇文档）直接跳过，避免界面卡死
+		if is_oversized(content):
+			self.skip_content(content, f'内容过长（{len(content)} 字符），已跳过')
+			return
+
 		logger.debug(f'检测到剪贴板变化：{content}')
 
+		# 多行内容（例如从表格中复制的一整列）按批量解析处理
+		lines = content.splitlines()
+		if sum(1 for line in lines if line.strip()) > 1:
+			self.start_batch_parse(content, lines)
+			return
+
+		if not looks_like_applicant(content):
+			self.skip_content(content, '未识别为申请信息，已跳过')
+			return
+
 		# 更新原始内容输入框
-		self.original_entry.config(state='normal', style='TEntry')
-		self.original_entry.delete(0, tk.END)
-		self.original_entry.insert(0, content)
-		self.original_entry.config(state='readonly', style='readonly.TEntry')
+		self.set_readonly_entry(self.original_entry, content)
 
 		# 解析内容
 		try:
-			applicant = Applicant(content)
+			start = time.perf_counter()
+			applicant = Applicant(truncate(content))
 			applicant.parse()
 			result = applicant.full_info
-			split_result = applicant.split_result
+			split_result = ', '.join(applicant.split_result)
+			elapsed = time.perf_counter() - start
+
+			if elapsed > config.input_guard.time_budget:
+				split_result = f'解析用时 {elapsed:.3f} 秒，超出时间预算：{split_result}'
+				logger.warning(f'解析用时 {elapsed:.3f} 秒，超出时间预算：{content}')
 
 			# 更新分割结果输入框
-			self.split_entry.config(state='normal', style='TEntry')
-			self.split_entry.delete(0, tk.END)
-			self.split_entry.insert(0, ', '.join(split_result))
-			self.split_entry.config(state='readonly', style='readonly.TEntry')
+			self.set_readonly_entry(self.split_entry, split_result)
 
 			# 更新解析结果输入框
 			self.result_entry.delete(0, tk.END)
@@ -381,8 +512,220 @@ class MainWindow:
 
 			logger.error(error_msg)
 
+	def start_batch_parse(self, content: str, lines: List[str]):
+		"""
+		在后台线程中批量解析多行剪贴板内容
+
+		Args:
+			content: 剪贴板内容
+			lines: 按行拆分后的剪贴板内容
+		"""
+		# 解析完成前不再重复触发同一内容的解析
+		self.__clipboard_monitor.last_parsed = content
+
+		self.set_readonly_entry(self.original_entry, f'共 {len(lines)} 行')
+		self.set_readonly_entry(self.split_entry, '批量解析中...')
+		self.result_entry.delete(0, tk.END)
+
+		thread = threading.Thread(target=self.batch_parse, args=(lines,), daemon=True)
+		thread.start()
+
+	def batch_parse(self, lines: List[str]):
+		"""
+		批量解析多行内容，在后台线程中运行
+
+		Args:
+			lines: 按行拆分后的剪贴板内容
+		"""
+		start = time.perf_counter()
+
+		try:
+			output, count = parse_pasted_lines(lines, get_ruleset(),
+				config.input_guard.time_budget, self.__parse_cache)
+			elapsed = time.perf_counter() - start
+
+			self.__root.after_idle(self.on_batch_parsed, output, count, elapsed)
+		except TimeBudgetExceeded as e:
+			self.__root.after_idle(self.on_batch_failed,
+				f'超出时间预算（{config.input_guard.time_budget} 秒），'
+				f'已解析 {e.completed}/{e.total} 条，未写回剪贴板')
+		except Exception as e:
+			self.__root.after_idle(self.on_batch_failed, str(e))
+
+	def on_batch_parsed(self, output: str, count: int, elapsed: float):
+		"""
+		批量解析完成后的回调函数，在主线程中运行
+
+		Args:
+			output: 按行拼接的解析结果
+			count: 解析的行数
+			elapsed: 解析用时，单位为秒
+		"""
+		summary = f'已解析 {count} 行，用时 {elapsed:.3f} 秒'
+		self.set_readonly_entry(self.split_entry, summary)
+		self.result_entry.delete(0, tk.END)
+		self.result_entry.insert(0, output.replace('\n', ' | '))
+
+		# 复制解析结果到剪贴板
+		self.__clipboard_monitor.set_clipboard(output)
+		self.__clipboard_monitor.last_parsed = output
+
+		logger.info(f'批量解析成功：{summary}')
+
+	def on_batch_failed(self, error: str):
+		"""
+		批量解析失败后的回调函数，在主线程中运行
+
+		Args:
+			error: 错误信息
+		"""
+		error_msg = f'批量解析失败：{error}'
+		self.set_readonly_entry(self.split_entry, '')
+		self.result_entry.delete(0, tk.END)
+		self.result_entry.insert(0, error_msg)
+
+		logger.error(error_msg)
+
+	def skip_content(self, content: str, reason: str):
+		"""
+		跳过不解析的剪贴板内容，并在界面中提示原因
+
+		Args:
+			content: 剪贴板内容
+			reason: 跳过的原因
+		"""
+		preview = content[:config.input_guard.probe_length]
+		self.set_readonly_entry(self.original_entry, preview)
+		self.set_readonly_entry(self.split_entry, reason)
+		self.result_entry.delete(0, tk.END)
+
+		# 内容不变时不再重复触发
+		self.__clipboard_monitor.last_parsed = content
+
+		logger.info(f'{reason}：{preview}')
+
+	# region File related
+	def open_file(self):
+		"""选择表格文件进行解析，正在解析文件时取消解析"""
+		if self.__file_cancel is not None:
+			self.__file_cancel.set()
+			self.file_button.config(text='取消中...', state='disabled')
+			return
+
+		path = filedialog.askopenfilename(
+			title='选择要解析的文件',
+			filetypes=[
+				('表格文件', ' '.join(f'*{suffix}' for suffix in SUPPORTED_SUFFIXES)),
+				('所有文件', '*.*')]
+		)
+		if path:
+			self.start_file_parse(path)
+
+	def on_drop(self, event):
+		"""
+		文件拖放到窗口时的回调函数，只解析第一个支持的文件
+
+		Args:
+			event: 拖放事件，data为拖放的文件列表
+		"""
+		for path in self.__root.tk.splitlist(event.data):
+			if Path(path).suffix.lower() in SUPPORTED_SUFFIXES:
+				self.start_file_parse(path)
+				return
+
+		self.set_readonly_entry(self.split_entry,
+			f'仅支持 {"、".join(SUPPORTED_SUFFIXES)} 文件')
+
+	def start_file_parse(self, path: str):
+		"""
+		在后台线程中解析表格文件
+
+		Args:
+			path: 文件路径
+		"""
+		if self.__file_cancel is not None:
+			self.set_readonly_entry(self.split_entry, '正在解析其他文件，请稍候')
+			return
+
+		self.__file_cancel = threading.Event()
+		self.file_button.config(text='取消')
+		self.progress_bar['value'] = 0
+		self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+		self.set_readonly_entry(self.original_entry, Path(path).name)
+		self.set_readonly_entry(self.split_entry, '正在读取文件...')
+		self.result_entry.delete(0, tk.END)
+
+		thread = threading.Thread(target=self.file_parse,
+			args=(path, self.__file_cancel), daemon=True)
+		thread.start()
+
+	def file_parse(self, path: str, cancel: threading.Event):
+		"""
+		解析表格文件，在后台线程中运行
+
+		Args:
+			path: 文件路径
+			cancel: 取消事件
+		"""
+		def progress(done: int, total: int, rate: float):
+			self.__root.after_idle(self.on_file_progress, done, total, rate)
+
+		start = time.perf_counter()
+
+		try:
+			job = FileParseJob(path, cache=self.__parse_cache)
+			output = job.run(progress, cancel)
+			elapsed = time.perf_counter() - start
+
+			self.__root.after_idle(self.on_file_finished,
+				f'已解析 {job.rows} 行，用时 {elapsed:.1f} 秒', str(output))
+		except ParseCancelled as e:
+			self.__root.after_idle(self.on_file_finished, str(e), '')
+		except Exception as e:
+			logger.error(f'解析文件失败：{str(e)}')
+			self.__root.after_idle(self.on_file_finished, f'解析文件失败：{str(e)}', '')
+
+	def on_file_progress(self, done: int, total: int, rate: float):
+		"""
+		文件解析进度的回调函数，在主线程中运行
+
+		Args:
+			done: 已解析的行数
+			total: 总行数
+			rate: 每秒解析的行数
+		"""
+		if self.__file_cancel is None:
+			return
+
+		self.progress_bar['value'] = done / total if total else 1.0
+		self.set_readonly_entry(self.split_entry, f'{done}/{total} 行，{rate:.0f} 行/秒')
+
+	def on_file_finished(self, summary: str, output: str):
+		"""
+		文件解析结束后的回调函数，在主线程中运行
+
+		Args:
+			summary: 解析结果摘要或错误信息
+			output: 输出文件路径，解析失败或取消时为空
+		"""
+		self.__file_cancel = None
+		self.file_button.config(text='打开文件', state='normal')
+		self.progress_bar.pack_forget()
+
+		self.set_readonly_entry(self.split_entry, summary)
+		self.result_entry.delete(0, tk.END)
+		self.result_entry.insert(0, output)
+
+		logger.info(f'{summary}：{output}' if output else summary)
+	# endregion File related
+
 	def on_close(self):
 		"""窗口关闭时的处理"""
+		if self.__file_cancel is not None:
+			self.__file_cancel.set()
+
 		self.__clipboard_monitor.stop()
+		self.save_institution_cache()
 		self.__root.destroy()
 	# endregion Callback related
@@ -3,45 +3,156 @@ This file is part of the Info Parser project, https://github.com/walklinewang/in
 The MIT License (MIT)
 Copyright © 2025 Walkline Wang <walkline@gmail.com>
 """
+import atexit
 import logging
+import queue
+import threading
+import time
+from logging.handlers import (QueueHandler, QueueListener, RotatingFileHandler,
+	TimedRotatingFileHandler)
+from typing import Dict, List, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
 
-def setup_logging():
+_listener: Optional[QueueListener] = None
+_handlers: List[logging.Handler] = []
+
+
+class SamplingFilter(logging.Filter):
+	"""
+	调试日志采样过滤器
+
+	同一位置（文件和行号）的调试日志每秒最多记录 rate 条，其余的丢弃，
+	并在该位置下一条被记录的日志后注明省略的条数。INFO及以上级别的日志不受影响。
+	"""
+	def __init__(self, rate: int):
+		"""
+		初始化采样过滤器
+
+		Args:
+			rate: 同一位置每秒最多记录的调试日志条数，为0时不限制
+		"""
+		super().__init__()
+		self.rate = rate
+		self.__lock = threading.Lock()
+		self.__sites: Dict[Tuple[str, int], List[int]] = {}
+
+	def filter(self, record: logging.LogRecord) -> bool:
+		"""判断日志是否需要记录"""
+		if self.rate <= 0 or record.levelno > logging.DEBUG:
+			return True
+
+		key = (record.pathname, record.lineno)
+		second = int(time.monotonic())
+
+		with self.__lock:
+			site = self.__sites.setdefault(key, [second, 0, 0]) # 时间窗口、已记录、已省略
+
+			if site[0] != second:
+				site[0], site[1] = second, 0
+
+			if site[1] >= self.rate:
+				site[2] += 1
+				return False
+
+			site[1] += 1
+			suppressed, site[2] = site[2], 0
+
+		if suppressed:
+			record.msg = f'{record.getMessage()}（已省略同类日志 {suppressed} 条）'
+			record.args = None
+
+		return True
+
+
+def _restart_listener():
+	"""使用当前的处理器重新启动后台日志线程"""
+	global _listener
+
+	if _listener is not None:
+		_listener.stop()
+
+	log_queue = queue.SimpleQueue()
+	_listener = QueueListener(log_queue, *_handlers, respect_handler_level=True)
+	_listener.start()
+
+	return log_queue
+
+def setup_logging(level: str = 'DEBUG', file: str = 'iparser.log',
+	rotation: str = 'size', max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3,
+	when: str = 'midnight', sample_rate: int = 20):
 	"""
 	配置日志系统
 
 	设置日志级别、处理器和格式化器，确保日志能正确写入文件并具有适当的格式。
-	日志级别设为DEBUG，会捕获所有级别的日志信息。
+	日志记录只放入队列，由后台线程写入文件，解析过程不会等待磁盘写入。
+
+	Args:
+		level: 日志级别
+		file: 日志文件路径
+		rotation: 日志轮转方式，size表示按文件大小，time表示按时间
+		max_bytes: 按大小轮转时单个日志文件的最大字节数
+		backup_count: 保留的历史日志文件数量
+		when: 按时间轮转时的轮转周期，参见TimedRotatingFileHandler
+		sample_rate: 同一位置每秒最多记录的调试日志条数，为0时不限制
 
 	Returns:
 		配置好的logger对象
 	"""
-	logger.setLevel(logging.DEBUG)
+	logger.setLevel(level)
 
 	# 清除已有的处理器
-	for handler in logger.handlers:
+	for handler in list(logger.handlers):
 		logger.removeHandler(handler)
 
+	for handler in _handlers:
+		handler.close()
+	_handlers.clear()
+
 	# 创建文件处理器
-	file_handler = logging.FileHandler('iparser.log', encoding='utf-8')
+	if rotation == 'time':
+		file_handler = TimedRotatingFileHandler(file, when=when,
+			backupCount=backup_count, encoding='utf-8')
+	else:
+		file_handler = RotatingFileHandler(file, maxBytes=max_bytes,
+			backupCount=backup_count, encoding='utf-8')
 	file_handler.setLevel(logging.DEBUG)
 	file_handler.setFormatter(
 		logging.Formatter('%(asctime)s - %(levelname)s - %(message)s',
 		datefmt='%Y-%m-%d %H:%M:%S')
 	)
-	logger.addHandler(file_handler)
+	_handlers.append(file_handler)
+
+	# 日志记录先经过采样，再放入队列由后台线程写入
+	queue_handler = QueueHandler(_restart_listener())
+	queue_handler.addFilter(SamplingFilter(sample_rate))
+	logger.addHandler(queue_handler)
+
+	return logger
 
 def setup_console_logging():
 	"""配置控制台日志输出"""
 	console_handler = logging.StreamHandler()
 	console_handler.setLevel(logging.INFO)
 	console_handler.setFormatter(logging.Formatter('%(message)s'))
-	logger.addHandler(console_handler)
+	_handlers.append(console_handler)
+
+	for handler in list(logger.handlers):
+		if isinstance(handler, QueueHandler):
+			handler.queue = _restart_listener()
 
 def disable_logging():
 	"""禁用所有日志处理器"""
 	logger.setLevel(logging.CRITICAL)
 
+def shutdown_logging():
+	"""停止后台日志线程，并写入队列中剩余的日志"""
+	global _listener
+
+	if _listener is not None:
+		_listener.stop()
+		_listener = None
+
 setup_logging()
+atexit.register(shutdown_logging)
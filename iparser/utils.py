@@ -28,32 +28,19 @@ def update_jieba_keywords():
 	"""
 	更新Jieba分词器配置
 
-	将机构后缀和特殊机构名称添加到分词器中，并移除需要排除的关键词，
-	以提高机构名称和人名识别的准确性。
+	根据当前配置编译新的解析规则并发布，以提高机构名称和人名识别的准确性。
+	每个解析规则拥有独立的分词器实例，发布后不再修改，不会影响正在进行的解析。
 
 	操作包括：
 	- 将特殊机构名称合并到机构后缀集合中
 	- 为所有机构关键词设置分词频率
 	- 删除需要排除的关键词
+	- 解析规则变化时使用新的机构前缀缓存
 	"""
+	from iparser.api.ruleset import compile_ruleset, publish_ruleset
 	from iparser.config import config
 
 
 	logger.debug('开始更新Jieba分词器配置...')
-	logger.debug(f'  当前机构关键词总数（含简称）：{len(config.institution.all_suffixes)}')
-
-	# 添加机构关键词到分词器
-	added_count = 0
-	for keyword in config.institution.all_suffixes:
-		jieba.add_word(keyword)
-		jieba.suggest_freq(keyword, True)
-		added_count += 1
-	logger.debug(f'  已添加 {added_count} 个机构关键词到分词器')
-
-	# 删除干扰关键词
-	deleted_count = 0
-	for keyword in set(config.institution.excluded_keywords):
-		jieba.del_word(keyword)
-		deleted_count += 1
-	logger.debug(f'  已删除 {deleted_count} 个干扰关键词')
+	publish_ruleset(compile_ruleset(config))
 	logger.debug('Jieba分词器配置更新完成')
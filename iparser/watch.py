@@ -0,0 +1,220 @@
+"""
+This file is part of the Info Parser project, https://github.com/walklinewang/info-parser
+The MIT License (MIT)
+Copyright © 2025 Walkline Wang <walkline@gmail.com>
+
+无界面剪贴板守护进程
+
+此模块在没有GUI的情况下运行“监听剪贴板 → 解析 → 写回剪贴板”的循环，
+解析规则与GUI相同：超长内容和不像申请信息的内容跳过，多行内容逐行解析后按原来的
+行顺序写回。每次写回都会记录从检测到剪贴板变化到写回完成的延迟。
+
+使用示例：
+
+from iparser.clipboard import create_backend
+from iparser.watch import ClipboardWatcher
+
+
+watcher = ClipboardWatcher(create_backend('auto'))
+watcher.run()    # 按 Ctrl+C 停止
+print(watcher.latency)
+"""
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from iparser.api.applicant import Applicant
+from iparser.api.guard import is_oversized, looks_like_applicant, truncate
+from iparser.api.ruleset import Ruleset, get_ruleset
+from iparser.batch.cache import PersistentParseCache
+from iparser.batch.engine import parse_pasted_lines
+from iparser.clipboard import ClipboardBackend
+from iparser.gui.clipboard_monitor import ClipboardMonitor
+from iparser.logger import logger
+
+
+class LatencyStats:
+	"""
+	写回延迟统计类
+
+	只保留最近的若干次延迟，用于计算分位数。
+
+	Attributes:
+		count: 写回总次数
+	"""
+	def __init__(self, window: int = 10000):
+		"""
+		初始化写回延迟统计
+
+		Args:
+			window: 计算分位数时使用的最近延迟数量
+		"""
+		self.count = 0
+		self.__lock = threading.Lock()
+		self.__samples: Deque[float] = deque(maxlen=window)
+
+	def __str__(self):
+		"""返回统计信息字符串"""
+		if not self.count:
+			return '尚未写回剪贴板'
+
+		summary = self.summary()
+		return f'写回 {self.count} 次，延迟 p50 {summary["p50"] * 1000:.1f} ms，' \
+			f'p95 {summary["p95"] * 1000:.1f} ms，最大 {summary["max"] * 1000:.1f} ms'
+
+	def record(self, latency: float):
+		"""
+		记录一次写回延迟
+
+		Args:
+			latency: 延迟，单位为秒
+		"""
+		with self.__lock:
+			self.count += 1
+			self.__samples.append(latency)
+
+	def summary(self) -> dict:
+		"""
+		获取最近延迟的统计数据
+
+		Returns:
+			dict: 平均值（mean）、中位数（p50）、95分位数（p95）和最大值（max），单位为秒
+		"""
+		with self.__lock:
+			samples = sorted(self.__samples)
+
+		if not samples:
+			return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+
+		return {
+			'mean': statistics.fmean(samples),
+			'p50': samples[len(samples) // 2],
+			'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+			'max': samples[-1],
+		}
+
+
+class ClipboardWatcher:
+	"""
+	无界面剪贴板守护类
+
+	Attributes:
+		latency: 从检测到剪贴板变化到写回完成的延迟统计
+		skipped: 跳过的剪贴板内容数量
+	"""
+	def __init__(self, backend: ClipboardBackend, ruleset: Optional[Ruleset] = None,
+		poll_interval: float = 0.1, cache: Optional[PersistentParseCache] = None):
+		"""
+		初始化剪贴板守护
+
+		Args:
+			backend: 剪贴板后端，必须可以在非主线程中使用
+			ruleset: 解析规则，默认使用每次解析时当前发布的解析规则
+			poll_interval: 轮询间隔，单位为秒
+			cache: 持久化解析缓存，解析多行内容时使用
+		"""
+		self.latency = LatencyStats()
+		self.skipped = 0
+		self.__ruleset = ruleset
+		self.__cache = cache
+		self.__stopped = threading.Event()
+		self.__monitor = ClipboardMonitor(None, self.on_clipboard_change, poll_interval,
+			backend)
+
+	def parse(self, content: str) -> Optional[str]:
+		"""
+		按GUI的规则解析剪贴板内容
+
+		Args:
+			content: 剪贴板内容
+
+		Returns:
+			Optional[str]: 要写回剪贴板的内容，跳过时返回None
+		"""
+		ruleset = self.__ruleset or get_ruleset()
+
+		if is_oversized(content):
+			logger.info(f'内容过长（{len(content)} 字符），已跳过')
+			return None
+
+		lines = content.splitlines()
+		if sum(1 for line in lines if line.strip()) > 1:
+			output, _ = parse_pasted_lines(lines, ruleset,
+				ruleset.config.input_guard.time_budget, self.__cache)
+			return output
+
+		if not looks_like_applicant(content, ruleset):
+			logger.info(f'未识别为申请信息，已跳过：{content[:50]}')
+			return None
+
+		applicant = Applicant(truncate(content), ruleset)
+		applicant.parse()
+
+		return applicant.full_info
+
+	def on_clipboard_change(self, content: str):
+		"""
+		剪贴板内容变化时的回调函数，在监听线程中运行
+
+		Args:
+			content: 新的剪贴板内容
+		"""
+		detected = time.perf_counter()
+
+		try:
+			output = self.parse(content)
+		except Exception as e:
+			logger.error(f'解析失败：{str(e)}')
+			output = None
+
+		if output is None:
+			# 内容不变时不再重复触发
+			self.skipped += 1
+			self.__monitor.last_parsed = content
+			return
+
+		self.__monitor.last_parsed = output
+		self.__monitor.set_clipboard(output)
+		self.latency.record(time.perf_counter() - detected)
+
+		logger.info(f'解析成功：{output}')
+
+	def start(self):
+		"""在后台线程中开始监听剪贴板"""
+		self.__stopped.clear()
+		self.__monitor.start()
+
+	def stop(self):
+		"""停止监听剪贴板"""
+		self.__monitor.stop()
+		self.__stopped.set()
+
+	def run(self, duration: Optional[float] = None,
+		report_interval: Optional[float] = None):
+		"""
+		监听剪贴板直到调用stop()、超过运行时长或按Ctrl+C
+
+		Args:
+			duration: 运行时长，单位为秒，为None时一直运行
+			report_interval: 定期记录延迟统计的间隔，单位为秒，为None时不记录
+		"""
+		deadline = time.monotonic() + duration if duration is not None else None
+		self.start()
+		logger.info(f'剪贴板守护已启动（{self.__monitor.backend.name}）')
+
+		try:
+			while not self.__stopped.is_set():
+				timeout = report_interval
+				if deadline is not None:
+					remaining = deadline - time.monotonic()
+					if remaining <= 0:
+						break
+					timeout = remaining if timeout is None else min(timeout, remaining)
+
+				if not self.__stopped.wait(timeout) and report_interval is not None:
+					logger.info(f'剪贴板守护运行中：{self.latency}')
+		finally:
+			self.stop()
+			logger.info(f'剪贴板守护已停止：{self.latency}，跳过 {self.skipped} 次')
@@ -0,0 +1,155 @@
+"""
+机构名称规范化测试
+
+此模块测试编辑距离、BK树、别名和模糊匹配，以及启用规范化后解析器的结果。
+"""
+import pytest
+
+from iparser.api.applicant import Applicant
+from iparser.api.canonical import BKTree, InstitutionCanonicalizer, edit_distance
+from iparser.api.pipeline import default_pipeline
+from iparser.api.ruleset import compile_ruleset
+from iparser.config import Profile, config
+
+
+NAMES = ['河北工业大学', '河南工业大学', '河南科技职业大学', '白城师范学院', '吉林财经大学',
+	'天津理工大学']
+
+
+@pytest.fixture(scope='module')
+def canonical_ruleset():
+	"""配置了机构别名和规范名称的解析规则"""
+	return compile_ruleset(config.model_copy(update={
+		'institution': config.institution.model_copy(update={
+			'aliases': {'河工大': '河北工业大学', '河北工大': '河北工业大学'},
+			'canonical_names': {'河南工业大学', '河南科技职业大学'},
+		}),
+	}))
+
+
+class TestEditDistance:
+	"""编辑距离和BK树测试类"""
+
+	@pytest.mark.parametrize('first, second, distance', [
+		('', '', 0),
+		('河北工业大学', '河北工业大学', 0),
+		('河北工业大学', '河北工业大雪', 1),
+		('河北工业大学', '河北工大', 2),
+		('', '吉财', 2),
+	])
+	def test_edit_distance(self, first, second, distance):
+		"""测试编辑距离"""
+		assert edit_distance(first, second) == distance
+		assert edit_distance(second, first) == distance
+		assert edit_distance(first, second, 0) == min(distance, 1)
+
+	def test_bk_tree(self):
+		"""测试BK树的查找结果与逐个计算编辑距离相同"""
+		tree = BKTree(NAMES + ['河北工业大学'])
+		assert len(tree) == len(NAMES)
+
+		for word in ['河北工业大雪', '河南工大', '天津理工学院', '郑州大学']:
+			for max_distance in range(4):
+				assert tree.search(word, max_distance) == sorted(
+					(edit_distance(word, name), name) for name in NAMES
+					if edit_distance(word, name) <= max_distance)
+
+
+class TestCanonicalizer:
+	"""机构名称规范化测试类"""
+
+	@pytest.fixture
+	def canonicalizer(self):
+		"""使用示例别名和规范名称的机构名称规范化"""
+		return InstitutionCanonicalizer({'河工大': '河北工业大学', '吉财': '吉林财经大学'}, NAMES)
+
+	@pytest.mark.parametrize('institution, canonical', [
+		('河工大', '河北工业大学'),             # 别名
+		('河北工业大学', '河北工业大学'),       # 规范名称
+		('河北工业大雪', '河北工业大学'),       # 错别字
+		('河南科技职业大雪', '河南科技职业大学'),
+		('河北工大', '河北工业大学'),           # 简称
+		('白城师院', '白城师范学院'),
+		('河南工大', '河南工业大学'),
+		('天津理工学院', '天津理工学院'),       # 只差一个字的不同机构
+		('河大', '河大'),                       # 覆盖的字数太少
+		('河南大学', '河南大学'),               # 完整的机构名称，不是河南工业大学的简称
+		('河北大学', '河北大学'),
+		('河南科技大学', '河南科技大学'),
+		('河工业大学', '河工业大学'),           # 河北、河南工业大学同样接近
+		('郑州大学', '郑州大学'),               # 没有对应的规范名称
+	])
+	def test_canonicalize(self, canonicalizer, institution, canonical):
+		"""测试别名、错别字和简称的规范化"""
+		assert canonicalizer.canonicalize(institution) == canonical
+		# 第二次从缓存中取得相同的结果
+		assert canonicalizer.canonicalize(institution) == canonical
+
+	def test_ambiguous_abbreviation(self):
+		"""测试多个规范名称都可能以该名称为简称时不做映射"""
+		canonicalizer = InstitutionCanonicalizer({}, ['河南工业大学', '河南工商大学', '河北工业大学'])
+
+		assert canonicalizer.canonicalize('河南工大') == '河南工大'
+		assert canonicalizer.canonicalize('河北工大') == '河北工业大学'
+		assert canonicalizer.canonicalize('河南大学') == '河南大学'
+
+	def test_short_typo_uses_bk_tree(self):
+		"""测试双字筛选失效时使用BK树查找"""
+		canonicalizer = InstitutionCanonicalizer({}, ['学学学学学学'])
+		assert canonicalizer.canonicalize('学学学学学') == '学学学学学学'
+
+	def test_aliases_only(self):
+		"""测试模糊匹配距离为0时只使用别名"""
+		canonicalizer = InstitutionCanonicalizer({'河工大': '河北工业大学'}, NAMES, 0)
+
+		assert canonicalizer.canonicalize('河工大') == '河北工业大学'
+		assert canonicalizer.canonicalize('河北工业大雪') == '河北工业大雪'
+		assert not InstitutionCanonicalizer({})
+
+
+class TestApplicantCanonical:
+	"""启用规范化后的解析器测试类"""
+
+	@pytest.mark.parametrize('info, institution, name, is_teacher', [
+		('河工大-张三', '河北工业大学', '张三', False),
+		('河北工大张三（教师）', '河北工业大学', '张三', True),
+		('河北工业大学 李四', '河北工业大学', '李四', False),
+		('河南工大赵六', '河南工业大学', '赵六', False),
+		('黄淮学院-赵佳', '黄淮学院', '赵佳', False),
+	])
+	def test_parse(self, canonical_ruleset, info, institution, name, is_teacher):
+		"""测试解析结果中的机构名称被映射为规范名称"""
+		applicant = Applicant(info, canonical_ruleset)
+		applicant.parse()
+
+		assert (applicant.institution, applicant.name, applicant.is_teacher) == \
+			(institution, name, is_teacher)
+
+	def test_matches_pipeline(self, canonical_ruleset, samples_normal):
+		"""测试默认流水线同样进行规范化，解析结果与 Applicant 一致"""
+		lines = ['河工大-张三', '河北工大张三（教师）', '河南工大赵六',
+			*(case['input'] for case in samples_normal)]
+
+		for line, record in zip(lines, default_pipeline(canonical_ruleset)(lines)):
+			applicant = Applicant(line, canonical_ruleset)
+			applicant.parse()
+
+			assert (record.institution, record.name, record.is_teacher,
+				record.full_info) == (applicant.institution, applicant.name,
+				applicant.is_teacher, applicant.full_info)
+
+	def test_split_result_keeps_variant(self, canonical_ruleset):
+		"""测试分词结果保持原来的写法"""
+		applicant = Applicant('河工大-张三', canonical_ruleset)
+		applicant.parse()
+
+		assert applicant.split_result[0] == '河工大'
+
+	def test_profile_aliases(self):
+		"""测试配置档案追加的别名"""
+		snapshot = Profile(aliases={'郑大': '郑州大学'}).apply(config)
+		ruleset = compile_ruleset(snapshot)
+
+		assert '郑大' in ruleset.shortened_names
+		assert ruleset.canonicalizer.canonicalize('郑大') == '郑州大学'
+		assert snapshot.ruleset_hash != config.ruleset_hash
@@ -0,0 +1,123 @@
+"""
+剪贴板后端和无界面剪贴板守护测试
+
+此模块测试内存剪贴板、系统剪贴板命令后端、不依赖根窗口的剪贴板监听，
+以及守护进程的解析、写回和延迟统计。
+"""
+import sys
+
+import pytest
+
+from iparser.clipboard import CommandClipboard, MemoryClipboard, create_backend
+from iparser.gui.clipboard_monitor import ClipboardMonitor
+from iparser.watch import ClipboardWatcher, LatencyStats
+
+
+@pytest.fixture
+def file_clipboard(tmp_path, monkeypatch):
+	"""以文件模拟系统剪贴板的命令后端"""
+	path = tmp_path / 'clipboard.txt'
+	read = (f'import sys, pathlib; p = pathlib.Path({str(path)!r}); '
+		'sys.exit(1) if not p.exists() else sys.stdout.buffer.write(p.read_bytes())')
+	write = (f'import sys, pathlib; '
+		f'pathlib.Path({str(path)!r}).write_bytes(sys.stdin.buffer.read())')
+
+	monkeypatch.setitem(CommandClipboard.COMMANDS, 'file', (
+		[sys.executable, '-c', read], [sys.executable, '-c', write], None))
+
+	return CommandClipboard('file')
+
+
+class TestClipboardBackends:
+	"""剪贴板后端测试类"""
+
+	def test_memory(self):
+		"""测试内存剪贴板"""
+		backend = MemoryClipboard()
+		assert backend.get() is None
+
+		backend.set('河南工学院-郭自强（教师）')
+		assert backend.get() == '河南工学院-郭自强（教师）'
+		assert [content for _, content in backend.history] == ['河南工学院-郭自强（教师）']
+
+		backend.clear()
+		assert backend.get() is None
+
+	def test_command(self, file_clipboard):
+		"""测试系统剪贴板命令后端"""
+		assert file_clipboard.get() is None
+
+		file_clipboard.set('黄淮学院—潘豫皖')
+		assert file_clipboard.get() == '黄淮学院—潘豫皖'
+
+		file_clipboard.clear()
+		assert file_clipboard.get() is None
+
+	def test_create_backend(self, monkeypatch):
+		"""测试创建后端"""
+		assert isinstance(create_backend('memory'), MemoryClipboard)
+
+		with pytest.raises(ValueError):
+			create_backend('tk')
+		with pytest.raises(ValueError):
+			create_backend('clipboard.exe')
+
+		monkeypatch.delenv('DISPLAY', raising=False)
+		monkeypatch.delenv('WAYLAND_DISPLAY', raising=False)
+		monkeypatch.setattr(sys, 'platform', 'linux')
+		with pytest.raises(ValueError):
+			create_backend('auto')
+
+	def test_monitor_without_root(self):
+		"""测试没有根窗口时在监听线程中直接运行回调函数"""
+		backend = MemoryClipboard('新乡学院-赵学敏-学生')
+		changes = []
+		monitor = ClipboardMonitor(None, changes.append, backend=backend)
+
+		monitor.poll()
+		assert changes == ['新乡学院-赵学敏-学生']
+
+
+class TestClipboardWatcher:
+	"""无界面剪贴板守护测试类"""
+
+	def test_parse(self):
+		"""测试按GUI的规则解析剪贴板内容"""
+		watcher = ClipboardWatcher(MemoryClipboard())
+
+		assert watcher.parse('新乡学院丶王化学生') == '新乡学院-王化'
+		assert watcher.parse('https://example.com') is None
+		assert watcher.parse('黄淮学院—潘豫皖\n\n河南工学院-郭自强（教师）') == \
+			'黄淮学院-潘豫皖\n\n河南工学院-郭自强（教师）'
+
+	def test_write_back(self):
+		"""测试监听、解析、写回的循环和延迟统计"""
+		backend = MemoryClipboard()
+		watcher = ClipboardWatcher(backend, poll_interval=0.01)
+		watcher.start()
+
+		try:
+			backend.set('河南科技职业大学杨怡宁')
+			assert backend.wait_for('河南科技职业大学-杨怡宁', timeout=5)
+
+			backend.set('今天下午三点开会')
+			backend.set('新乡学院 汤唯鑫(学生)')
+			assert backend.wait_for('新乡学院-汤唯鑫', timeout=5)
+		finally:
+			watcher.stop()
+
+		assert watcher.latency.count == 2
+		assert 0 < watcher.latency.summary()['max'] < 5
+
+	def test_latency_stats(self):
+		"""测试延迟统计"""
+		stats = LatencyStats(window=100)
+		assert str(stats) == '尚未写回剪贴板'
+
+		for latency in range(1, 201):
+			stats.record(latency / 1000)
+
+		summary = stats.summary()
+		assert stats.count == 200
+		assert summary['max'] == 0.2
+		assert summary['p50'] == 0.151
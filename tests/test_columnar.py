@@ -0,0 +1,88 @@
+"""
+列式解析结果存储测试
+
+此模块测试列式解析结果容器的追加、访问、切片和导出功能。
+"""
+import csv
+import io
+import json
+
+import pytest
+
+from iparser.api.applicant import Applicant
+from iparser.batch.columnar import ParseResult, ResultColumns
+
+
+@pytest.fixture
+def columns(samples_normal) -> ResultColumns:
+	"""由普通样本解析得到的列式解析结果"""
+	results = ResultColumns()
+	for case in samples_normal:
+		applicant = Applicant(case['input'])
+		applicant.parse()
+		results.append_applicant(applicant)
+
+	return results
+
+
+class TestColumnar:
+	"""列式解析结果存储测试类"""
+
+	def test_access(self, columns, samples_normal):
+		"""测试按下标访问和迭代的结果与申请人对象一致"""
+		assert len(columns) == len(samples_normal)
+
+		for case, result in zip(samples_normal, columns):
+			applicant = Applicant(case['input'])
+			applicant.parse()
+
+			assert result == ParseResult(applicant.info, applicant.institution,
+				applicant.name, applicant.is_teacher, applicant.full_info)
+
+		assert columns[-1] == list(columns)[-1]
+
+	def test_interned_institutions(self, columns):
+		"""测试机构名称去重保存为编码"""
+		assert len(columns.institutions) == len(set(columns.institutions))
+		assert len(columns.institutions) <= len(columns)
+		assert sum(columns.institution_counts().values()) == len(columns)
+
+	def test_slice(self, columns):
+		"""测试切片生成新的列式解析结果容器"""
+		part = columns[2:5]
+
+		assert isinstance(part, ResultColumns)
+		assert list(part) == list(columns)[2:5]
+		assert len(columns[5:2]) == 0
+
+		with pytest.raises(ValueError):
+			columns[::2]
+
+	def test_export(self, columns):
+		"""测试导出为CSV和JSONL"""
+		output = io.StringIO()
+		columns.to_csv(output)
+		rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+
+		assert [row['name'] for row in rows] == columns.names()
+
+		output = io.StringIO()
+		columns.to_jsonl(output)
+		records = [json.loads(line) for line in output.getvalue().splitlines()]
+
+		assert [record['full_info'] for record in records] \
+			== [result.full_info for result in columns]
+
+	def test_arrow(self, columns, tmp_path):
+		"""测试转换为Arrow表格和Parquet文件"""
+		pytest.importorskip('pyarrow')
+		import pyarrow.parquet as pq
+
+
+		table = columns.to_arrow()
+		assert table.column('name').to_pylist() == columns.names()
+		assert table.column('institution').to_pylist() \
+			== [result.institution for result in columns]
+
+		columns.write_parquet(tmp_path / 'results.parquet')
+		assert pq.read_table(tmp_path / 'results.parquet').num_rows == len(columns)
@@ -0,0 +1,58 @@
+"""
+并发解析测试
+
+此模块测试在多线程中并发解析，同时刷新解析规则时，解析结果保持正确。
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from iparser.api.applicant import Applicant
+from iparser.api.ruleset import compile_ruleset, get_ruleset, publish_ruleset
+from iparser.config import config
+
+
+def parse_case(case: str):
+	"""解析单个样本并返回结果"""
+	applicant = Applicant(case)
+	applicant.parse()
+
+	return applicant.institution, applicant.name, applicant.is_teacher
+
+
+class TestConcurrency:
+	"""并发解析测试类"""
+
+	def test_ruleset_snapshot(self):
+		"""测试编译后的解析规则不受之后配置修改的影响"""
+		source = config.model_copy(deep=True)
+		ruleset = compile_ruleset(source)
+		source.institution.add_shortened_names({'测试简称'})
+
+		assert '测试简称' not in ruleset.shortened_names
+		assert ruleset.hash != source.ruleset_hash
+
+	def test_threaded_stress(self, samples_normal, samples_others):
+		"""测试多线程并发解析，并在解析期间反复发布新的解析规则"""
+		cases = [case['input'] for case in samples_normal + samples_others]
+		expected = {case: parse_case(case) for case in cases}
+		stop = threading.Event()
+
+		def republish():
+			"""模拟GUI刷新关键词，不断编译并发布新的解析规则"""
+			while not stop.is_set():
+				publish_ruleset(compile_ruleset(config))
+
+		publisher = threading.Thread(target=republish, daemon=True)
+		publisher.start()
+
+		try:
+			with ThreadPoolExecutor(max_workers=8) as executor:
+				results = list(executor.map(parse_case, cases * 200))
+		finally:
+			stop.set()
+			publisher.join()
+
+		for case, result in zip(cases * 200, results):
+			assert result == expected[case]
+
+		assert get_ruleset().hash == config.ruleset_hash
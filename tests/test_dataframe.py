@@ -0,0 +1,46 @@
+"""
+pandas 集成测试
+
+此模块测试按列解析申请信息的结果与逐条解析一致，并保留索引和缺失值。
+"""
+import pytest
+
+from iparser.api.applicant import Applicant
+from iparser.batch import dataframe
+from iparser.batch.dataframe import parse_series, register_accessor
+
+
+class TestDataFrame:
+	"""pandas 集成测试类"""
+
+	def test_parse_series(self, samples_normal):
+		"""测试结果与逐条解析一致，重复值只解析一次，缺失值所在行的结果为缺失值"""
+		pd = pytest.importorskip('pandas')
+
+		lines = [case['input'] for case in samples_normal] * 2 + [None]
+		series = pd.Series(lines, index=[f'row{index}' for index in range(len(lines))])
+		result = parse_series(series)
+
+		assert list(result.columns) == list(dataframe.COLUMNS)
+		assert list(result.index) == list(series.index)
+		assert result['institution'].dtype == 'category'
+
+		for line, (_, row) in zip(lines[:-1], result.iloc[:-1].iterrows()):
+			applicant = Applicant(line)
+			applicant.parse()
+
+			assert row['institution'] == applicant.institution
+			assert row['name'] == applicant.name
+			assert row['is_teacher'] == applicant.is_teacher
+			assert row['full_info'] == applicant.full_info
+
+		assert result.iloc[-1].isna().all()
+
+	def test_accessor(self, samples_normal):
+		"""测试访问器与线程池解析"""
+		pd = pytest.importorskip('pandas')
+
+		register_accessor()
+		series = pd.Series([case['input'] for case in samples_normal])
+
+		assert series.iparser.parse(max_workers=4).equals(parse_series(series))
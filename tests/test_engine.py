@@ -0,0 +1,43 @@
+"""
+批量解析引擎测试
+
+此模块测试批量解析引擎的去重、顺序保持、并发解析和多行剪贴板内容的解析。
+"""
+from iparser.api.applicant import Applicant
+from iparser.batch.engine import parse_lines, parse_pasted_lines, parse_unique
+
+
+class TestEngine:
+	"""批量解析引擎测试类"""
+
+	def test_order_and_duplicates(self, samples_normal):
+		"""测试解析结果按输入顺序保存，重复的申请信息只解析一次"""
+		lines = [case['input'] for case in samples_normal] * 3
+		results = parse_lines(lines)
+
+		assert len(results) == len(lines)
+		assert results.infos() == lines
+
+		for case, result in zip(samples_normal, results):
+			applicant = Applicant(case['input'])
+			applicant.parse()
+
+			assert result.full_info == applicant.full_info
+
+		assert len(parse_unique(lines)) == len(samples_normal)
+
+	def test_thread_pool(self, samples_normal, samples_others):
+		"""测试使用线程池并发解析的结果与单线程一致"""
+		lines = [case['input'] for case in samples_normal + samples_others]
+
+		assert list(parse_lines(lines, max_workers=4)) == list(parse_lines(lines))
+
+	def test_pasted_lines(self):
+		"""测试多行内容按原来的行顺序写回，空行和不像申请信息的行保持原样"""
+		lines = ['河南科技职业大学杨怡宁', '', '  备注  ', '河南工学院-郭自强（教师）']
+		output, count = parse_pasted_lines(lines)
+
+		assert count == 2
+		assert output.split('\n') == [
+			parse_lines([lines[0]])[0].full_info, '', '备注',
+			parse_lines([lines[3]])[0].full_info]
@@ -0,0 +1,141 @@
+"""
+表格文件批量解析测试
+
+此模块测试TXT、CSV和XLSX文件的读取、申请信息列和表头的识别、
+输出文件的内容，以及进度报告和取消。
+"""
+import csv
+import threading
+
+import pytest
+
+from iparser.batch.files import (FileParseJob, ParseCancelled, detect_column,
+	output_path_for, read_table)
+
+
+ROWS = [
+	['序号', '申请信息', '备注'],
+	['1', '河南科技职业大学-杨怡宁', ''],
+	['2', '白城师范学院 刘一晨（教师）', '已审核'],
+	['3', '今天下午三点开会', ''],
+	['4', '黄淮学院-赵佳', ''],
+]
+
+
+def read_csv(path):
+	"""读取输出的CSV文件"""
+	with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+		return list(csv.reader(f))
+
+
+class TestReadTable:
+	"""表格读取测试类"""
+
+	def test_output_path(self):
+		"""测试输出文件路径"""
+		assert output_path_for('data/名单.xlsx').name == '名单.parsed.xlsx'
+		assert output_path_for('data/名单.csv').name == '名单.parsed.csv'
+		assert output_path_for('data/名单.txt').name == '名单.parsed.csv'
+
+	def test_gbk_csv(self, tmp_path):
+		"""测试读取GBK编码的CSV文件"""
+		path = tmp_path / '名单.csv'
+		with open(path, 'w', encoding='gbk', newline='') as f:
+			csv.writer(f).writerows(ROWS)
+
+		assert read_table(path) == ROWS
+
+	def test_unsupported(self, tmp_path):
+		"""测试不支持的文件类型"""
+		path = tmp_path / '名单.doc'
+		path.write_text('河南科技职业大学-杨怡宁', encoding='utf-8')
+
+		with pytest.raises(ValueError):
+			read_table(path)
+
+	def test_detect_column(self):
+		"""测试识别申请信息所在的列和表头"""
+		assert detect_column(ROWS) == (1, True)
+		assert detect_column(ROWS[1:]) == (1, False)
+
+		with pytest.raises(ValueError):
+			detect_column([['序号', '备注'], ['1', '今天下午三点开会']])
+
+
+class TestFileParseJob:
+	"""表格文件批量解析测试类"""
+
+	def test_csv(self, tmp_path):
+		"""测试解析CSV文件，解析结果追加在原有列之后"""
+		path = tmp_path / '名单.csv'
+		with open(path, 'w', encoding='utf-8', newline='') as f:
+			csv.writer(f).writerows(ROWS)
+
+		job = FileParseJob(path)
+		output = job.run()
+		rows = read_csv(output)
+
+		assert output == tmp_path / '名单.parsed.csv'
+		assert (job.column, job.has_header, job.rows) == (1, True, 4)
+		assert rows[0] == ['序号', '申请信息', '备注', 'institution', 'name', 'is_teacher',
+			'full_info']
+		assert rows[1][3:6] == ['河南科技职业大学', '杨怡宁', '0']
+		assert rows[2][2:6] == ['已审核', '白城师范学院', '刘一晨', '1']
+		# 不像申请信息的行保持原样，解析结果为空
+		assert rows[3] == ['3', '今天下午三点开会', '', '', '', '', '']
+
+	def test_txt(self, tmp_path):
+		"""测试解析TXT文件，空行保持原来的位置"""
+		path = tmp_path / '名单.txt'
+		path.write_text('河南科技职业大学-杨怡宁\n\n黄淮学院-赵佳\n', encoding='utf-8')
+
+		rows = read_csv(FileParseJob(path).run())
+
+		assert rows[0] == ['info', 'institution', 'name', 'is_teacher', 'full_info']
+		assert rows[1][:3] == ['河南科技职业大学-杨怡宁', '河南科技职业大学', '杨怡宁']
+		assert rows[2] == ['', '', '', '', '']
+		assert rows[3][1:3] == ['黄淮学院', '赵佳']
+
+	def test_xlsx(self, tmp_path):
+		"""测试解析XLSX文件"""
+		openpyxl = pytest.importorskip('openpyxl')
+
+		path = tmp_path / '名单.xlsx'
+		workbook = openpyxl.Workbook()
+		for row in ROWS:
+			workbook.active.append(row)
+		workbook.save(path)
+
+		output = FileParseJob(path).run()
+		rows = [list(row) for row in
+			openpyxl.load_workbook(output).worksheets[0].iter_rows(values_only=True)]
+
+		assert output.name == '名单.parsed.xlsx'
+		assert rows[0][3:] == ['institution', 'name', 'is_teacher', 'full_info']
+		assert rows[4][3:5] == ['黄淮学院', '赵佳']
+
+	def test_progress(self, tmp_path):
+		"""测试每块完成后报告进度"""
+		path = tmp_path / '名单.txt'
+		path.write_text('河南科技职业大学-杨怡宁\n' * 25, encoding='utf-8')
+		reports = []
+
+		FileParseJob(path, chunk_size=10).run(
+			lambda done, total, rate: reports.append((done, total)))
+
+		assert reports == [(10, 25), (20, 25), (25, 25)]
+
+	def test_cancel(self, tmp_path):
+		"""测试取消解析时不写入输出文件"""
+		path = tmp_path / '名单.txt'
+		path.write_text('河南科技职业大学-杨怡宁\n' * 25, encoding='utf-8')
+		cancel = threading.Event()
+
+		def progress(done, total, rate):
+			cancel.set()
+
+		with pytest.raises(ParseCancelled) as info:
+			FileParseJob(path, chunk_size=10).run(progress, cancel)
+
+		assert (info.value.completed, info.value.total) == (10, 25)
+		assert not output_path_for(path).exists()
@@ -0,0 +1,118 @@
+"""
+标注语料报告测试
+
+此模块用 tests/conftest.py 中的样本作为小型标注语料，测试 tools/golden_report.py 的
+语料读取、错误分类和报告。
+"""
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+from iparser.config import config
+
+
+REPORT_SCRIPT = Path(__file__).parent.parent / 'tools' / 'golden_report.py'
+
+
+@pytest.fixture(scope='module')
+def golden_report():
+	"""加载标注语料报告脚本"""
+	spec = importlib.util.spec_from_file_location('golden_report', REPORT_SCRIPT)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+
+	return module
+
+@pytest.fixture
+def corpus_path(tmp_path, samples_normal, samples_with_secondary_college):
+	"""conftest格式和批量任务输出格式混合的标注语料"""
+	path = tmp_path / 'corpus.jsonl'
+	lines = [json.dumps(sample, ensure_ascii=False)
+		for sample in samples_normal + samples_with_secondary_college]
+	lines.append('')
+	lines.append(json.dumps({'info': '黄淮学院-赵佳（教师）', 'institution': '黄淮学院',
+		'name': '赵佳', 'is_teacher': 'true', 'full_info': ''}, ensure_ascii=False))
+	path.write_text('\n'.join(lines), encoding='utf-8')
+
+	return path
+
+
+class TestGoldenReport:
+	"""标注语料报告测试类"""
+
+	def test_load_corpus(self, golden_report, corpus_path, samples_normal):
+		"""测试读取两种格式的标注语料，跳过空行"""
+		records = golden_report.load_corpus(corpus_path)
+
+		assert records[0].info == samples_normal[0]['input']
+		assert records[-1] == golden_report.GoldenRecord('黄淮学院-赵佳（教师）', '黄淮学院',
+			'赵佳', True)
+
+	@pytest.mark.parametrize('line', ['{"input": "黄淮学院赵佳"}',
+		'{"input": " ", "expected": '
+		'{"institution": "", "name": "", "is_teacher": false}}', '不是JSON'])
+	def test_invalid_corpus(self, golden_report, tmp_path, line):
+		"""测试无效的标注语料"""
+		path = tmp_path / 'invalid.jsonl'
+		path.write_text(line, encoding='utf-8')
+
+		with pytest.raises(ValueError, match='第 1 行'):
+			golden_report.load_corpus(path)
+
+	@pytest.mark.parametrize('parsed, categories', [
+		(('河南财经政法大学', '侯小娟', False), []),
+		((config.institution.default_name, '侯小娟', False), ['机构：未识别']),
+		(('河南财经', '侯小娟', False), ['机构：截短']),
+		(('河南财经政法大学侯', '小娟', False), ['机构：过长', '姓名：截短']),
+		(('河南财经政法大学', '侯小娟学', True), ['姓名：过长', '身份：学生误判为教师']),
+		(('河南财经政法大学', config.name.default_name, False), ['姓名：缺失']),
+	])
+	def test_classify(self, golden_report, parsed, categories):
+		"""测试解析错误分类"""
+		record = golden_report.GoldenRecord('河南财经政法大学侯小娟', '河南财经政法大学', '侯小娟', False)
+
+		assert golden_report.classify(record, *parsed) == categories
+
+	def test_variant_config(self, golden_report):
+		"""测试内置解析方式和不存在的解析方式"""
+		snapshot = golden_report.variant_config('surname-tiered')
+
+		assert snapshot.name.extractor == 'surname'
+		assert snapshot.segmentation.tiered
+		with pytest.raises(ValueError, match='未知的解析方式'):
+			golden_report.variant_config('fastest')
+		with pytest.raises(ValueError, match='配置档案不存在'):
+			golden_report.variant_config('profile:不存在的档案')
+
+	def test_evaluate(self, golden_report, corpus_path):
+		"""测试报告中的准确率与逐条解析的结果一致"""
+		records = golden_report.load_corpus(corpus_path)
+		report = golden_report.evaluate(records, 'surname', repeat=2)
+		failed = report.total - report.correct['record']
+
+		assert report.total == len(records)
+		assert report.rate > 0
+		assert 0 <= report.accuracy('institution') <= 100
+		# 每条解析错误的记录至少属于一个错误类别
+		assert sum(report.failures.values()) >= failed
+		assert all(len(samples) <= 3 for samples in report.examples.values())
+
+		table = golden_report.format_table([report, report])
+		assert table.count('整条记录准确率') == 1
+		assert f'{report.accuracy("record"):.2f}%' in table
+
+	def test_engines(self, golden_report, corpus_path):
+		"""测试流水线引擎与批量解析引擎的准确率相同，以及流水线引擎不支持多线程"""
+		records = golden_report.load_corpus(corpus_path)
+		applicant = golden_report.evaluate(records, 'default', engine='applicant')
+		pipeline = golden_report.evaluate(records, 'default', engine='pipeline')
+
+		assert pipeline.label == 'default[pipeline]'
+		assert pipeline.correct == applicant.correct
+		assert pipeline.failures == applicant.failures
+		with pytest.raises(ValueError, match='单线程'):
+			golden_report.run_variant(records, config, workers=2, engine='pipeline')
+		with pytest.raises(ValueError, match='未知的解析引擎'):
+			golden_report.run_variant(records, config, engine='fastest')
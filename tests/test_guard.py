@@ -0,0 +1,48 @@
+"""
+输入检查测试
+
+此模块测试超长内容检查、截断、申请信息预检查以及批量解析的时间预算。
+"""
+import pytest
+
+from iparser.api.guard import (TimeBudgetExceeded, is_oversized, looks_like_applicant,
+	truncate)
+from iparser.batch.engine import parse_lines
+from iparser.config import config
+
+
+class TestGuard:
+	"""输入检查测试类"""
+
+	def test_oversized(self):
+		"""测试超长内容检查"""
+		limit = config.input_guard.max_content_length
+
+		assert not is_oversized('河南科技职业大学杨怡宁')
+		assert is_oversized('文' * (limit + 1))
+
+	def test_truncate(self):
+		"""测试单条申请信息截断"""
+		long_input = '河南科技职业大学' + '杨怡宁' * 100
+
+		assert len(truncate(long_input)) == config.input_guard.max_length
+		assert truncate('黄淮学院—潘豫皖') == '黄淮学院—潘豫皖'
+
+	def test_looks_like_applicant(self, samples_normal):
+		"""测试申请信息预检查"""
+		for case in samples_normal:
+			assert looks_like_applicant(case['input'])
+
+		assert not looks_like_applicant('张三')
+		assert not looks_like_applicant('今天天气很好，' * 20 + '河南科技职业大学')
+
+	def test_time_budget(self, samples_normal):
+		"""测试批量解析超出时间预算"""
+		lines = [case['input'] for case in samples_normal]
+
+		with pytest.raises(TimeBudgetExceeded) as error:
+			parse_lines(lines, time_budget=0)
+
+		assert error.value.total == len(lines)
+		assert error.value.completed < len(lines)
+		assert len(parse_lines(lines, time_budget=60)) == len(lines)
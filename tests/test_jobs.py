@@ -0,0 +1,105 @@
+"""
+可断点续传的批量任务测试
+
+此模块测试批量任务的分块输出、断点续传以及解析规则变化后重新开始。
+"""
+import csv
+import json
+from unittest import mock
+
+import pytest
+
+from iparser.api.ruleset import compile_ruleset, get_ruleset
+from iparser.batch import jobs
+from iparser.batch.engine import parse_lines
+from iparser.batch.jobs import BatchJob, read_rows
+
+
+@pytest.fixture
+def input_file(tmp_path, samples_normal):
+	"""带BOM、CRLF换行和空行的输入文件"""
+	lines = [case['input'] for case in samples_normal] * 3
+	path = tmp_path / 'applicants.txt'
+	path.write_bytes(b'\xef\xbb\xbf' + '\r\n\r\n'.join(lines).encode('utf-8') + b'\r\n')
+
+	return path, lines
+
+
+def read_output(path):
+	"""读取CSV输出文件中的原始申请信息和格式化结果"""
+	with open(path, 'r', encoding='utf-8', newline='') as f:
+		return [(row['info'], row['full_info']) for row in csv.DictReader(f)]
+
+
+class TestJobs:
+	"""可断点续传的批量任务测试类"""
+
+	def test_read_rows(self, input_file):
+		"""测试逐行读取时跳过BOM、CRLF和空行，并能从字节偏移处继续读取"""
+		path, lines = input_file
+		rows = list(read_rows(path))
+
+		assert [row for _, row in rows] == lines
+		assert [row for _, row in read_rows(path, rows[4][0])] == lines[5:]
+		assert [row for _, row in read_rows(path, limit=2)] == lines[:2]
+
+	def test_run(self, input_file, tmp_path):
+		"""测试分块解析结果按输入顺序合并，与直接批量解析一致"""
+		path, lines = input_file
+		job = BatchJob(path, tmp_path / 'results.csv', chunk_size=7)
+		job.run()
+
+		expected = [(result.info, result.full_info) for result in parse_lines(lines)]
+		assert read_output(job.output_path) == expected
+		assert len(job.chunks) == -(-len(lines) // 7)
+		assert job.rows == len(lines)
+
+		manifest = json.loads(job.manifest_path.read_text(encoding='utf-8'))
+		assert manifest['completed'] and manifest['ruleset_hash'] == get_ruleset().hash
+
+	def test_resume(self, input_file, tmp_path):
+		"""测试中断后从最后一个完成的分块继续"""
+		path, lines = input_file
+		output = tmp_path / 'results.jsonl'
+		calls = []
+
+		def interrupt(rows, *args, **kwargs):
+			calls.append(len(rows))
+			if len(calls) == 3:
+				raise KeyboardInterrupt
+			return parse_lines(rows, *args, **kwargs)
+
+		with mock.patch.object(jobs, 'parse_lines', interrupt):
+			with pytest.raises(KeyboardInterrupt):
+				BatchJob(path, output, chunk_size=5).run()
+
+		assert not output.exists()
+		calls.clear()
+
+		with mock.patch.object(jobs, 'parse_lines', wraps=parse_lines) as parse:
+			job = BatchJob(path, output, chunk_size=5)
+			job.run()
+			parsed = sum(len(call.args[0]) for call in parse.call_args_list)
+			assert parsed == len(lines) - 10
+
+		results = [json.loads(line)
+			for line in output.read_text(encoding='utf-8').splitlines()]
+		assert [result['info'] for result in results] == lines
+
+	def test_ruleset_change_restarts(self, input_file, tmp_path):
+		"""测试解析规则变化后丢弃已完成的分块重新开始"""
+		path, lines = input_file
+		output = tmp_path / 'results.csv'
+		BatchJob(path, output, chunk_size=5).run()
+
+		base = get_ruleset().config
+		institution = base.institution.model_copy(
+			update={'shortened_names': base.institution.shortened_names | {'黄淮'}})
+		ruleset = compile_ruleset(base.model_copy(update={'institution': institution}))
+
+		with mock.patch.object(jobs, 'parse_lines', wraps=parse_lines) as parse:
+			BatchJob(path, output, chunk_size=5).run()
+			assert parse.call_count == 0
+
+			BatchJob(path, output, chunk_size=5, ruleset=ruleset).run()
+			assert sum(len(call.args[0]) for call in parse.call_args_list) == len(lines)
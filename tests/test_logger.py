@@ -0,0 +1,46 @@
+"""
+日志系统测试
+
+此模块测试后台线程写入日志以及调试日志采样。
+"""
+import logging
+
+from iparser.logger import (SamplingFilter, disable_logging, logger, setup_logging,
+	shutdown_logging)
+
+
+def make_record(level: int = logging.DEBUG, lineno: int = 1) -> logging.LogRecord:
+	"""创建测试用的日志记录"""
+	return logging.LogRecord('iparser', level, 'applicant.py', lineno, '处理分词：测试',
+		None, None)
+
+
+class TestLogger:
+	"""日志系统测试类"""
+
+	def test_sampling(self):
+		"""测试同一位置的调试日志被采样，其他级别和位置不受影响"""
+		sampling = SamplingFilter(rate=5)
+		passed = sum(sampling.filter(make_record()) for _ in range(100))
+
+		assert 5 <= passed <= 10
+		assert sampling.filter(make_record(lineno=2))
+		assert all(sampling.filter(make_record(logging.INFO)) for _ in range(100))
+		assert all(SamplingFilter(rate=0).filter(make_record()) for _ in range(100))
+
+	def test_queue_logging(self, tmp_path):
+		"""测试日志由后台线程写入文件"""
+		log_file = tmp_path / 'iparser.log'
+
+		try:
+			setup_logging(level='INFO', file=str(log_file))
+			logger.debug('不应写入的调试日志')
+			logger.info('后台写入的日志')
+			shutdown_logging()
+
+			content = log_file.read_text(encoding='utf-8')
+			assert '后台写入的日志' in content
+			assert '不应写入的调试日志' not in content
+		finally:
+			setup_logging()
+			disable_logging()
@@ -0,0 +1,85 @@
+"""
+基于内存映射的并行输入测试
+
+此模块测试字节范围的行首对齐、BOM和CRLF的处理，
+以及多个工作进程并行解析后按顺序重新组装的结果。
+"""
+import codecs
+
+import pytest
+
+from iparser.batch.engine import parse_lines
+from iparser.batch.jobs import BatchJob, read_rows
+from iparser.batch.mapped import MappedInput, decode_rows, parse_file
+
+
+LINES = ['河南科技职业大学杨怡宁', '白城师范学院 刘一晨（教师）', '', '黄淮学院-赵佳',
+	'新乡学院王明', '   ', '河南工学院-郭自强（教师）', '长春工业大学孙佳美']
+
+
+@pytest.fixture
+def input_path(tmp_path):
+	"""带BOM、CRLF换行和空行的输入文件"""
+	path = tmp_path / 'input.txt'
+	path.write_bytes(codecs.BOM_UTF8 + '\r\n'.join(LINES * 5).encode('utf-8') + b'\r\n')
+
+	return path
+
+
+class TestMapped:
+	"""基于内存映射的并行输入测试类"""
+
+	def test_decode_rows(self):
+		"""测试解码时去掉回车符并跳过空行"""
+		assert decode_rows('黄淮学院赵佳\r\n\r\n新乡学院王明\n  \n'.encode('utf-8')) == \
+			['黄淮学院赵佳', '新乡学院王明']
+
+	@pytest.mark.parametrize('parts', [1, 2, 3, 7, 100])
+	def test_split(self, input_path, parts):
+		"""测试切分的字节范围按行首对齐，拼接后与逐行读取的结果相同"""
+		with MappedInput(input_path) as mapped:
+			assert mapped.start == len(codecs.BOM_UTF8)
+
+			ranges = mapped.split(parts)
+			data = input_path.read_bytes()
+
+			assert ranges[0][0] == mapped.start and ranges[-1][1] == mapped.size
+			assert all(end == begin for (_, end), (begin, _) in zip(ranges, ranges[1:]))
+			assert all(data[begin - 1:begin] == b'\n' for begin, _ in ranges[1:])
+
+			rows = [row for begin, end in ranges for row in mapped.rows(begin, end)]
+			assert rows == [row for _, row in read_rows(input_path)]
+
+	def test_ranges(self, input_path):
+		"""测试按字节数依次生成字节范围"""
+		with MappedInput(input_path) as mapped:
+			ranges = list(mapped.ranges(50, start=mapped.align(100)))
+			rows = [row for begin, end in ranges for row in mapped.rows(begin, end)]
+
+			assert rows == [row for _, row in read_rows(input_path, ranges[0][0])]
+
+	def test_empty_file(self, tmp_path):
+		"""测试空文件"""
+		path = tmp_path / 'empty.txt'
+		path.write_bytes(b'')
+
+		with MappedInput(path) as mapped:
+			assert mapped.split(4) == []
+			assert list(mapped.ranges(10)) == []
+
+		assert list(parse_file(path)) == []
+
+	def test_parallel(self, tmp_path, input_path):
+		"""测试多个工作进程并行解析后按顺序重新组装，批量任务的输出与单进程相同"""
+		expected = list(parse_lines([row for _, row in read_rows(input_path)]))
+		results = [result
+			for columns in parse_file(input_path, workers=2, range_bytes=64)
+			for result in columns]
+
+		assert results == expected
+
+		single = BatchJob(input_path, tmp_path / 'single.csv', chunk_size=4).run()
+		parallel = BatchJob(input_path, tmp_path / 'parallel.csv', chunk_size=4,
+			processes=2).run()
+
+		assert parallel.read_bytes() == single.read_bytes()
@@ -0,0 +1,63 @@
+"""
+机构简称挖掘测试
+
+此模块测试计数最小草图、高频元素统计，以及从解析结果中挖掘候选简称和排除关键词。
+"""
+import random
+
+from iparser.batch.engine import parse_lines
+from iparser.batch.mining import CountMinSketch, HeavyHitters, ShortenedNameMiner
+
+
+class TestMining:
+	"""机构简称挖掘测试类"""
+
+	def test_count_min_sketch(self):
+		"""测试估计值不小于真实值，且在计数器充足时等于真实值"""
+		sketch = CountMinSketch(width=1024, depth=4)
+		counts = {f'候选{index}': index % 7 + 1 for index in range(100)}
+		for item, count in counts.items():
+			for _ in range(count):
+				sketch.add(item)
+
+		assert all(sketch.estimate(item) >= count for item, count in counts.items())
+		assert sum(sketch.estimate(item) == count
+			for item, count in counts.items()) > 90
+
+	def test_heavy_hitters(self):
+		"""测试有限容量下仍能找出出现次数最多的元素"""
+		random.seed(0)
+		hitters = HeavyHitters(capacity=20, width=4096)
+		items = [f'高频{index}' for index in range(5) for _ in range(100)] \
+			+ [f'低频{index}' for index in range(2000)]
+		random.shuffle(items)
+		for item in items:
+			hitters.add(item)
+
+		top = hitters.most_common(5)
+		assert {item for item, _ in top} == {f'高频{index}' for index in range(5)}
+		assert all(count >= 100 for _, count in top)
+
+	def test_mining(self):
+		"""测试从未识别机构的记录中挖掘出缺失的简称"""
+		names = ['张三', '李四', '王小明', '赵六', '钱七', '孙悟空']
+		lines = [f'郑大{name}' for name in names] + [f'郑大-{name}（教师）' for name in names] \
+			+ [f'新乡学院{name}' for name in names]
+
+		miner = ShortenedNameMiner()
+		for result in parse_lines(lines):
+			miner.add(result.info, result.institution)
+
+		suggestions = miner.suggestions(top=3)
+		assert miner.records == len(lines)
+		assert miner.unresolved >= len(names)
+		assert suggestions['shortened_names'][0][0] == '郑大'
+
+	def test_keyword_candidate(self):
+		"""测试机构名称不以机构后缀结尾时给出候选排除关键词"""
+		miner = ShortenedNameMiner()
+
+		assert miner.keyword_candidate('郑州大学城') == '大学城'
+		assert miner.keyword_candidate('北京学院路') is None # 已经是排除关键词
+		assert miner.keyword_candidate('新乡学院') is None
+		assert miner.keyword_candidate('未知') is None
@@ -0,0 +1,54 @@
+"""
+持久化解析缓存测试
+
+此模块测试持久化解析缓存的读写、解析规则隔离、淘汰以及与批量解析引擎的配合。
+"""
+from unittest import mock
+
+from iparser.api.ruleset import get_ruleset
+from iparser.batch import engine
+from iparser.batch.cache import PersistentParseCache
+from iparser.batch.engine import parse_lines
+
+
+class TestParseCache:
+	"""持久化解析缓存测试类"""
+
+	def test_get_and_put(self, tmp_path):
+		"""测试批量写入和查询，查询时忽略首尾空白，不同解析规则的缓存互不影响"""
+		cache = PersistentParseCache(tmp_path / 'cache.db')
+		cache.put_many({'黄淮学院—潘豫皖': ('黄淮学院', '潘豫皖', False)}, 'a')
+
+		found = cache.get_many([' 黄淮学院—潘豫皖 ', '新乡学院－刘菲菲'], 'a')
+		assert found == {' 黄淮学院—潘豫皖 ': ('黄淮学院', '潘豫皖', False)}
+		assert cache.get_many(['黄淮学院—潘豫皖'], 'b') == {}
+		assert (cache.hits, cache.misses) == (1, 2)
+
+		cache.close()
+		assert len(PersistentParseCache(tmp_path / 'cache.db')) == 1
+
+	def test_evict(self, tmp_path):
+		"""测试超出最大条数时淘汰最早写入的缓存"""
+		cache = PersistentParseCache(tmp_path / 'cache.db', max_entries=2)
+		for index in range(3):
+			cache.put_many({f'信息{index}': ('机构', '姓名', False)}, 'a')
+
+		assert cache.evict() == 1
+		assert set(cache.get_many(['信息0', '信息1', '信息2'], 'a')) == {'信息1', '信息2'}
+
+	def test_engine_reads_cache(self, tmp_path, samples_normal):
+		"""测试批量解析只解析未命中缓存的申请信息，结果与不使用缓存时一致"""
+		cache = PersistentParseCache(tmp_path / 'cache.db')
+		lines = [case['input'] for case in samples_normal]
+		expected = list(parse_lines(lines, cache=cache))
+
+		assert len(cache) == len(set(line.strip() for line in lines))
+
+		with mock.patch.object(engine, 'parse_one',
+			wraps=engine.parse_one) as parse_one:
+			assert list(parse_lines(lines, cache=cache)) == expected
+			assert list(parse_lines(lines + ['测试职业学院张三丰'], cache=cache))[:-1] \
+				== expected
+			assert parse_one.call_count == 1
+
+		assert cache.get_many(lines, get_ruleset().hash).keys() == set(lines)
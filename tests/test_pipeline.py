@@ -0,0 +1,101 @@
+"""
+流水线解析API测试
+
+此模块测试默认流水线的解析结果与 Applicant 一致，流水线是惰性的，
+以及插入、替换和删除阶段。
+"""
+import itertools
+
+import pytest
+
+from iparser.api.applicant import Applicant
+from iparser.api.pipeline import Record, default_pipeline, segment
+from iparser.api.ruleset import compile_ruleset
+from iparser.config import config
+
+
+class TestPipeline:
+	"""流水线解析API测试类"""
+
+	def test_matches_applicant(self, samples_normal, samples_others):
+		"""测试默认流水线的解析结果与 Applicant 一致"""
+		lines = [case['input'] for case in samples_normal + samples_others]
+
+		for line, record in zip(lines, default_pipeline()(lines)):
+			applicant = Applicant(line)
+			applicant.parse()
+
+			assert record.info == line
+			assert (record.institution, record.name, record.is_teacher,
+				record.full_info) == (applicant.institution, applicant.name,
+				applicant.is_teacher, applicant.full_info)
+
+	@pytest.mark.parametrize('extractor, tiered', [
+		('surname', False),
+		('segments', True),
+		('surname', True),
+	])
+	def test_matches_applicant_with_options(self, samples_normal, samples_others,
+		extractor, tiered):
+		"""测试启用姓氏锚定和分级分词时，默认流水线的解析结果与 Applicant 一致"""
+		# 流水线不使用机构前缀缓存，比较时关闭
+		ruleset = compile_ruleset(config.model_copy(update={
+			'name': config.name.model_copy(update={'extractor': extractor}),
+			'segmentation': config.segmentation.model_copy(update={'tiered': tiered}),
+			'prefix_cache': config.prefix_cache.model_copy(update={'enabled': False}),
+		}))
+		lines = ['新乡学院—王怡小学生', '河南工学院郭学强教师老师', '河南科技职业大学',
+			*(case['input'] for case in samples_normal + samples_others)]
+
+		for line, record in zip(lines, default_pipeline(ruleset)(lines)):
+			applicant = Applicant(line, ruleset)
+			applicant.parse()
+
+			assert (record.institution, record.name, record.is_teacher) \
+				== (applicant.institution, applicant.name, applicant.is_teacher)
+
+	def test_lazy(self):
+		"""测试流水线按需处理无限长的输入"""
+		consumed = []
+
+		def endless():
+			for index in itertools.count():
+				consumed.append(index)
+				yield '黄淮学院—潘豫皖'
+
+		records = list(itertools.islice(default_pipeline()(endless()), 3))
+
+		assert [record.full_info for record in records] == ['黄淮学院-潘豫皖'] * 3
+		assert len(consumed) == 3
+
+	def test_compose(self):
+		"""测试插入、替换和删除阶段"""
+		calls = []
+
+		def gazetteer(records):
+			for record in records:
+				if record.institution == '黄淮学院':
+					record = record._replace(institution='黄淮学院（驻马店）')
+				yield record
+
+		def cached_segment(records):
+			cache = {}
+			inner = segment()
+			for record in records:
+				if record.text not in cache:
+					calls.append(record.text)
+					cache[record.text] = next(inner(iter([record]))).segments
+				yield record._replace(segments=cache[record.text])
+
+		pipeline = default_pipeline() \
+			.insert_after('extract', 'gazetteer', gazetteer) \
+			.replace('segment', cached_segment)
+		assert pipeline.names == ['normalize', 'segment', 'extract', 'gazetteer',
+			'canonicalize', 'format']
+
+		records = list(pipeline(['黄淮学院—潘豫皖', Record(' 黄淮学院—潘豫皖 ')]))
+		assert [record.full_info for record in records] == ['黄淮学院（驻马店）-潘豫皖'] * 2
+		assert calls == ['黄淮学院—潘豫皖']
+
+		records = list(pipeline.remove('format')(['黄淮学院—潘豫皖']))
+		assert records[0].full_info is None
@@ -0,0 +1,130 @@
+"""
+机构前缀缓存测试
+
+此模块测试机构前缀树的匹配、容量限制、并发学习和淘汰、持久化以及与解析器的配合。
+"""
+import threading
+
+import pytest
+
+from iparser.api.applicant import Applicant
+from iparser.api.prefix_cache import InstitutionPrefixCache
+from iparser.api.ruleset import get_ruleset
+
+
+@pytest.fixture
+def empty_cache():
+	"""清空当前解析规则的机构前缀缓存"""
+	cache = get_ruleset().prefix_cache
+	cache.clear()
+	yield cache
+	cache.clear()
+
+
+class TestPrefixCache:
+	"""机构前缀缓存测试类"""
+
+	def test_longest_match(self):
+		"""测试匹配最长的已知机构名称"""
+		cache = InstitutionPrefixCache()
+		cache.learn('河南科技')
+		cache.learn('河南科技职业大学')
+
+		assert cache.match('河南科技职业大学杨怡宁') == '河南科技职业大学'
+		assert cache.match('河南科技学院张三') == '河南科技'
+		assert cache.match('北京大学李四') is None
+		assert (cache.hits, cache.misses) == (2, 1)
+
+	def test_bounded_size(self):
+		"""测试缓存容量限制，优先淘汰命中次数最少的机构"""
+		cache = InstitutionPrefixCache(max_size=10)
+		for index in range(10):
+			cache.learn(f'第{index}大学')
+		cache.match('第9大学张三')
+
+		cache.learn('新乡学院')
+
+		assert len(cache) == 10
+		assert '第9大学' in cache
+		assert '新乡学院' in cache
+		assert '第0大学' not in cache
+
+	def test_evicted_not_matched(self):
+		"""测试写时复制加入的机构可以匹配，淘汰后重建的前缀树不再匹配已淘汰的机构"""
+		cache = InstitutionPrefixCache(max_size=10)
+		for index in range(10):
+			cache.learn(f'第{index}大学')
+			assert cache.match(f'第{index}大学张三') == f'第{index}大学'
+
+		cache.learn('新乡学院')
+
+		assert cache.match('新乡学院王明') == '新乡学院'
+		assert sum(cache.match(f'第{index}大学张三') is None for index in range(10)) == 1
+
+	def test_concurrent_learn_and_match(self):
+		"""测试多个线程同时学习、淘汰和匹配时不会出错，容量不超过上限"""
+		cache = InstitutionPrefixCache(max_size=50)
+		errors = []
+
+		def worker(offset: int):
+			try:
+				for index in range(2000):
+					institution = f'第{(offset * 7 + index) % 300}大学'
+					cache.learn(institution)
+					cache.match(f'{institution}张三')
+			except Exception as e:
+				errors.append(e)
+
+		threads = [threading.Thread(target=worker, args=(offset,))
+			for offset in range(8)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		assert not errors
+		assert len(cache) <= 50
+
+	def test_persistence(self, tmp_path):
+		"""测试缓存保存与加载，解析规则变化时缓存失效"""
+		path = tmp_path / 'institution_cache.json'
+
+		cache = InstitutionPrefixCache()
+		cache.validate('ruleset-a')
+		cache.learn('黄淮学院')
+		cache.save(path)
+
+		loaded = InstitutionPrefixCache()
+		loaded.load(path, 'ruleset-a')
+		assert loaded.match('黄淮学院潘豫皖') == '黄淮学院'
+
+		changed = InstitutionPrefixCache()
+		changed.load(path, 'ruleset-b')
+		assert len(changed) == 0
+
+		loaded.validate('ruleset-b')
+		assert len(loaded) == 0
+
+	def test_parse_with_cache(self, empty_cache):
+		"""测试命中缓存时只对剩余部分分词，且结果与完整分词一致"""
+		applicant = Applicant('河南科技职业大学杨怡宁')
+		applicant.parse()
+		assert '河南科技职业大学' in empty_cache
+
+		applicant = Applicant('河南科技职业大学—游一晨（学生）')
+		applicant.parse()
+
+		assert applicant.split_result[0] == '河南科技职业大学'
+		assert applicant.institution == '河南科技职业大学'
+		assert applicant.name == '游一晨'
+		assert applicant.is_teacher is False
+
+	def test_incomplete_prefix(self, empty_cache):
+		"""测试缓存的机构名称只是更长机构名称的一部分时重新分词"""
+		empty_cache.learn('长春工业')
+
+		applicant = Applicant('长春工业大学李佳美学生')
+		applicant.parse()
+
+		assert applicant.institution == '长春工业大学'
+		assert applicant.name == '李佳美'
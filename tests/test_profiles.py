@@ -0,0 +1,68 @@
+"""
+配置档案测试
+
+此模块测试配置档案的叠加、按档案解析以及共享基础词典。
+"""
+import jieba.finalseg
+import pytest
+
+from iparser.api.applicant import Applicant
+from iparser.api.profiles import ProfileRegistry
+from iparser.api.ruleset import compile_ruleset, get_ruleset
+from iparser.config import Profile
+
+
+@pytest.fixture(scope='module')
+def registry() -> ProfileRegistry:
+	"""包含一个测试配置档案的注册表"""
+	return ProfileRegistry({
+		'competition_a': Profile(
+			shortened_names={'郑大'},
+			words={'郑大': 100000},
+			output_pattern_student='{name}（{institution}）',
+		),
+	})
+
+
+class TestProfiles:
+	"""配置档案测试类"""
+
+	def test_parse_with_profile(self, registry):
+		"""测试按配置档案解析，默认解析规则不受影响"""
+		applicant = Applicant('郑大张三学生', registry.get('competition_a'))
+		applicant.parse()
+
+		assert applicant.institution == '郑大'
+		assert applicant.name == '张三'
+		assert applicant.full_info == '张三（郑大）'
+
+		applicant = Applicant('郑大张三学生')
+		applicant.parse()
+
+		assert applicant.institution != '郑大'
+
+	def test_shared_base_dictionary(self, registry):
+		"""测试所有配置档案共享同一份基础词典，只保存叠加的词条"""
+		default = get_ruleset()
+		ruleset = registry.get('competition_a')
+
+		assert ruleset.tokenizer.FREQ.base is default.tokenizer.FREQ.base
+		assert ruleset.overlay_size < len(ruleset.tokenizer.FREQ.base) // 1000
+		assert registry.get('competition_a') is ruleset
+
+	def test_excluded_keywords_isolated(self):
+		"""测试配置档案的排除关键词只影响该档案，不修改jieba全局的HMM强制拆分集合"""
+		default = get_ruleset()
+		profile = Profile(excluded_keywords={'大学城'})
+		ruleset = compile_ruleset(profile.apply(default.config))
+
+		assert ruleset.tokenizer.FREQ['大学城'] == 0
+		assert default.tokenizer.FREQ['大学城'] > 0
+		assert '大学城' not in jieba.finalseg.Force_Split_Words
+
+	def test_unknown_profile(self, registry):
+		"""测试获取不存在的配置档案"""
+		assert registry.get() is get_ruleset()
+
+		with pytest.raises(KeyError):
+			registry.get('missing')
@@ -0,0 +1,105 @@
+"""
+解析性能分析测试
+
+此模块测试按比例抽样、多线程和多进程统计数据的合并、折叠栈输出以及命令行开关。
+"""
+import pstats
+
+import pytest
+
+from iparser.__main__ import main
+from iparser.batch.engine import parse_lines
+from iparser.batch.mapped import parse_file
+from iparser.batch.profiling import Profiler, active_profiler
+
+
+@pytest.fixture
+def lines(samples_normal):
+	"""互不相同的申请信息，保证每条都会经过解析器"""
+	return [f'{case["input"]}{index}' for index in range(4)
+		for case in samples_normal]
+
+
+class TestProfiling:
+	"""解析性能分析测试类"""
+
+	def test_sample_rate(self, lines):
+		"""测试按比例确定性抽样"""
+		with Profiler(sample_rate=0.25) as profiler:
+			assert active_profiler() is profiler
+			parse_lines(lines)
+
+		assert active_profiler() is None
+		assert profiler.records == len(lines)
+		assert profiler.sampled == len(lines) // 4
+
+		stats = profiler.stats()
+		assert any(name == 'parse' for _, _, name in stats.stats)
+
+	def test_invalid_sample_rate(self):
+		"""测试抽样比例超出范围"""
+		with pytest.raises(ValueError):
+			Profiler(sample_rate=0)
+
+	def test_threads_merged(self, lines):
+		"""测试线程池中各线程的统计数据合并为一份"""
+		with Profiler() as profiler:
+			parse_lines(lines, max_workers=4)
+
+		assert profiler.sampled == len(lines)
+		stats = profiler.stats()
+		calls = sum(ncalls for (_, _, name), (_, ncalls, *_) in stats.stats.items()
+			if name == '_parse')
+		assert calls + profiler.skipped == len(lines)
+
+	def test_processes_merged(self, tmp_path, lines):
+		"""测试工作进程的统计数据和折叠栈合并回主进程"""
+		source = tmp_path / 'applicants.txt'
+		source.write_text('\n'.join(lines * 5), encoding='utf-8')
+
+		with Profiler(sample_rate=0.5, interval=0.0001) as profiler:
+			results = [result
+				for chunk in parse_file(source, workers=2, range_bytes=512)
+				for result in chunk]
+
+		# 每个范围内相同的申请信息只解析一次
+		assert 0 < profiler.records <= len(lines) * 5
+		assert profiler.sampled > 0
+		stats = profiler.stats()
+		assert any(name == '_parse' for _, _, name in stats.stats)
+		# 多次获取合并的统计数据结果相同
+		assert profiler.stats().total_calls == stats.total_calls
+		assert len(results) == len(lines) * 5
+
+	def test_save(self, tmp_path, lines):
+		"""测试保存pstats和折叠栈"""
+		with Profiler(interval=0.0001) as profiler:
+			parse_lines(lines * 5)
+
+		stats_path, folded_path = profiler.save(tmp_path / 'out' / 'profile')
+
+		assert pstats.Stats(str(stats_path)).total_calls > 0
+		for line in folded_path.read_text(encoding='utf-8').splitlines():
+			stack, count = line.rsplit(' ', 1)
+			assert stack.startswith('_parse (engine.py:')
+			assert int(count) > 0
+
+	def test_nested(self):
+		"""测试同一时刻只能启用一个性能分析器"""
+		with Profiler():
+			with pytest.raises(RuntimeError):
+				with Profiler():
+					pass
+
+	def test_cli(self, tmp_path, lines, monkeypatch):
+		"""测试命令行开关"""
+		# main() 会按配置文件重新启用日志，测试期间保持关闭
+		monkeypatch.setattr('iparser.__main__.setup_logging', lambda **kwargs: None)
+		source = tmp_path / 'applicants.txt'
+		source.write_text('\n'.join(lines), encoding='utf-8')
+
+		main(['--profile', str(tmp_path / 'batch'), '--profile-sample', '0.5', 'batch',
+			str(source), str(tmp_path / 'results.csv')])
+
+		assert (tmp_path / 'batch.pstats').exists()
+		assert (tmp_path / 'batch.folded').exists()
@@ -0,0 +1,156 @@
+"""
+二进制解析结果文件测试
+
+此模块测试二进制解析结果文件的写入、按需解码的读取、合并，
+与CSV和JSONL之间的转换，以及批量任务输出二进制文件。
+"""
+import json
+
+import pytest
+
+from iparser.api.applicant import Applicant
+from iparser.batch.columnar import ParseResult, ResultColumns
+from iparser.batch.jobs import BatchJob
+from iparser.batch.records import (RecordFormatError, RecordReader, RecordWriter,
+	convert, read_results)
+
+
+@pytest.fixture
+def columns(samples_normal) -> ResultColumns:
+	"""由普通样本解析得到的列式解析结果"""
+	results = ResultColumns()
+	for case in samples_normal:
+		applicant = Applicant(case['input'])
+		applicant.parse()
+		results.append_applicant(applicant)
+
+	return results
+
+
+class TestRecords:
+	"""二进制解析结果文件测试类"""
+
+	def test_round_trip(self, tmp_path, columns):
+		"""测试写入后读取的解析结果与原来相同"""
+		path = tmp_path / 'results.iprec'
+		columns.write_records(path)
+
+		with RecordReader(path) as reader:
+			assert len(reader) == len(columns)
+			assert list(reader.results()) == list(columns)
+			assert sorted(reader.institutions) == sorted(columns.institutions)
+
+			record = reader[-1]
+			assert record.to_result() == columns[-1]
+			assert record.full_info == columns[-1].full_info
+			assert str(record.raw_name, 'utf-8') == columns[-1].name
+
+	def test_lazy_fields(self, tmp_path):
+		"""测试按字段访问和按下标访问"""
+		path = tmp_path / 'results.iprec'
+		with RecordWriter(path) as writer:
+			writer.write('河南工学院-郭自强（教师）', '河南工学院', '郭自强', True)
+			writer.write('河南工学院王一晨', '河南工学院', '王一晨', False)
+			writer.write('', '', '', False)
+
+		with RecordReader(path) as reader:
+			assert reader.institutions == ['河南工学院', '']
+			assert [record.institution_code for record in reader] == [0, 0, 1]
+			assert reader[1].name == '王一晨'
+			assert reader[0].is_teacher
+			assert reader[2].to_result() == ParseResult('', '', '', False, '-')
+
+			with pytest.raises(IndexError):
+				reader[3]
+
+	def test_close_with_live_view(self, tmp_path, columns):
+		"""测试仍有未释放的内存视图时关闭不会抛出异常，也不会掩盖 with 语句中的异常"""
+		path = tmp_path / 'results.iprec'
+		columns.write_records(path)
+
+		with RecordReader(path) as reader:
+			raw = reader[0].raw_info
+		assert str(raw, 'utf-8') == columns[0].info
+
+		with pytest.raises(KeyError, match='inner'):
+			with RecordReader(path) as reader:
+				raw = reader[0].raw_name
+				raise KeyError('inner')
+		raw.release()
+
+	def test_copy_from(self, tmp_path):
+		"""测试合并多个文件时重新映射机构编码"""
+		first, second, merged = (tmp_path / f'{name}.iprec' for name in ('a', 'b', 'c'))
+		with RecordWriter(first) as writer:
+			writer.write('黄淮学院赵佳', '黄淮学院', '赵佳', False)
+		with RecordWriter(second) as writer:
+			writer.write('新乡学院刘一', '新乡学院', '刘一', False)
+			writer.write('黄淮学院王明', '黄淮学院', '王明', True)
+
+		with RecordWriter(merged) as writer:
+			for path in (first, second):
+				with RecordReader(path) as reader:
+					writer.copy_from(reader)
+
+		with RecordReader(merged) as reader:
+			assert reader.institutions == ['黄淮学院', '新乡学院']
+			assert [(record.institution, record.name) for record in reader] == \
+				[('黄淮学院', '赵佳'), ('新乡学院', '刘一'), ('黄淮学院', '王明')]
+
+	def test_invalid_file(self, tmp_path):
+		"""测试读取不是二进制解析结果的文件"""
+		path = tmp_path / 'results.iprec'
+		path.write_text('{"info": "黄淮学院赵佳"}\n' * 3, encoding='utf-8')
+
+		with pytest.raises(RecordFormatError):
+			RecordReader(path)
+
+		path.write_bytes(b'IPRC')
+		with pytest.raises(RecordFormatError):
+			RecordReader(path)
+
+	def test_convert(self, tmp_path, columns):
+		"""测试在二进制、CSV和JSONL格式之间转换"""
+		columns.to_jsonl(tmp_path / 'results.jsonl')
+
+		count = len(columns)
+		assert convert(tmp_path / 'results.jsonl', tmp_path / 'results.iprec') == count
+		assert convert(tmp_path / 'results.iprec', tmp_path / 'results.csv') == count
+		assert convert(tmp_path / 'results.csv', tmp_path / 'copy.jsonl') == count
+
+		assert (tmp_path / 'copy.jsonl').read_text(encoding='utf-8') == \
+			(tmp_path / 'results.jsonl').read_text(encoding='utf-8')
+
+		with pytest.raises(ValueError):
+			convert(tmp_path / 'results.iprec', tmp_path / 'results.txt')
+
+	def test_read_results(self, tmp_path, columns):
+		"""测试按扩展名读取三种格式的解析结果，文本格式只需要info和institution字段"""
+		columns.to_csv(tmp_path / 'results.csv')
+		convert(tmp_path / 'results.csv', tmp_path / 'results.iprec')
+
+		assert list(read_results(tmp_path / 'results.iprec')) == list(columns)
+		assert list(read_results(tmp_path / 'results.csv')) == list(columns)
+
+		path = tmp_path / 'minimal.csv'
+		path.write_text('info,institution\n黄淮学院赵佳,黄淮学院\n', encoding='utf-8')
+
+		assert list(read_results(path)) == \
+			[ParseResult('黄淮学院赵佳', '黄淮学院', '', False, '')]
+
+	def test_batch_job(self, tmp_path, samples_normal):
+		"""测试批量任务输出二进制文件，分块合并后可以被挖掘工具读取"""
+		lines = [case['input'] for case in samples_normal]
+		input_path = tmp_path / 'input.txt'
+		input_path.write_text('\n'.join(lines), encoding='utf-8')
+
+		output = BatchJob(input_path, tmp_path / 'output.iprec', chunk_size=3).run()
+		jsonl = BatchJob(input_path, tmp_path / 'output.jsonl', chunk_size=3).run()
+
+		with RecordReader(output) as reader:
+			assert [record.info for record in reader] == lines
+			assert [json.dumps(result._asdict(), ensure_ascii=False)
+				for result in reader.results()] \
+				== jsonl.read_text(encoding='utf-8').splitlines()
+
+		assert list(read_results(output)) == list(read_results(jsonl))
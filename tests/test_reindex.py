@@ -0,0 +1,65 @@
+"""
+增量重新解析测试
+
+此模块测试倒排索引的关键词查找、保存和加载，以及解析规则变化后只重新解析
+受影响的记录，结果与完整重新解析一致。
+"""
+from iparser.api.ruleset import compile_ruleset, get_ruleset
+from iparser.batch.engine import parse_unique
+from iparser.batch.reindex import CorpusIndex
+from iparser.config import Profile
+
+
+def profile_ruleset(**overlay):
+	"""在当前解析规则上叠加关键词"""
+	return compile_ruleset(Profile(**overlay).apply(get_ruleset().config))
+
+
+class TestReindex:
+	"""增量重新解析测试类"""
+
+	def test_lookup(self, samples_normal):
+		"""测试关键词查找与逐条检查的结果一致"""
+		lines = [case['input'] for case in samples_normal]
+		index = CorpusIndex.build(lines)
+
+		for keyword in ('学', '学院', '河南科技', '不存在的机构'):
+			assert index.lookup(keyword) == \
+				{record_id for record_id, line in enumerate(lines) if keyword in line}
+
+	def test_incremental_reparse(self, samples_normal, samples_others, tmp_path):
+		"""测试只重新解析包含变化关键词的记录，结果与完整重新解析一致"""
+		lines = [case['input'] for case in samples_normal + samples_others]
+		CorpusIndex.build(lines).save(tmp_path / 'corpus.index.json')
+
+		index = CorpusIndex.load(tmp_path / 'corpus.index.json')
+		ruleset = profile_ruleset(shortened_names={'黄淮'}, excluded_keywords={'科技职业'})
+		report = index.reparse(ruleset)
+
+		assert report.keywords == {'黄淮', '科技职业'}
+		assert report.reparsed == sum('黄淮' in line or '科技职业' in line for line in lines)
+		assert report.reparsed < len(lines)
+
+		expected = parse_unique(lines, ruleset)
+		assert all(index[record_id][1] == expected[line]
+			for record_id, line in enumerate(lines))
+		assert all(change.new == expected[change.info] != change.old
+			for change in report.changes)
+
+		# 解析规则没有变化时不需要重新解析
+		assert index.reparse(ruleset).reparsed == 0
+
+	def test_full_reparse_on_other_changes(self, samples_normal, tmp_path):
+		"""测试关键词以外的解析规则变化时重新解析所有记录，并导出变化报告"""
+		lines = [case['input'] for case in samples_normal]
+		index = CorpusIndex.build(lines)
+		report = index.reparse(
+			profile_ruleset(output_pattern_student='{name}（{institution}）'))
+
+		assert report.keywords is None
+		assert report.reparsed == len(lines)
+		assert report.changes == []
+
+		report.to_csv(tmp_path / 'changes.csv')
+		content = (tmp_path / 'changes.csv').read_text(encoding='utf-8')
+		assert content.startswith('id,info,')
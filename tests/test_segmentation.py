@@ -0,0 +1,87 @@
+"""
+分词模式测试
+
+此模块测试可配置的分词模式，包括关闭HMM的快速分词和分级分词的回退逻辑。
+"""
+import pytest
+
+from iparser.api.applicant import Applicant, segmentation_stats
+from iparser.api.ruleset import compile_ruleset
+from iparser.config import Segmentation, config
+
+
+@pytest.fixture(scope='module')
+def tiered_ruleset():
+	"""启用分级分词的解析规则"""
+	return compile_ruleset(
+		config.model_copy(update={'segmentation': Segmentation(tiered=True)}))
+
+
+@pytest.fixture
+def tiered(tiered_ruleset):
+	"""清空分级分词统计和机构前缀缓存"""
+	tiered_ruleset.prefix_cache.clear()
+	segmentation_stats.reset()
+
+	yield tiered_ruleset
+
+	segmentation_stats.reset()
+
+
+class TestSegmentation:
+	"""分词模式测试类"""
+
+	def test_tiered_matches_default(self, tiered, samples_normal, samples_others):
+		"""测试分级分词的解析结果与默认分词一致"""
+		cases = [case['input'] for case in samples_normal + samples_others]
+		expected = {}
+
+		for case in cases:
+			applicant = Applicant(case)
+			applicant.parse()
+			expected[case] = (applicant.institution, applicant.name,
+				applicant.is_teacher)
+
+		for case in cases:
+			applicant = Applicant(case, tiered)
+			applicant.parse()
+
+			assert (applicant.institution, applicant.name, applicant.is_teacher) \
+				== expected[case]
+
+		assert segmentation_stats.total == len(cases)
+
+	def test_tiered_fallback(self, tiered):
+		"""测试快速分词结果回退到默认值时启用HMM重新分词"""
+		applicant = Applicant('河南科技职业大学', tiered)
+		applicant.parse()
+
+		assert applicant.name == tiered.config.name.default_name
+		assert segmentation_stats.fallbacks == 1
+		assert segmentation_stats.fallback_rate == 1.0
+
+	def test_identity_inside_name(self, tiered):
+		"""测试姓名中间出现身份标识时回退，避免丢失姓名用字"""
+		applicant = Applicant('河南工学院郭学强教师老师', tiered)
+		applicant.parse()
+
+		assert applicant.name == '郭学强'
+		assert applicant.is_teacher is True
+		assert segmentation_stats.fallbacks == 1
+
+	def test_search_mode(self, samples_normal, samples_with_secondary_college):
+		"""测试搜索引擎模式去除被长词覆盖的子词，解析结果与精确模式一致"""
+		search = compile_ruleset(
+			config.model_copy(update={'segmentation': Segmentation(mode='search')}))
+
+		assert search.cut('长春电子科技学院/司马飞鸟', True) == \
+			['长春', '电子科技', '学院', '/', '司马', '飞鸟']
+
+		for case in samples_normal + samples_with_secondary_college:
+			expected = Applicant(case['input'])
+			expected.parse()
+			applicant = Applicant(case['input'], search)
+			applicant.parse()
+
+			assert (applicant.institution, applicant.name, applicant.is_teacher) \
+				== (expected.institution, expected.name, expected.is_teacher)
@@ -0,0 +1,103 @@
+"""
+分片批量解析测试
+
+此模块测试分片计划、按分片解析以及按原始行顺序合并，
+并在独立的进程中运行各个分片，验证与单进程批量解析的结果一致。
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from iparser.batch.engine import parse_lines
+from iparser.batch.sharding import (load_plan, merge_shards, parse_shard_spec,
+	plan_shards, run_shard, shard_file, shard_of)
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def input_files(tmp_path, samples_normal, samples_others):
+	"""两个输入文件，包含重复的申请信息"""
+	lines = [case['input'] for case in samples_normal + samples_others] * 2
+	middle = len(lines) // 2
+	paths = [tmp_path / 'part1.txt', tmp_path / 'part2.txt']
+	paths[0].write_text('\n'.join(lines[:middle]) + '\n', encoding='utf-8')
+	paths[1].write_text('\n'.join(lines[middle:]) + '\n', encoding='utf-8')
+
+	return paths, lines
+
+
+def read_merged(path):
+	"""读取JSONL格式的合并结果"""
+	return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+class TestSharding:
+	"""分片批量解析测试类"""
+
+	def test_shard_spec(self):
+		"""测试分片参数的解析和检查"""
+		assert parse_shard_spec('3/4') == (3, 4)
+
+		for spec in ('4/4', '-1/4', '1', 'a/b', '0/0'):
+			with pytest.raises(ValueError):
+				parse_shard_spec(spec)
+
+	def test_plan_and_merge(self, input_files, tmp_path):
+		"""测试相同的申请信息落在同一分片，合并结果按原始行顺序排列"""
+		paths, lines = input_files
+		directory = tmp_path / 'shards'
+		plan = plan_shards(paths, directory, 3)
+
+		assert sum(plan['rows']) == len(lines)
+		assert all(shard_of(f' {line} ', 3) == shard_of(line, 3) for line in lines)
+
+		with pytest.raises(ValueError):
+			merge_shards(directory, tmp_path / 'results.jsonl')
+
+		for index in range(3):
+			run_shard(directory, index)
+
+		assert merge_shards(directory, tmp_path / 'results.jsonl') == len(lines)
+
+		expected = [result._asdict() for result in parse_lines(lines)]
+		assert read_merged(tmp_path / 'results.jsonl') == expected
+
+	def test_changed_input(self, input_files, tmp_path):
+		"""测试输入文件与分片计划不一致时拒绝解析"""
+		paths, _ = input_files
+		plan_shards(paths, tmp_path / 'shards', 2)
+		paths[1].write_text('新乡学院刘菲菲\n', encoding='utf-8')
+
+		with pytest.raises(ValueError):
+			run_shard(tmp_path / 'shards', 0)
+
+	def test_separate_processes(self, input_files, tmp_path):
+		"""测试每个分片在独立的进程中通过命令行运行，合并结果与单进程一致"""
+		paths, lines = input_files
+		directory = tmp_path / 'shards'
+		command = [sys.executable, '-m', 'iparser', 'shard']
+		env = {**os.environ, 'PYTHONPATH': str(PROJECT_ROOT)}
+
+		def run(*args):
+			subprocess.run(command + [str(arg) for arg in args], cwd=tmp_path,
+				check=True, env=env, capture_output=True)
+
+		run('plan', *paths, '--shards', 2, '--dir', directory)
+		processes = [subprocess.Popen(
+			command + ['run', '--shard', f'{index}/2', '--dir', str(directory)],
+			cwd=tmp_path, env=env,
+			stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for index in range(2)]
+		assert [process.wait() for process in processes] == [0, 0]
+		assert all(shard_file(directory, index, 2).exists() for index in range(2))
+
+		run('merge', tmp_path / 'results.csv', '--dir', directory, '--format', 'jsonl')
+
+		expected = [result._asdict() for result in parse_lines(lines)]
+		assert read_merged(tmp_path / 'results.csv') == expected
+		assert load_plan(directory)['shards'] == 2
@@ -0,0 +1,51 @@
+"""
+GUI事件路径浸泡测试
+
+此模块以较小的次数运行 tools/soak_gui.py，检查剪贴板事件路径没有明显的内存增长。
+完整的浸泡测试（数十万次）请直接运行该脚本。
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+SOAK_SCRIPT = Path(__file__).parent.parent / 'tools' / 'soak_gui.py'
+
+
+@pytest.fixture(scope='module')
+def soak_gui():
+	"""加载浸泡测试脚本"""
+	spec = importlib.util.spec_from_file_location('soak_gui', SOAK_SCRIPT)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+
+	return module
+
+
+class TestSoak:
+	"""GUI事件路径浸泡测试类"""
+
+	def test_event_path(self, soak_gui):
+		"""测试模拟的剪贴板变化经过完整的事件路径并写回剪贴板"""
+		root = soak_gui.FakeRoot()
+		window = soak_gui.create_window(root)
+		monitor = window.clipboard_monitor
+
+		root.clipboard = '新乡学院丶王化学生'
+		monitor.poll()
+		root.run_pending()
+
+		assert root.clipboard == '新乡学院-王化'
+		assert window.result_entry.get() == '新乡学院-王化'
+
+		# 写回的内容不再触发解析
+		monitor.poll()
+		assert not root.pending
+
+	def test_no_retained_growth(self, soak_gui):
+		"""测试预热之后保留的内存不随剪贴板变化次数增长"""
+		samples, differences = soak_gui.soak(iterations=1500, interval=500, warmup=500)
+
+		assert [sample.iteration for sample in samples] == [500, 1000, 1500]
+		assert samples[-1].growth < 256 * 1024, differences[:5]
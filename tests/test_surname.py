@@ -0,0 +1,112 @@
+"""
+姓氏锚定的姓名提取测试
+
+此模块测试姓氏前缀树、身份标识自动机，以及启用姓氏锚定后解析器的结果。
+"""
+import pytest
+
+from iparser.api.applicant import Applicant
+from iparser.api.ruleset import compile_ruleset
+from iparser.api.surname import CharTrie, SurnameNameExtractor
+from iparser.config import config
+
+
+@pytest.fixture(scope='module')
+def surname_ruleset():
+	"""启用姓氏锚定的解析规则"""
+	return compile_ruleset(config.model_copy(update={
+		'name': config.name.model_copy(
+			update={'extractor': 'surname', 'surnames': {'栾城'}}),
+	}))
+
+@pytest.fixture
+def extractor():
+	"""使用默认配置的姓名提取器"""
+	return SurnameNameExtractor(config.identity.teacher, config.identity.student,
+		config.formatting.connectors, config.institution.all_suffixes)
+
+
+class TestCharTrie:
+	"""字符前缀树测试类"""
+
+	def test_forward_and_reverse(self):
+		"""测试正向和反向匹配"""
+		words = ['学', '学生', '指导教师']
+		forward = CharTrie(words)
+		reverse = CharTrie(words, reverse=True)
+
+		assert list(forward.matches('学生李四', 0, 4)) == [1, 2]
+		assert forward.longest('李四学生', 0, 4) == 0
+		assert reverse.longest('李四学生', 0, 4) == 2
+		assert reverse.longest('李四指导教师', 0, 6) == 4
+		assert reverse.longest('李四指导教师', 0, 5) == 0
+
+
+class TestSurnameNameExtractor:
+	"""姓名提取器测试类"""
+
+	@pytest.mark.parametrize('text, name, is_teacher', [
+		('王化学生', '王化', False),
+		('-赵学敏-学生', '赵学敏', False),
+		('（教师）郭自强', '郭自强', True),
+		('-学生栗肃', '栗肃', False),
+		('范德瑞（学）', '范德瑞', False),
+		('/司马飞鸟', '司马飞鸟', False),
+		('欧阳娜娜 指导老师', '欧阳娜娜', True),
+	])
+	def test_extract(self, extractor, text, name, is_teacher):
+		"""测试从剩余字符中提取姓名和身份"""
+		match = extractor.extract(text)
+
+		assert match is not None
+		assert (match.name, match.is_teacher) == (name, is_teacher)
+
+	@pytest.mark.parametrize('text', [
+		'',
+		' 学生',
+		'-李老师',                     # 去除身份标识后只剩姓氏
+		'王老五，刘老六',               # 多个姓名
+		'计算机学院江小白',             # 姓名前有二级学院
+		'路飞燕燕燕',                   # 超过4个字
+		'嘿嘿嘿',                       # 不以姓氏开头
+		'李四A',                        # 包含非汉字
+	])
+	def test_anchor_fails(self, extractor, text):
+		"""测试无法以姓氏锚定时返回None"""
+		assert extractor.extract(text) is None
+
+	def test_single_char_identity_needs_connector(self, extractor):
+		"""测试单字身份标识只有与连接符相邻时才被去除"""
+		assert extractor.extract('李文学').name == '李文学'
+		assert extractor.extract('李文-学').name == '李文'
+
+
+class TestSurnameParsing:
+	"""启用姓氏锚定后的解析测试类"""
+
+	def test_samples(self, surname_ruleset, samples_others,
+		samples_without_secondary_college):
+		"""测试姓氏锚定与分词提取的结果一致，锚定失败的样本回退到分词提取"""
+		for sample in samples_others + samples_without_secondary_college:
+			applicant = Applicant(sample['input'], surname_ruleset)
+			applicant.parse()
+			expected = sample['expected']
+
+			assert (applicant.institution, applicant.name, applicant.is_teacher) == \
+				(expected['institution'], expected['name'], expected['is_teacher'])
+
+	def test_glued_identity(self, surname_ruleset):
+		"""测试粘连的身份标识不经过分词即可去除"""
+		applicant = Applicant('新乡学院丶王化学生', surname_ruleset)
+		applicant.parse()
+
+		assert applicant.split_result == ['新乡学院', '王化', '学生']
+		assert applicant.full_info == '新乡学院-王化'
+
+	def test_custom_surname(self, surname_ruleset):
+		"""测试追加的姓氏"""
+		applicant = Applicant('商丘学院-栾城小明', surname_ruleset)
+		applicant.parse()
+
+		assert applicant.split_result == ['商丘学院', '栾城小明']
+		assert applicant.name == '栾城小明'
@@ -0,0 +1,116 @@
+"""
+本地解析结果仓库测试
+
+此模块测试解析结果的分批导入、机构人数和教师学生人数统计、
+未识别记录的查询，以及批次的删除和命令行工具。
+"""
+import pytest
+
+from iparser.__main__ import main
+from iparser.batch.columnar import ParseResult
+from iparser.batch.engine import parse_lines
+from iparser.batch.warehouse import InstitutionCount, ResultWarehouse
+
+
+RESULTS = [
+	ParseResult('黄淮学院赵佳', '黄淮学院', '赵佳', False, ''),
+	ParseResult('黄淮学院王明（教师）', '黄淮学院', '王明', True, ''),
+	ParseResult('新乡学院刘一', '新乡学院', '刘一', False, ''),
+	ParseResult('今天下午三点开会', '未知机构', '无名无姓', False, ''),
+	ParseResult('黄淮学院', '黄淮学院', '无名无姓', False, ''),
+]
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+	"""每个事务只写入两行的解析结果仓库"""
+	with ResultWarehouse(tmp_path / 'results.db', batch_size=2) as warehouse:
+		yield warehouse
+
+
+class TestWarehouse:
+	"""本地解析结果仓库测试类"""
+
+	def test_counts(self, warehouse):
+		"""测试分批导入后的机构人数和教师学生人数"""
+		first = warehouse.load(RESULTS, 'first')
+		second = warehouse.load(RESULTS[:2], 'second')
+
+		assert [(load.id, load.source, load.rows) for load in warehouse.loads()] == \
+			[(first, 'first', 5), (second, 'second', 2)]
+		assert warehouse.institution_counts() == [InstitutionCount('黄淮学院', 5, 2),
+			InstitutionCount('新乡学院', 1, 0), InstitutionCount('未知机构', 1, 0)]
+		assert warehouse.institution_counts(1, load=first) == \
+			[InstitutionCount('黄淮学院', 3, 1)]
+		assert warehouse.totals() == (2, 5)
+		assert warehouse.totals(second) == (1, 1)
+
+	def test_unresolved(self, warehouse):
+		"""测试查询未知机构或无名无姓的记录"""
+		warehouse.load(RESULTS)
+
+		assert [result.info for result in warehouse.unresolved()] == \
+			['今天下午三点开会', '黄淮学院']
+		assert len(warehouse.unresolved(limit=1)) == 1
+		assert warehouse.unresolved_count() == (1, 2)
+
+	def test_delete(self, warehouse):
+		"""测试删除批次时同时删除解析结果和机构人数"""
+		first = warehouse.load(RESULTS)
+		second = warehouse.load(RESULTS[:1])
+		warehouse.delete(first)
+
+		assert [load.id for load in warehouse.loads()] == [second]
+		assert warehouse.institution_counts() == [InstitutionCount('黄淮学院', 1, 0)]
+		assert warehouse.unresolved() == []
+
+	def test_failed_load(self, warehouse):
+		"""测试导入失败时不留下不完整的批次"""
+		def results():
+			yield from RESULTS
+			raise ValueError('读取失败')
+
+		with pytest.raises(ValueError):
+			warehouse.load(results())
+
+		assert warehouse.loads() == []
+		assert warehouse.totals() == (0, 0)
+
+	@pytest.mark.parametrize('suffix', ['.csv', '.jsonl', '.iprec'])
+	def test_load_file(self, tmp_path, warehouse, suffix):
+		"""测试导入批量任务输出的各种格式的文件"""
+		results = parse_lines([result.info for result in RESULTS])
+		path = tmp_path / f'results{suffix}'
+		if suffix == '.csv':
+			results.to_csv(path)
+		elif suffix == '.jsonl':
+			results.to_jsonl(path)
+		else:
+			results.write_records(path)
+
+		warehouse.load_file(path)
+
+		assert warehouse.totals() == (sum(result.is_teacher for result in results),
+			sum(not result.is_teacher for result in results))
+		assert warehouse.institution_counts() == [InstitutionCount(*item) for item in
+			sorted(((institution, total, sum(result.is_teacher for result in results
+				if result.institution == institution))
+				for institution, total in results.institution_counts().items()),
+				key=lambda item: (-item[1], item[0]))]
+
+	def test_cli(self, tmp_path, capsys, monkeypatch):
+		"""测试命令行导入和查询"""
+		# main() 会按配置文件重新启用日志，测试期间保持关闭
+		monkeypatch.setattr('iparser.__main__.setup_logging', lambda **kwargs: None)
+		database = str(tmp_path / 'results.db')
+		path = tmp_path / 'results.csv'
+		parse_lines([result.info for result in RESULTS]).to_csv(path)
+
+		main(['warehouse', '--db', database, 'load', str(path)])
+		main(['warehouse', '--db', database, 'institutions', '--top', '1'])
+		main(['warehouse', '--db', database, 'unresolved'])
+
+		output = capsys.readouterr().out
+		assert '共 5 人' in output
+		assert '黄淮学院\t3' in output
+		assert '今天下午三点开会\t未知机构' in output
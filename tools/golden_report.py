@@ -0,0 +1,446 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+标注语料的准确率和吞吐量报告
+
+tests/conftest.py 中只有约一百条手写样本，不足以判断更快的解析方式或配置变化是否降低了
+准确率。此脚本用大量标注语料（JSONL文件）分别运行选定的解析引擎和解析方式，并排输出：
+- 各字段（机构名称、姓名、教师身份）以及整条记录的准确率
+- 解析错误按类别的分布，例如机构未识别、机构被截短、姓名过长、教师误判为学生
+- 每秒解析的记录数
+
+语料每行一个JSON对象，支持两种格式：
+- 与 tests/conftest.py 的样本相同：{"input": "...", "expected": {"institution": "...",
+  "name": "...", "is_teacher": false}}
+- 与批量任务输出的JSONL相同：{"info": "...", "institution": "...", "name": "...",
+  "is_teacher": false}，人工校对过的批量解析结果可以直接作为语料
+
+解析引擎（--engine，可以多次指定）：
+  applicant        批量解析引擎（iparser.batch.engine，逐条使用 Applicant），支持多线程和多进程
+  pipeline         默认流水线（iparser.api.pipeline.default_pipeline），只支持单线程
+
+内置的解析方式（--variant，可以多次指定，与每个解析引擎组合）：
+  default          当前配置
+  tiered           分级分词
+  search           搜索引擎分词模式
+  surname          姓氏锚定的姓名提取
+  surname-tiered   姓氏锚定的姓名提取 + 分级分词
+  profile:<档案>   叠加 config.yml 中的配置档案
+
+用法:
+  python tools/golden_report.py corpus.jsonl                         # 当前配置
+  python tools/golden_report.py corpus.jsonl -v default -v surname -v surname-tiered
+  python tools/golden_report.py corpus.jsonl -e applicant -e pipeline --examples 5
+  python tools/golden_report.py corpus.jsonl -v default --processes 4 --repeat 3
+  python tools/golden_report.py corpus.jsonl --json report.json --fail-under 98
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from iparser.api.pipeline import default_pipeline
+from iparser.api.ruleset import compile_ruleset
+from iparser.batch.columnar import ResultColumns
+from iparser.batch.engine import parse_lines
+from iparser.batch.mapped import parse_file
+from iparser.config import Config, config
+from iparser.logger import disable_logging
+
+
+FIELDS = ('institution', 'name', 'is_teacher')
+FIELD_LABELS = {'institution': '机构名称', 'name': '姓名', 'is_teacher': '教师身份'}
+ENGINES = ('applicant', 'pipeline')
+
+VARIANTS: Dict[str, Callable[[Config], Config]] = {
+	'default': lambda base: base,
+	'tiered': lambda base: base.model_copy(update={
+		'segmentation': base.segmentation.model_copy(update={'tiered': True})}),
+	'search': lambda base: base.model_copy(update={
+		'segmentation': base.segmentation.model_copy(update={'mode': 'search'})}),
+	'surname': lambda base: base.model_copy(update={
+		'name': base.name.model_copy(update={'extractor': 'surname'})}),
+	'surname-tiered': lambda base: VARIANTS['surname'](VARIANTS['tiered'](base)),
+}
+
+
+class GoldenRecord(NamedTuple):
+	"""一条标注语料"""
+	info: str          # 申请信息
+	institution: str   # 正确的机构名称
+	name: str          # 正确的姓名
+	is_teacher: bool   # 是否为教师
+
+
+class Report(NamedTuple):
+	"""一种解析方式的报告"""
+	label: str                       # 解析方式（applicant以外的解析引擎附加在方括号中）
+	total: int                       # 记录数量
+	correct: Dict[str, int]          # 各字段以及整条记录（record）正确的数量
+	failures: Dict[str, int]         # 各类解析错误的数量
+	examples: Dict[str, List[str]]   # 各类解析错误的示例：申请信息 → 解析结果
+	seconds: float                   # 多次运行中最快一次的解析用时
+
+	@property
+	def rate(self) -> float:
+		"""每秒解析的记录数"""
+		return self.total / self.seconds if self.seconds > 0 else 0.0
+
+	def accuracy(self, field: str) -> float:
+		"""字段或整条记录（record）的准确率，单位为百分比"""
+		return self.correct[field] * 100 / self.total if self.total else 0.0
+
+
+def load_corpus(path: str | Path) -> List[GoldenRecord]:
+	"""
+	读取标注语料
+
+	Args:
+		path: JSONL文件路径
+
+	Returns:
+		List[GoldenRecord]: 标注语料
+
+	Raises:
+		ValueError: 某一行不是有效的标注语料
+	"""
+	records = []
+	with open(path, 'r', encoding='utf-8-sig') as f:
+		for number, line in enumerate(f, 1):
+			if not line.strip():
+				continue
+
+			try:
+				item = json.loads(line)
+				expected = item.get('expected', item)
+				info = item['input'] if 'input' in item else item['info']
+				record = GoldenRecord(info, expected['institution'], expected['name'],
+					_to_bool(expected['is_teacher']))
+			except (ValueError, KeyError, TypeError, AttributeError) as e:
+				raise ValueError(f'第 {number} 行不是有效的标注语料：{e}') from e
+
+			# 按行切分的并行解析会跳过空行，也无法处理多行的申请信息
+			if not info.strip() or '\n' in info or '\r' in info:
+				raise ValueError(f'第 {number} 行的申请信息为空或包含换行符')
+			records.append(record)
+
+	return records
+
+def _to_bool(value) -> bool:
+	"""转换JSON或CSV中的教师身份"""
+	if isinstance(value, str):
+		return value.strip().lower() in ('1', 'true', 'yes')
+
+	return bool(value)
+
+def variant_config(variant: str, base: Config = config) -> Config:
+	"""
+	获取解析方式对应的配置
+
+	Args:
+		variant: 内置的解析方式名称，或者 profile:<档案名>
+		base: 基础配置
+
+	Returns:
+		Config: 配置
+
+	Raises:
+		ValueError: 解析方式或配置档案不存在
+	"""
+	if variant.startswith('profile:'):
+		name = variant.split(':', 1)[1]
+		if name not in base.profiles:
+			raise ValueError(f'配置档案不存在：{name}，可用：{", ".join(base.profiles) or "无"}')
+		return base.profiles[name].apply(base)
+
+	if variant not in VARIANTS:
+		raise ValueError(f'未知的解析方式：{variant}，可用：{", ".join(VARIANTS)}、profile:<档案>')
+
+	return VARIANTS[variant](base)
+
+def classify(record: GoldenRecord, institution: str, name: str, is_teacher: bool,
+	snapshot: Config = config) -> List[str]:
+	"""
+	对一条记录的解析错误分类
+
+	Args:
+		record: 标注语料
+		institution: 解析出的机构名称
+		name: 解析出的姓名
+		is_teacher: 解析出的教师身份
+		snapshot: 提供未知机构和无名无姓默认名称的配置
+
+	Returns:
+		List[str]: 解析错误的类别，全部正确时为空列表
+	"""
+	categories = []
+
+	if institution != record.institution:
+		default = snapshot.institution.default_name
+		if institution == default:
+			categories.append('机构：未识别')
+		elif record.institution == default:
+			categories.append('机构：误识别')
+		elif record.institution.startswith(institution):
+			categories.append('机构：截短')
+		elif institution.startswith(record.institution):
+			categories.append('机构：过长')
+		else:
+			categories.append('机构：不同')
+
+	if name != record.name:
+		default = snapshot.name.default_name
+		if name == default:
+			categories.append('姓名：缺失')
+		elif record.name == default:
+			categories.append('姓名：多余')
+		elif name in record.name:
+			categories.append('姓名：截短')
+		elif record.name in name:
+			categories.append('姓名：过长')
+		else:
+			categories.append('姓名：不同')
+
+	if is_teacher != record.is_teacher:
+		categories.append('身份：教师误判为学生' if record.is_teacher else '身份：学生误判为教师')
+
+	return categories
+
+def run_variant(records: List[GoldenRecord], snapshot: Config, workers: int = 1,
+	processes: int = 1, engine: str = 'applicant') -> tuple:
+	"""
+	用一种解析引擎和解析方式解析所有标注语料
+
+	每次运行都重新编译解析规则，机构前缀缓存从空开始，多次运行的结果相同。
+	解析规则的编译不计入用时。
+
+	Args:
+		records: 标注语料
+		snapshot: 配置
+		workers: 并发解析的线程数
+		processes: 并行解析的进程数，大于1时先将申请信息写入临时文件，再按字节范围并行解析
+		engine: 解析引擎，applicant 或 pipeline
+
+	Returns:
+		tuple: 解析结果（ResultColumns或流水线记录列表）和解析用时（秒）
+
+	Raises:
+		ValueError: 解析引擎不存在，或者流水线引擎指定了多线程、多进程
+	"""
+	if engine not in ENGINES:
+		raise ValueError(f'未知的解析引擎：{engine}，可用：{", ".join(ENGINES)}')
+
+	ruleset = compile_ruleset(snapshot)
+	infos = [record.info for record in records]
+
+	if engine == 'pipeline':
+		if workers > 1 or processes > 1:
+			raise ValueError('流水线引擎只支持单线程解析')
+
+		start = time.perf_counter()
+		results = list(default_pipeline(ruleset)(infos))
+		return results, time.perf_counter() - start
+
+	if processes <= 1:
+		start = time.perf_counter()
+		results = parse_lines(infos, ruleset, workers)
+		return results, time.perf_counter() - start
+
+	with tempfile.TemporaryDirectory() as directory:
+		path = Path(directory) / 'corpus.txt'
+		path.write_text(''.join(f'{info}\n' for info in infos), encoding='utf-8')
+
+		start = time.perf_counter()
+		results = ResultColumns(ruleset)
+		for chunk in parse_file(path, ruleset, processes):
+			results.extend(chunk)
+
+		return results, time.perf_counter() - start
+
+def evaluate(records: List[GoldenRecord], variant: str = 'default', workers: int = 1,
+	processes: int = 1, repeat: int = 1, examples: int = 3,
+	base: Config = config, engine: str = 'applicant') -> Report:
+	"""
+	评估一种解析引擎和解析方式的准确率和吞吐量
+
+	Args:
+		records: 标注语料
+		variant: 解析方式，参见 variant_config()
+		workers: 并发解析的线程数
+		processes: 并行解析的进程数
+		repeat: 运行次数，取最快的一次作为用时
+		examples: 每类解析错误保留的示例数量
+		base: 基础配置
+		engine: 解析引擎，applicant 或 pipeline
+
+	Returns:
+		Report: 报告
+	"""
+	snapshot = variant_config(variant, base)
+
+	# 预热：加载基础分词词典，之后的计时只包含解析本身
+	run_variant(records[:1], snapshot, engine=engine)
+
+	timings = []
+	for _ in range(max(1, repeat)):
+		results, seconds = run_variant(records, snapshot, workers, processes, engine)
+		timings.append(seconds)
+
+	correct = Counter({field: 0 for field in (*FIELDS, 'record')})
+	failures = Counter()
+	samples: Dict[str, List[str]] = {}
+
+	for record, result in zip(records, results):
+		for field in FIELDS:
+			correct[field] += getattr(result, field) == getattr(record, field)
+
+		categories = classify(record, result.institution, result.name,
+			result.is_teacher, snapshot)
+		if not categories:
+			correct['record'] += 1
+		for category in categories:
+			failures[category] += 1
+			if len(samples.setdefault(category, [])) < examples:
+				identity = '教师' if result.is_teacher else '学生'
+				samples[category].append(
+					f'{record.info} → {result.institution}/{result.name}/{identity}')
+
+	label = variant if engine == 'applicant' else f'{variant}[{engine}]'
+	if workers > 1:
+		label += f'（{workers}线程）'
+	if processes > 1:
+		label += f'（{processes}进程）'
+
+	return Report(label, len(records), dict(correct), dict(failures.most_common()),
+		samples, min(timings))
+
+def _width(text: str) -> int:
+	"""终端中的显示宽度，全角字符占两列"""
+	return sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+
+def _pad(text: str, width: int, right: bool = False) -> str:
+	"""按显示宽度补齐空格"""
+	padding = ' ' * max(0, width - _width(text))
+	return padding + text if right else text + padding
+
+def format_table(reports: List[Report]) -> str:
+	"""
+	将多个报告并排格式化为文本表格
+
+	Args:
+		reports: 报告
+
+	Returns:
+		str: 文本表格，每列一种解析方式
+	"""
+	categories = list(dict.fromkeys(category for report in reports
+		for category in report.failures))
+	rows = [
+		['记录数', *(str(report.total) for report in reports)],
+		*([f'{FIELD_LABELS[field]}准确率',
+			*(f'{report.accuracy(field):.2f}%' for report in reports)]
+			for field in FIELDS),
+		['整条记录准确率', *(f'{report.accuracy("record"):.2f}%' for report in reports)],
+		['每秒记录数', *(f'{report.rate:,.0f}' for report in reports)],
+		['用时（秒）', *(f'{report.seconds:.3f}' for report in reports)],
+	]
+	if categories:
+		rows.append(['解析错误', *([''] * len(reports))])
+		rows.extend([f'  {category}',
+			*(str(report.failures.get(category, 0)) for report in reports)]
+			for category in categories)
+
+	header = ['', *(report.label for report in reports)]
+	widths = [max(_width(row[column]) for row in (header, *rows))
+		for column in range(len(header))]
+
+	lines = []
+	for index, row in enumerate((header, *rows)):
+		lines.append('  '.join(_pad(cell, width, column > 0)
+			for column, (cell, width) in enumerate(zip(row, widths))).rstrip())
+		if index == 0:
+			lines.append('  '.join('-' * width for width in widths))
+
+	return '\n'.join(lines)
+
+def main():
+	"""运行准确率和吞吐量报告的主函数"""
+	parser = argparse.ArgumentParser(description='标注语料的准确率和吞吐量报告')
+	parser.add_argument('corpus', help='标注语料（JSONL文件）')
+	parser.add_argument('-v', '--variant', action='append', dest='variants',
+		help=f'解析方式，可以多次指定（{", ".join(VARIANTS)}、profile:<档案>，默认default）')
+	parser.add_argument('-e', '--engine', action='append', dest='engines',
+		choices=ENGINES, help='解析引擎，可以多次指定（applicant、pipeline，默认applicant）')
+	parser.add_argument('--workers', type=int, default=1, help='并发解析的线程数（默认1）')
+	parser.add_argument('--processes', type=int, default=1,
+		help='并行解析的进程数（默认1），大于1时按字节范围并行解析')
+	parser.add_argument('--repeat', type=int, default=1, help='运行次数，取最快的一次（默认1）')
+	parser.add_argument('--examples', type=int, default=0,
+		help='每类解析错误输出的示例数量（默认0）')
+	parser.add_argument('--json', dest='json_path', help='同时将报告写入JSON文件')
+	parser.add_argument('--fail-under', type=float,
+		help='任一解析方式的整条记录准确率低于该百分比时以状态码1退出')
+	args = parser.parse_args()
+
+	disable_logging()
+
+	try:
+		records = load_corpus(args.corpus)
+		variants = args.variants or ['default']
+		for variant in variants:
+			variant_config(variant)
+	except (OSError, ValueError) as e:
+		print(f'错误：{e}', file=sys.stderr)
+		sys.exit(2)
+
+	if not records:
+		print(f'错误：标注语料为空：{args.corpus}', file=sys.stderr)
+		sys.exit(2)
+
+	engines = args.engines or ['applicant']
+	if 'pipeline' in engines and (args.workers > 1 or args.processes > 1):
+		print('错误：流水线引擎只支持单线程解析，不能与 --workers、--processes 一起使用',
+			file=sys.stderr)
+		sys.exit(2)
+
+	reports = []
+	for variant in variants:
+		for engine in engines:
+			print(f'正在评估 {variant}（{engine}）...', file=sys.stderr, flush=True)
+			reports.append(evaluate(records, variant, args.workers, args.processes,
+				args.repeat, args.examples, engine=engine))
+
+	print(format_table(reports))
+
+	if args.examples:
+		for report in reports:
+			for category, samples in report.examples.items():
+				print(f'\n[{report.label}] {category}：')
+				for sample in samples:
+					print(f'  {sample}')
+
+	if args.json_path:
+		with open(args.json_path, 'w', encoding='utf-8') as f:
+			json.dump([{**report._asdict(), 'rate': report.rate,
+				'accuracy': {field: report.accuracy(field) for field in report.correct}}
+				for report in reports], f, ensure_ascii=False, indent=2)
+
+	if args.fail_under is not None:
+		failed = [report.label for report in reports
+			if report.accuracy('record') < args.fail_under]
+		if failed:
+			print(f'\n失败：{", ".join(failed)} 的整条记录准确率低于 {args.fail_under}%')
+			sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
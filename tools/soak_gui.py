@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+GUI事件路径的长时间浸泡测试和内存泄漏检测
+
+不需要显示器：使用内存中的假根窗口和假输入框代替tkinter组件，由 ClipboardMonitor.poll()
+读取剪贴板，再由 MainWindow.on_clipboard_change() 解析并写回剪贴板，与GUI中的事件路径相同。
+
+预热之后使用 tracemalloc 记录基准快照，之后每隔一定次数记录一次快照。
+保留的内存相对基准的增长超过阈值时，输出分配增长最多的代码位置并以状态码1退出。
+
+用法:
+  python tools/soak_gui.py                          # 默认模拟20万次剪贴板变化
+  python tools/soak_gui.py -n 500000 --threshold-kb 2048
+  python tools/soak_gui.py --log-file soak.log      # 同时写入日志文件，检查日志处理器
+"""
+import argparse
+import gc
+import random
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from tkinter import TclError
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from iparser.gui.main_window import MainWindow
+from iparser.logger import disable_logging, setup_logging
+
+
+INSTITUTIONS = ['河南科技职业大学', '白城师范学院', '黄淮学院', '新乡学院', '河南工学院',
+	'长春工业大学', '吉林财经大学', '商丘学院', '洛理', '河工大', '天津理工大学计算机科学与工程学院']
+SURNAMES = '王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗欧阳司马'
+GIVEN = '一晨佳美德瑞晨光淑怡琪自强小娟学敏化肃铁琳炳浩唯鑫明玥鹏翔立柱'
+SEPARATORS = ['', '-', '—', ' ', '，', '丶']
+IDENTITIES = ['', '学生', '（学生）', '(学生)', '（教师）', '教师', '-学生']
+NOISE = ['https://example.com/page', '12345678901', 'def main():', '今天下午三点开会']
+
+
+class FakeRoot:
+	"""假根窗口，提供GUI事件路径用到的剪贴板和事件队列接口"""
+	def __init__(self):
+		self.clipboard: Optional[str] = None
+		self.pending: List[tuple] = []
+
+	def clipboard_get(self) -> str:
+		if self.clipboard is None:
+			raise TclError('CLIPBOARD selection doesn\'t exist')
+		return self.clipboard
+
+	def clipboard_clear(self):
+		self.clipboard = None
+
+	def clipboard_append(self, content: str):
+		self.clipboard = (self.clipboard or '') + content
+
+	def update(self):
+		pass
+
+	def after_idle(self, func: Callable, *args):
+		self.pending.append((func, args))
+
+	def run_pending(self):
+		"""依次运行排队的回调，相当于主线程的事件循环空闲一次"""
+		while self.pending:
+			func, args = self.pending.pop(0)
+			func(*args)
+
+
+class FakeEntry:
+	"""假输入框"""
+	def __init__(self):
+		self.text = ''
+
+	def config(self, **kwargs):
+		pass
+
+	def delete(self, first, last=None):
+		self.text = ''
+
+	def insert(self, index, content: str):
+		self.text += content
+
+	def get(self) -> str:
+		return self.text
+
+
+class Sample(NamedTuple):
+	"""一次内存采样"""
+	iteration: int   # 已模拟的剪贴板变化次数
+	current: int     # 当前保留的内存，单位为字节
+	growth: int      # 相对基准快照的增长，单位为字节
+
+
+def create_window(root: FakeRoot) -> MainWindow:
+	"""创建使用假组件的主窗口，只初始化剪贴板事件路径用到的属性"""
+	return MainWindow.headless(root, FakeEntry(), FakeEntry(), FakeEntry())
+
+def synthetic_contents(seed: int) -> Iterator[str]:
+	"""
+	生成模拟的剪贴板内容，大部分是互不相同的申请信息，少量是其他内容
+
+	Args:
+		seed: 随机数种子
+	"""
+	rng = random.Random(seed)
+	while True:
+		if rng.random() < 0.05:
+			yield f'{rng.choice(NOISE)}{rng.randrange(10 ** 6)}'
+			continue
+
+		name = rng.choice(SURNAMES) + ''.join(rng.choices(GIVEN, k=rng.randint(1, 2)))
+		yield rng.choice(INSTITUTIONS) + rng.choice(SEPARATORS) + name + \
+			rng.choice(IDENTITIES)
+
+def soak(iterations: int, interval: int, warmup: int, seed: int = 0,
+	log_file: Optional[str] = None, frames: int = 1,
+	report: Callable[[Sample], None] = lambda sample: None) -> tuple:
+	"""
+	模拟剪贴板变化并记录内存增长
+
+	Args:
+		iterations: 预热之后模拟的剪贴板变化次数
+		interval: 内存采样间隔（次数）
+		warmup: 预热次数，预热期间的内存增长（缓存、分词词典等）不计入
+		seed: 随机数种子
+		log_file: 日志文件路径，为None时关闭日志
+		frames: 每个分配位置记录的调用栈深度，越深越慢
+		report: 每次采样后的回调
+
+	Returns:
+		tuple: 内存采样列表，以及最后一次快照与基准快照的差异
+	"""
+	if log_file:
+		setup_logging(level='DEBUG', file=log_file)
+	else:
+		disable_logging()
+
+	root = FakeRoot()
+	window = create_window(root)
+	monitor = window.clipboard_monitor
+	contents = synthetic_contents(seed)
+
+	def step():
+		root.clipboard = next(contents)
+		monitor.poll()
+		root.run_pending()
+
+	for _ in range(warmup):
+		step()
+
+	gc.collect()
+	tracemalloc.start(frames)
+	baseline = tracemalloc.take_snapshot()
+	base_current, _ = tracemalloc.get_traced_memory()
+	samples = []
+
+	try:
+		for iteration in range(1, iterations + 1):
+			step()
+
+			if iteration % interval == 0 or iteration == iterations:
+				gc.collect()
+				current, _ = tracemalloc.get_traced_memory()
+				sample = Sample(iteration, current, current - base_current)
+				samples.append(sample)
+				report(sample)
+
+		gc.collect()
+		differences = tracemalloc.take_snapshot().compare_to(baseline, 'traceback')
+	finally:
+		tracemalloc.stop()
+
+	return samples, differences
+
+def main():
+	"""运行浸泡测试的主函数"""
+	parser = argparse.ArgumentParser(description='GUI事件路径的长时间浸泡测试和内存泄漏检测')
+	parser.add_argument('-n', '--iterations', type=int, default=200000,
+		help='模拟的剪贴板变化次数（默认200000）')
+	parser.add_argument('--interval', type=int, default=10000, help='内存采样间隔（默认10000次）')
+	parser.add_argument('--warmup', type=int, default=5000, help='预热次数（默认5000）')
+	parser.add_argument('--threshold-kb', type=int, default=1024,
+		help='允许的保留内存增长，单位为KiB（默认1024）')
+	parser.add_argument('--top', type=int, default=10, help='输出的分配位置数量（默认10）')
+	parser.add_argument('--frames', type=int, default=1,
+		help='每个分配位置记录的调用栈深度（默认1），定位泄漏来源时可以调大')
+	parser.add_argument('--seed', type=int, default=0, help='随机数种子')
+	parser.add_argument('--log-file', nargs='?', const='', default=None,
+		help='写入日志文件，不指定路径时写入临时目录；默认关闭日志')
+	args = parser.parse_args()
+
+	log_file = args.log_file
+	if log_file == '':
+		log_file = str(Path(tempfile.mkdtemp()) / 'soak.log')
+
+	def report(sample: Sample):
+		print(f'第 {sample.iteration} 次：保留 {sample.current / 1024:.0f} KiB，'
+			f'增长 {sample.growth / 1024:+.0f} KiB', flush=True)
+
+	samples, differences = soak(args.iterations, args.interval, args.warmup, args.seed,
+		log_file, args.frames, report)
+	growth = samples[-1].growth if samples else 0
+	threshold = args.threshold_kb * 1024
+
+	print(f'\n分配增长最多的 {args.top} 个位置：')
+	for difference in differences[:args.top]:
+		print(f'  {difference.size_diff / 1024:+.1f} KiB，'
+			f'{difference.count_diff:+d} 个对象')
+		for line in difference.traceback.format(limit=args.frames):
+			print(f'    {line}')
+
+	if growth > threshold:
+		print(f'\n失败：保留内存增长 {growth / 1024:.0f} KiB，超过阈值 {args.threshold_kb} KiB')
+		sys.exit(1)
+
+	print(f'\n通过：保留内存增长 {growth / 1024:.0f} KiB，阈值 {args.threshold_kb} KiB')
+
+
+if __name__ == '__main__':
+	main()